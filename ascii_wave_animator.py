@@ -3,8 +3,9 @@
 ASCII Wave Animator — Figma Design Edition
 Полное повторение дизайна из Figma: минималистичный black&white интерфейс
 """
-import sys, os, math, re, glob, random, json
+import sys, os, math, glob, random, json, string, threading
 from dataclasses import dataclass
+from functools import partial, lru_cache
 import numpy as np
 import time
 # Предпочитаем scipy, но безопасно фоллбэкаемся, если её нет
@@ -14,9 +15,16 @@ try:
 except Exception:
     _scipy_gaussian_filter = None
     SCIPY_AVAILABLE = False
+# Numba опционален: без него горячие циклы идут через NumPy
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except Exception:
+    njit = prange = None
+    NUMBA_AVAILABLE = False
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance
-from PySide6.QtCore import Qt, QTimer, Signal, QThread, QSize, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QImage, QPixmap, QAction, QColor, QFont, QIcon, QPainter, QPen, QRadialGradient, QPainterPath, QRegion, QFontDatabase, QIntValidator
+from PySide6.QtCore import Qt, QTimer, Signal, QThread, QSize, QPropertyAnimation, QEasingCurve, QRegularExpression, QSignalBlocker
+from PySide6.QtGui import QImage, QPixmap, QAction, QColor, QFont, QIcon, QPainter, QPen, QRadialGradient, QPainterPath, QRegion, QFontDatabase, QIntValidator, QRegularExpressionValidator
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout,
     QSlider, QCheckBox, QGroupBox, QMessageBox, QLineEdit, QComboBox, QColorDialog,
@@ -33,6 +41,446 @@ except Exception:
 ASCII_RAMP_PURE = " .:-=+*#%@"
 ASCII_RAMP_EXT = " .`^\",:;Il!i><~+_-?][}{1)(|/\\tfjrxnuvczXYUJCLQ0OZmwqpdbkhao*#MW&8%B@$█"
 
+# Готовые строки "N%" для процентных дисплеев: без аллокаций на каждый тик слайдера
+_PCT_STR = tuple(f"{i}%" for i in range(1001))
+
+
+def _pct_text(value):
+    # Текст процентного дисплея; вне диапазона таблицы - обычное форматирование
+    i = int(value)
+    return _PCT_STR[i] if 0 <= i <= 1000 else f"{i}%"
+
+# Общие стили виджетов (один экземпляр строки на все виджеты)
+HEX_INPUT_QSS = """
+    QLineEdit {
+        background: transparent;
+        border: 2px solid rgba(255,255,255,0.3);
+        border-radius: 20px;
+        padding: 14px;
+        color: rgba(255,255,255,1);
+        font-size: 16px;
+        font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
+        font-weight: 400;
+    }
+    QLineEdit:focus {
+        border: 2px solid rgba(255,255,255,0.6);
+    }
+"""
+PRIMARY_BUTTON_QSS = """
+    QPushButton {
+        background: rgba(255,255,255,1);
+        color: rgba(0,0,0,1);
+        border: none;
+        border-radius: 20px;
+        font-size: 16px;
+        font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
+        font-weight: 400;
+    }
+    QPushButton:hover {
+        background: rgba(235,235,235,1);
+    }
+    QPushButton:pressed {
+        background: rgba(215,215,215,1);
+    }
+"""
+PILL_BUTTON_QSS = """
+    QWidget {
+        background: transparent;
+        border: 2px solid rgba(255,255,255,0.3);
+        border-radius: 22px;
+    }
+    QPushButton#PillMinus, QPushButton#PillPlus {
+        background: transparent;
+        color: #FFFFFF;
+        border: none;
+        font-size: 26px;
+        font-weight: normal;
+        padding-top: 0px;
+        padding-bottom: 4px;
+    }
+    QPushButton#PillMinus:hover {
+        background: rgba(255,255,255,0.1);
+        border-top-left-radius: 20px;
+        border-bottom-left-radius: 20px;
+    }
+    QPushButton#PillPlus:hover {
+        background: rgba(255,255,255,0.1);
+        border-top-right-radius: 20px;
+        border-bottom-right-radius: 20px;
+    }
+"""
+MODE_COMBO_QSS = """
+    QComboBox {
+        background: transparent;
+        border: 2px solid rgba(255,255,255,0.3);
+        border-radius: 20px;
+        padding: 14px;
+        color: rgba(255,255,255,1);
+        font-size: 16px;
+        font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
+        font-weight: 400;
+    }
+    QComboBox:focus {
+        border: 2px solid rgba(255,255,255,0.6);
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 30px;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 6px solid white;
+        margin-right: 15px;
+    }
+    QComboBox QAbstractItemView {
+        background: rgba(0,0,0,1);
+        border: 2px solid rgba(255,255,255,0.3);
+        border-radius: 10px;
+        selection-background-color: rgba(255,255,255,0.2);
+        color: white;
+        padding: 5px;
+    }
+"""
+SWATCH_QSS_TEMPLATE = "background: {}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;"
+
+# Мелкие общие стили (ключ -> QSS), один экземпляр строки на все виджеты
+_STYLE = {
+    "transparent": "background: transparent;",
+    "transparent_page": "QWidget { background: transparent; }",
+    "section": """
+    QWidget {
+        background: rgba(0,0,0,1);
+        border-radius: 30px;
+    }
+""",
+    "section_title": """
+    QLabel {
+        color: rgba(66,66,66,1);
+        font-size: 16px;
+        font-weight: regular;
+        background: transparent;
+    }
+""",
+    "combobox": """
+    QComboBox {
+        background: transparent;
+        color: white;
+        border: 2px solid rgba(255,255,255,0.3);
+        border-radius: 20px;
+        padding: 10px 14px;
+        font-size: 16px;
+    }
+    QComboBox:hover {
+        border: 2px solid rgba(255,255,255,0.5);
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 30px;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid white;
+        width: 0;
+        height: 0;
+    }
+""",
+    "segment_btn": """
+    QPushButton {
+        background: transparent;
+        color: rgba(255,255,255,0.7);
+        border: none;
+        font-size: 20px;
+        padding: 0 18px;
+    }
+    QPushButton:hover {
+        background: rgba(255,255,255,0.06);
+    }
+    QPushButton:checked {
+        background: rgba(255,255,255,1);
+        color: rgba(0,0,0,1);
+    }
+""",
+}
+_STYLE["segment_btn_left"] = _STYLE["segment_btn"] + "QPushButton:checked { border-top-left-radius: 20px; border-bottom-left-radius: 20px; }\n"
+_STYLE["segment_btn_right"] = _STYLE["segment_btn"] + "QPushButton:checked { border-top-right-radius: 20px; border-bottom-right-radius: 20px; }\n"
+
+# objectName виджетов, на которые ссылаются селекторы QSS (#RowLabel и т.д.): одна строка на все вызовы
+_OBJ_NAMES = {
+    "row_label": "RowLabel",
+    "value_display": "ValueDisplay",
+    "hint": "HintLabel",
+    "pill_minus": "PillMinus",
+    "pill_plus": "PillPlus",
+    "black_nb": "BlackButtonNoBorder",
+    "round_black": "RoundBlackButton",
+    "section_title": "SectionTitle",
+    "dialog_title": "DialogTitle",
+}
+
+# Глобальный QSS приложения (дизайн Figma); $-плейсхолдеры цветов темы подставляются в _install_global_qss
+FIGMA_QSS_TEMPLATE = string.Template("""
+    * {
+        font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
+        font-weight: 400;
+    }
+
+    QWidget {
+        background: $UI_BG;
+        color: $UI_TEXT;
+    }
+
+    /* Табы */
+    QTabWidget::pane {
+        border: none;
+        background: #000000;
+        border-radius: 30px;
+        padding: 0px;
+        margin-top: 0px;
+    }
+
+    QTabBar {
+        background: transparent;
+    }
+
+    QTabBar::tab {
+        background: #000000;
+        color: $UI_TEXT;
+        padding: 13px 22px;
+        border-top-left-radius: 20px;
+        border-top-right-radius: 20px;
+        font-size: 20px;
+        font-weight: 500;
+        margin-right: 0px;
+        min-width: 80px;
+    }
+
+    QTabBar::tab:selected {
+        background: #000000;
+        color: $UI_TEXT;
+    }
+
+    QTabBar::tab:!selected {
+        background: #000000;
+        color: rgba(255,255,255,0.4);
+    }
+
+    QTabBar::tab:hover:!selected {
+        color: rgba(255,255,255,0.6);
+    }
+
+    /* Секции */
+    QGroupBox {
+        background: #000000;
+        border: none;
+        border-radius: 20px;
+        padding: 20px;
+        margin-top: 10px;
+    }
+
+    QGroupBox QLabel#SectionTitle {
+        font-size: 16px;
+        font-weight: 300;
+        color: $UI_TEXT;
+        background: transparent;
+    }
+
+    /* Лейблы */
+    QLabel {
+        font-size: 16px;
+        color: $UI_TEXT;
+        background: transparent;
+    }
+
+    /* Подписи строк в секциях */
+    QLabel#RowLabel {
+        color: white;
+        font-size: 16px;
+        background: transparent;
+    }
+
+    /* Крупные значения (проценты) рядом с -/+ */
+    QLabel#ValueDisplay {
+        color: white;
+        font-size: 26px;
+        font-weight: bold;
+        background: transparent;
+        padding-right: 20px;
+    }
+
+    /* Мелкие пояснения */
+    QLabel#HintLabel {
+        color: white;
+        font-size: 12px;
+        background: transparent;
+        margin-top: 4px;
+    }
+
+    /* Серые заголовки секций в окне настроек */
+    QLabel#DialogTitle {
+        color: rgba(66,66,66,1);
+        background: transparent;
+    }
+
+    /* Числа в степперах */
+    NumberDisplay {
+        background: #000000;
+        border: 2px solid $BTN_BORDER;
+        border-radius: 10px;
+        font-size: 26px;
+        font-weight: bold;
+        color: $UI_TEXT;
+    }
+
+    NumberDisplay:hover {
+        background: #1A1A1A;
+        cursor: text;
+    }
+
+    /* Кнопки -/+ */
+    RoundButton {
+        background: #000000;
+        border: 1px solid $BTN_BORDER;
+        border-radius: 20px;
+        color: $UI_TEXT;
+        font-size: 20px;
+    }
+
+    RoundButton:hover {
+        background: #1A1A1A;
+    }
+
+    /* Комбобокс */
+    QComboBox {
+        background: #000000;
+        border: 2px solid $BTN_BORDER;
+        border-radius: 20px;
+        padding: 12px 14px;
+        font-size: 16px;
+        color: $UI_TEXT;
+    }
+
+    QComboBox::drop-down {
+        border: none;
+        width: 20px;
+    }
+
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid $UI_TEXT;
+        margin-right: 10px;
+    }
+
+    /* Чекбоксы */
+    QCheckBox {
+        spacing: 8px;
+        font-size: 16px;
+        color: $UI_TEXT;
+    }
+
+    QCheckBox::indicator {
+        width: 23px;
+        height: 23px;
+        background: transparent;
+        border: 2px solid $BTN_BORDER;
+        border-radius: 8px;
+    }
+
+    QCheckBox::indicator:checked {
+        background: $BTN_BG;
+    }
+
+    /* Недоступный чекбокс (напр. extended при заданных кастомных символах) */
+    QCheckBox:disabled {
+        color: rgba(255,255,255,0.3);
+    }
+
+    /* Кнопки (основные) */
+    QPushButton {
+        background: $BTN_BG;
+        color: $BTN_TEXT;
+        border: none;
+        border-radius: 20px;
+        font-size: 16px;
+        font-weight: 400;
+        padding: 12px;
+    }
+
+    QPushButton:hover {
+        background: #EEEEEE;
+    }
+
+    /* Черные кнопки с обводкой */
+    QPushButton#BlackButton {
+        background: #000000;
+        color: $UI_TEXT;
+        border: 2px solid $BTN_BORDER;
+    }
+
+    QPushButton#BlackButton:hover {
+        background: #1A1A1A;
+    }
+
+    /* Черные кнопки БЕЗ обводки */
+    QPushButton#BlackButtonNoBorder {
+        background: #000000;
+        color: $UI_TEXT;
+        border: none;
+    }
+
+    QPushButton#BlackButtonNoBorder:hover {
+        background: #1A1A1A;
+    }
+
+    /* Круглые черные кнопки */
+    QPushButton#RoundBlackButton {
+        background: #000000;
+        color: $UI_TEXT;
+        border: none;
+        border-radius: 27px;
+        font-size: 20px;
+    }
+
+    QPushButton#RoundBlackButton:hover {
+        background: #1A1A1A;
+    }
+
+    /* Preview */
+    QScrollArea {
+        background: #000000;
+        border: none;
+        border-radius: 30px;
+    }
+""")
+
+# Тема UI по умолчанию (может быть переназначена через настройки)
+DEFAULT_UI_THEME = {
+    'ui_bg': '#3F3F3F',
+    'ui_text': '#FFFFFF',
+    'button_bg': '#FFFFFF',
+    'button_text': '#000000',
+    'button_border': '#FFFFFF',
+    'accent': '#FFFFFF',
+}
+
+
+def _install_global_qss(app, theme):
+    # Ставит QSS дизайна на всё приложение; если тема не изменилась - Qt не перепарсивает sheet
+    css = FIGMA_QSS_TEMPLATE.substitute(
+        UI_BG=theme['ui_bg'],
+        UI_TEXT=theme['ui_text'],
+        BTN_BG=theme['button_bg'],
+        BTN_TEXT=theme['button_text'],
+        BTN_BORDER=theme['button_border'],
+    )
+    if app.styleSheet() != css:
+        app.setStyleSheet(css)
+
 # DRY: use shared utils
 from asciinator.utils.icons import load_icon
 
@@ -41,10 +489,15 @@ from asciinator.utils.image_ops import (
     to_grayscale,
     resize_to_char_grid,
     build_ascii_image_color,
+    resize_plan,
 )
 
 # core modules (restored)
 from asciinator.core.waves import WaveParams, apply_waves_time
+from asciinator.core.morph import render_morph
+from asciinator.core.audio import render_audio
+from asciinator.core.contourswim import render_contourswim
+from asciinator.core.edges import edge_data, taxicab_distance
 
 @dataclass
 class WaveParams:
@@ -73,8 +526,62 @@ def generate_random_shapes(width, height, n=30, angularity=0.5, seed=None):
         d.polygon(pts, fill=fill)
     return np.array(img, dtype=np.float32)/255.0
 
+@lru_cache(maxsize=32)
+def _cached_truetype(path, px):
+    # Общий FreeType-шрифт на (путь, кегль): прокрутка кегля туда-обратно не перечитывает файл
+    return ImageFont.truetype(path, px)
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _particles_kernel(x, y, vx, vy, t, out):
+        # Шаг роя за один проход: поле потока считается прямо в точках сетки
+        # (как flow_x/flow_y в NumPy-пути), затем гистограмма частиц в out
+        rows, cols = out.shape
+        two_pi = 2.0 * math.pi
+        phase = t * 0.2
+        sx = 0.6 / max(cols - 1, 1)
+        sy = 0.6 / max(rows - 1, 1)
+        for i in prange(x.shape[0]):
+            xm = x[i] % cols
+            ym = y[i] % rows
+            xc = min(int(xm), cols - 1)
+            yc = min(int(ym), rows - 1)
+            frx = xm - xc
+            fry = ym - yc
+            xn = min(xc + 1, cols - 1)
+            yn = min(yc + 1, rows - 1)
+            fx = (math.sin(two_pi * (xc * sx + phase)) * (1.0 - frx)
+                  + math.sin(two_pi * (xn * sx + phase)) * frx) * 0.1
+            fy = (math.cos(two_pi * (yc * sy + phase)) * (1.0 - fry)
+                  + math.cos(two_pi * (yn * sy + phase)) * fry) * 0.1
+            vx[i] = 0.97 * vx[i] + fx
+            vy[i] = 0.97 * vy[i] + fy
+            x[i] = (x[i] + vx[i]) % cols
+            y[i] = (y[i] + vy[i]) % rows
+        # Scatter последовательно: параллельный += в одну ячейку - гонка
+        for i in range(x.shape[0]):
+            xi = min(max(int(x[i]), 0), cols - 1)
+            yi = min(max(int(y[i]), 0), rows - 1)
+            out[yi, xi] += 1.0
+
 # ==================== CUSTOM WIDGETS ====================
 
+class TightHBox(QHBoxLayout):
+    # QHBoxLayout без внешних отступов; spacing задаётся сразу, если нужен
+    def __init__(self, parent=None, spacing=None):
+        super().__init__(parent)
+        self.setContentsMargins(0, 0, 0, 0)
+        if spacing is not None:
+            self.setSpacing(spacing)
+
+class TightVBox(QVBoxLayout):
+    # QVBoxLayout без внешних отступов; spacing задаётся сразу, если нужен
+    def __init__(self, parent=None, spacing=None):
+        super().__init__(parent)
+        self.setContentsMargins(0, 0, 0, 0)
+        if spacing is not None:
+            self.setSpacing(spacing)
+
 class RoundButton(QPushButton):
     # Круглая кнопка -/+ из дизайна
     def __init__(self, text, is_white_bg=False):
@@ -114,9 +621,7 @@ class NewStepperWidget(QWidget):
         self.setMinimumWidth(140)
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
         
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(5)  # Небольшой отступ между числом и кнопками
+        layout = TightHBox(self, spacing=5)  # Небольшой отступ между числом и кнопками
         
         # Числовое поле (68x44px) - теперь редактируемое
         self.display = QLineEdit(str(value))
@@ -205,19 +710,8 @@ class NewStepperWidget(QWidget):
         
         buttons_layout.addWidget(self.btn_minus)
         
-        # Вертикальная линия-разделитель (короче на 8px сверху и снизу)
-        separator_container = QWidget()
-        separator_container.setFixedSize(1, 40)  # Высота = высота кнопок
-        separator_container.setStyleSheet("background: transparent;")
-        separator_layout = QVBoxLayout(separator_container)
-        separator_layout.setContentsMargins(0, 4, 0, 4)
-        separator_layout.setSpacing(0)
-        
-        separator_line = QWidget()
-        separator_line.setStyleSheet("background: white;")
-        separator_layout.addWidget(separator_line)
-        
-        buttons_layout.addWidget(separator_container)
+        # Вертикальная линия-разделитель (короче на 4px сверху и снизу)
+        buttons_layout.addWidget(PillSeparator(40))  # Высота = высота кнопок
         buttons_layout.addWidget(self.btn_plus)
         
         layout.addWidget(self.display, 1)
@@ -288,15 +782,12 @@ class ResponsiveRow(QWidget):
         # Right widget must not demand more width than it truly needs
         self._right.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
 
-        self._root = QVBoxLayout(self)
-        self._root.setContentsMargins(0, 0, 0, 0)
-        self._root.setSpacing(0)
+        self._root = TightVBox(self, spacing=0)
 
         # horizontal layout container
         self._hwrap = QWidget()
         self._hwrap.setStyleSheet("background: transparent;")
-        h = QHBoxLayout(self._hwrap)
-        h.setContentsMargins(0, 0, 0, 0)
+        h = TightHBox(self._hwrap)
         h.setSpacing(gap)
         h.addWidget(self._label)
         h.addStretch(1)
@@ -306,9 +797,7 @@ class ResponsiveRow(QWidget):
         # vertical layout container
         self._vwrap = QWidget()
         self._vwrap.setStyleSheet("background: transparent;")
-        v = QVBoxLayout(self._vwrap)
-        v.setContentsMargins(0, 0, 0, 0)
-        v.setSpacing(8)
+        v = TightVBox(self._vwrap, spacing=8)
         v.addWidget(self._label)
         v.addWidget(self._right, 0, Qt.AlignLeft)
         self._v = v
@@ -337,9 +826,7 @@ class StepperWidget(QWidget):
         self.parent_window = parent
         self.label_text = label_text
         
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
+        layout = TightHBox(self, spacing=10)
         
         self.display = NumberDisplay(str(value))
         self.btn_minus = RoundButton("-")
@@ -388,6 +875,10 @@ class StepperWidget(QWidget):
 class CustomSlider(QWidget):
     # Кастомный слайдер как в дизайне: тонкая линия + круглый handle
     valueChanged = Signal(float)
+    sliderReleased = Signal()  # Отпускание мыши после перетаскивания (для дорогих preview)
+    # Рисуется через QPainter без QSS; перо и цвет общие для всех экземпляров
+    _LINE_PEN = QPen(QColor(255, 255, 255), 1)
+    _HANDLE_COLOR = QColor(255, 255, 255)
     
     def __init__(self, minimum=0.0, maximum=1.0, value=0.5):
         super().__init__()
@@ -396,6 +887,7 @@ class CustomSlider(QWidget):
         self._value = value
         self.handle_radius = 6  # Радиус кружка
         self.padding = self.handle_radius  # Отступы слева и справа для кружка
+        self._press_value = None  # Значение на момент нажатия мыши; None - кнопка не нажата
         self.setFixedHeight(12)
         self.setMinimumWidth(140)
         
@@ -414,8 +906,7 @@ class CustomSlider(QWidget):
         painter.setRenderHint(QPainter.Antialiasing)
         
         # Линия слайдера (с отступами для кружка)
-        pen = QPen(QColor(255, 255, 255), 1)
-        painter.setPen(pen)
+        painter.setPen(self._LINE_PEN)
         y = self.height() // 2
         line_start = self.padding
         line_end = self.width() - self.padding
@@ -424,16 +915,24 @@ class CustomSlider(QWidget):
         # Handle (белый круг) - с учетом отступов
         t = (self._value - self.minimum) / (self.maximum - self.minimum)
         x = int(line_start + t * (line_end - line_start))
-        painter.setBrush(QColor(255, 255, 255))
+        painter.setBrush(self._HANDLE_COLOR)
         painter.setPen(Qt.NoPen)
         painter.drawEllipse(x - self.handle_radius, y - self.handle_radius, 
                            self.handle_radius * 2, self.handle_radius * 2)
         
     def mousePressEvent(self, event):
+        self._press_value = self._value
         self._updateFromMouse(event.pos().x())
         
     def mouseMoveEvent(self, event):
         self._updateFromMouse(event.pos().x())
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        # sliderReleased только после нажатия, которое сдвинуло значение (клик по ручке - без рендера)
+        pressed, self._press_value = self._press_value, None
+        if pressed is not None and self._value != pressed:
+            self.sliderReleased.emit()
         
     def _updateFromMouse(self, x):
         # Учитываем отступы при расчете позиции
@@ -445,10 +944,43 @@ class CustomSlider(QWidget):
         self.setValue(new_val)
 
 class CustomCheckbox(QCheckBox):
-    # Чекбокс как в дизайне: белый квадрат 23x23
+    # Чекбокс как в дизайне: белый квадрат 23x23 (стиль задаётся правилами QCheckBox в FIGMA_QSS_TEMPLATE)
     def __init__(self, text=""):
         super().__init__(text)
 
+class PillSeparator(QWidget):
+    # Вертикальная линия 1px между кнопками -/+ в pill-контролах; рисуется сама, без вложенных виджетов и QSS
+    _LINE_COLOR = QColor(255, 255, 255)
+
+    def __init__(self, height=44, inset=4, parent=None):
+        super().__init__(parent)
+        self.inset = inset  # Линия короче высоты кнопок сверху и снизу
+        self.setFixedSize(1, height)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(0, self.inset, 1, self.height() - 2 * self.inset, self._LINE_COLOR)
+
+
+class ClickableLabel(QLabel):
+    # QLabel с сигналом clicked (свотчи цветов)
+    clicked = Signal()
+    swatch_hex = None  # Текущий цвет свотча (см. MainWindow._set_swatch_color)
+
+    def mousePressEvent(self, event):
+        super().mousePressEvent(event)
+        self.clicked.emit()
+
+
+class ClickableLineEdit(QLineEdit):
+    # QLineEdit, клик по которому эмитит clicked (HEX-поля открывают picker)
+    clicked = Signal()
+
+    def mousePressEvent(self, event):
+        super().mousePressEvent(event)
+        self.clicked.emit()
+
+
 class RoundedPreviewContainer(QWidget):
     # Контейнер со скругленными углами для preview
     def __init__(self):
@@ -456,9 +988,7 @@ class RoundedPreviewContainer(QWidget):
         self.border_radius = 30
         
         # Layout для preview
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
+        layout = TightVBox(self, spacing=0)
         
         self.preview = PreviewArea()
         layout.addWidget(self.preview)
@@ -535,11 +1065,11 @@ class FullscreenPreview(QWidget):
         super().__init__()
         self.setWindowTitle("ASCI-inator - Preview")
         self.label = QLabel(alignment=Qt.AlignCenter)
-        lay = QVBoxLayout(self)
-        lay.setContentsMargins(0,0,0,0)
+        lay = TightVBox(self)
         lay.addWidget(self.label)
         self._qimage = None
         self._pixmap = None
+        self._image_data = None  # Буфер PIL, на который смотрит _qimage (см. on_second_window)
         self._fullscreen = False
         self.setStyleSheet("background:#000;")
         self.setWindowFlags(self.windowFlags() | Qt.Window)
@@ -624,6 +1154,103 @@ class LoaderDialog(QDialog):
     def set_progress(self, pct:int):
         self.pbar.setValue(int(max(0,min(100,pct))))
 
+class ImageLoadWorker(QThread):
+    # Подготовка исходника вне GUI-потока: чтение файла, ч/б, сетка символов, edges/dist для overlay
+    done = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, source, cell_w, cell_h):
+        super().__init__()
+        self.source = source  # путь к файлу или сгенерированный ч/б массив (0..1)
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+
+    def run(self):
+        try:
+            from_file = isinstance(self.source, str)
+            if from_file:
+                pil = Image.open(self.source).convert("RGB")
+                img_color = np.array(pil, dtype=np.uint8)
+                gray = to_grayscale(img_color)
+                g_norm = gray.astype(np.float32) / 255.0
+            else:
+                gray = self.source
+                img_color = np.stack([gray*255]*3, axis=-1).astype(np.uint8)
+                g_norm = gray.astype(np.float32)
+                if g_norm.max() > 1.0:
+                    g_norm = g_norm / 255.0
+            grid, cols, rows = resize_to_char_grid(gray, self.cell_w, self.cell_h, None, None)
+            # Precompute full-res edges/dist for audioreactive_alt overlays
+            try:
+                edges_full, dist_full = edge_data(g_norm)
+            except Exception:
+                edges_full, dist_full = None, None
+            self.done.emit({
+                "from_file": from_file,
+                "img_color": img_color,
+                "base_gray": grid,
+                "cols": cols,
+                "rows": rows,
+                "edges_full": edges_full,
+                "dist_full": dist_full,
+            })
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class PreviewRenderWorker(QThread):
+    # Растеризация ASCII-стадии preview при воспроизведении вне GUI-потока. Входы кадра
+    # (сетка яркости, шрифт, размеры, цвета) снимаются в GUI-потоке (_ascii_frame_args) и
+    # приходят готовыми - окно и его виджеты поток не трогает. Двойной буфер: пока один кадр
+    # показан, следующий рендерится; в полёте не больше одного - пока GUI не забрал готовый
+    # кадр (consume), новые запросы не принимаются
+    frame_ready = Signal(object, object, float)  # ((H, W, 3) uint8 или None, ключ кадра, время рендера)
+
+    def __init__(self):
+        super().__init__()
+        self._wake = threading.Event()
+        self._free = threading.Event()
+        self._free.set()
+        self._stopping = False
+        self._args = None
+        self._key = None
+
+    def is_free(self):
+        # Предыдущий кадр показан - можно снимать входы следующего
+        return self._free.is_set()
+
+    def request(self, args, key):
+        # False - предыдущий кадр ещё не показан, этот тик пропускается
+        if not self._free.is_set():
+            return False
+        self._free.clear()
+        self._args, self._key = args, key
+        self._wake.set()
+        return True
+
+    def consume(self):
+        self._free.set()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            start = time.perf_counter()
+            try:
+                arr = build_ascii_image_color(**self._args, as_array=True)
+            except Exception:
+                arr = None
+            self._args = None
+            self.frame_ready.emit(arr, self._key, time.perf_counter() - start)
+
+
 class ExportWorker(QThread):
     # Поток экспорта
     progress = Signal(int)
@@ -649,7 +1276,7 @@ class ExportWorker(QThread):
         
     def run(self):
         try:
-            export_font = self.main._load_font(self.main.font_name, self.main.anim_font_px)
+            export_font = self.main._load_font(self.main.font_name, self.main.anim_font_px, cached=False)
             cw, ch = self.main._measure_cell(export_font)
             out = []
             
@@ -1204,9 +1831,7 @@ class SettingsDialog(QDialog):
             }
         """)
         
-        layout = QVBoxLayout(main_container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(15)  # 15px gap between tabs and content
+        layout = TightVBox(main_container, spacing=15)  # 15px gap between tabs and content
         
         # Custom tab bubbles
         self.tab_buttons = []
@@ -1215,9 +1840,7 @@ class SettingsDialog(QDialog):
         tabs_container = QWidget()
         tabs_container.setFixedHeight(46)
         tabs_container.setStyleSheet("background: transparent;")
-        tabs_layout = QHBoxLayout(tabs_container)
-        tabs_layout.setContentsMargins(0, 0, 0, 0)
-        tabs_layout.setSpacing(18)  # Space between tabs
+        tabs_layout = TightHBox(tabs_container, spacing=18)  # Space between tabs
         tabs_layout.setAlignment(Qt.AlignLeft)
         
         # Create tab bubbles
@@ -1255,9 +1878,7 @@ class SettingsDialog(QDialog):
         buttons_container = QWidget()
         buttons_container.setFixedHeight(44)
         buttons_container.setStyleSheet("background: transparent;")
-        buttons_layout = QHBoxLayout(buttons_container)
-        buttons_layout.setContentsMargins(0, 0, 0, 0)
-        buttons_layout.setSpacing(20)
+        buttons_layout = TightHBox(buttons_container, spacing=20)
         
         btn_close = QPushButton("Close")
         btn_close.setFixedSize(259, 44)
@@ -1388,9 +2009,7 @@ class SettingsDialog(QDialog):
         # Main tab widget
         widget = QWidget()
         widget.setStyleSheet("background: transparent;")
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)  # 10px between containers
+        layout = TightVBox(widget, spacing=10)  # 10px between containers
         
         # === CONTAINER 1: цвет интерфейса ===
         color_container = QWidget()
@@ -1408,7 +2027,7 @@ class SettingsDialog(QDialog):
         # Title
         color_title = QLabel("Interface color")
         color_title.setFont(self.get_font("Helvetica Neue", 16))
-        color_title.setStyleSheet("color: rgba(66,66,66,1); background: transparent;")
+        color_title.setObjectName(_OBJ_NAMES["dialog_title"])
         color_layout.addWidget(color_title)
         
         # Color fields
@@ -1427,14 +2046,12 @@ class SettingsDialog(QDialog):
             row = QWidget()
             row.setFixedHeight(44)
             row.setStyleSheet("background: transparent;")
-            row_layout = QHBoxLayout(row)
-            row_layout.setContentsMargins(0, 0, 0, 0)
-            row_layout.setSpacing(0)
+            row_layout = TightHBox(row, spacing=0)
             
             # Label
             label = QLabel(label_text)
             label.setFont(self.get_font("Helvetica Neue", 16))
-            label.setStyleSheet("color: white; background: transparent;")
+            label.setObjectName(_OBJ_NAMES["row_label"])
             label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
             row_layout.addWidget(label)
             
@@ -1444,9 +2061,7 @@ class SettingsDialog(QDialog):
             right_container = QWidget()
             right_container.setFixedSize(147, 44)  # 93 (hex) + 10 (spacing) + 44 (swatch) = 147
             right_container.setStyleSheet("background: transparent;")
-            right_layout = QHBoxLayout(right_container)
-            right_layout.setContentsMargins(0, 0, 0, 0)
-            right_layout.setSpacing(10)
+            right_layout = TightHBox(right_container, spacing=10)
             
             # HEX input field
             hex_input = QLineEdit(self.colors[key])
@@ -1507,16 +2122,14 @@ class SettingsDialog(QDialog):
         # Title
         font_title = QLabel("UI font")
         font_title.setFont(self.get_font("Helvetica Neue", 16))
-        font_title.setStyleSheet("color: rgba(66,66,66,1); background: transparent;")
+        font_title.setObjectName(_OBJ_NAMES["dialog_title"])
         font_layout.addWidget(font_title)
         
         # Font dropdown row
         font_dropdown_row = QWidget()
         font_dropdown_row.setFixedHeight(44)
         font_dropdown_row.setStyleSheet("background: transparent;")
-        font_dropdown_layout = QHBoxLayout(font_dropdown_row)
-        font_dropdown_layout.setContentsMargins(0, 0, 0, 0)
-        font_dropdown_layout.setSpacing(0)
+        font_dropdown_layout = TightHBox(font_dropdown_row, spacing=0)
         
         # Font selector dropdown
         font_combo = QComboBox()
@@ -1568,14 +2181,12 @@ class SettingsDialog(QDialog):
         size_row = QWidget()
         size_row.setFixedHeight(44)
         size_row.setStyleSheet("background: transparent;")
-        size_layout = QHBoxLayout(size_row)
-        size_layout.setContentsMargins(0, 0, 0, 0)
-        size_layout.setSpacing(0)
+        size_layout = TightHBox(size_row, spacing=0)
         
         # Label
         size_label = QLabel("Size")
         size_label.setFont(self.get_font("Helvetica Neue", 16))
-        size_label.setStyleSheet("color: white; background: transparent;")
+        size_label.setObjectName(_OBJ_NAMES["row_label"])
         size_label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         size_layout.addWidget(size_label)
         
@@ -1585,9 +2196,7 @@ class SettingsDialog(QDialog):
         right_size_container = QWidget()
         right_size_container.setFixedHeight(44)
         right_size_container.setStyleSheet("background: transparent;")
-        right_size_layout = QHBoxLayout(right_size_container)
-        right_size_layout.setContentsMargins(0, 0, 0, 0)
-        right_size_layout.setSpacing(10)
+        right_size_layout = TightHBox(right_size_container, spacing=10)
         
         # Number display (editable)
         size_display = QLineEdit(str(self.font_size))
@@ -1613,9 +2222,7 @@ class SettingsDialog(QDialog):
         stepper_container = QWidget()
         stepper_container.setFixedSize(88, 40)
         stepper_container.setStyleSheet("background: transparent;")
-        stepper_layout = QHBoxLayout(stepper_container)
-        stepper_layout.setContentsMargins(0, 0, 0, 0)
-        stepper_layout.setSpacing(0)
+        stepper_layout = TightHBox(stepper_container, spacing=0)
         
         btn_minus = QPushButton("-")
         btn_minus.setFixedSize(44, 40)
@@ -1674,9 +2281,7 @@ class SettingsDialog(QDialog):
         # Main tab widget
         widget = QWidget()
         widget.setStyleSheet("background: transparent;")
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)  # 10px between containers
+        layout = TightVBox(widget, spacing=10)  # 10px between containers
         
         # === CONTAINER 1: ввод звука ===
         audio_container = QWidget()
@@ -1694,21 +2299,19 @@ class SettingsDialog(QDialog):
         # Title
         audio_title = QLabel("Audio input")
         audio_title.setFont(self.get_font("Helvetica Neue", 16))
-        audio_title.setStyleSheet("color: rgba(66,66,66,1); background: transparent;")
+        audio_title.setObjectName(_OBJ_NAMES["dialog_title"])
         audio_layout.addWidget(audio_title)
         
         # Device selector row
         device_row = QWidget()
         device_row.setFixedHeight(44)
         device_row.setStyleSheet("background: transparent;")
-        device_row_layout = QHBoxLayout(device_row)
-        device_row_layout.setContentsMargins(0, 0, 0, 0)
-        device_row_layout.setSpacing(0)
+        device_row_layout = TightHBox(device_row, spacing=0)
         
         # Label
         device_label = QLabel("Select device")
         device_label.setFont(self.get_font("Helvetica Neue", 16))
-        device_label.setStyleSheet("color: white; background: transparent;")
+        device_label.setObjectName(_OBJ_NAMES["row_label"])
         device_label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         
         # Device dropdown
@@ -1763,14 +2366,12 @@ class SettingsDialog(QDialog):
         gain_row = QWidget()
         gain_row.setFixedHeight(44)
         gain_row.setStyleSheet("background: transparent;")
-        gain_row_layout = QHBoxLayout(gain_row)
-        gain_row_layout.setContentsMargins(0, 0, 0, 0)
-        gain_row_layout.setSpacing(0)
+        gain_row_layout = TightHBox(gain_row, spacing=0)
         
         # Label
         gain_label = QLabel("Gain")
         gain_label.setFont(self.get_font("Helvetica Neue", 16))
-        gain_label.setStyleSheet("color: white; background: transparent;")
+        gain_label.setObjectName(_OBJ_NAMES["row_label"])
         gain_label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
         gain_row_layout.addWidget(gain_label)
         
@@ -1780,9 +2381,7 @@ class SettingsDialog(QDialog):
         right_gain_container = QWidget()
         right_gain_container.setFixedHeight(44)
         right_gain_container.setStyleSheet("background: transparent;")
-        right_gain_layout = QHBoxLayout(right_gain_container)
-        right_gain_layout.setContentsMargins(0, 0, 0, 0)
-        right_gain_layout.setSpacing(10)
+        right_gain_layout = TightHBox(right_gain_container, spacing=10)
         
         # Number display
         gain_display = QLineEdit("40")
@@ -1805,9 +2404,7 @@ class SettingsDialog(QDialog):
         stepper_container = QWidget()
         stepper_container.setFixedSize(88, 40)
         stepper_container.setStyleSheet("background: transparent;")
-        stepper_layout = QHBoxLayout(stepper_container)
-        stepper_layout.setContentsMargins(0, 0, 0, 0)
-        stepper_layout.setSpacing(0)
+        stepper_layout = TightHBox(stepper_container, spacing=0)
         
         btn_minus = QPushButton("-")
         btn_minus.setFixedSize(44, 40)
@@ -1866,9 +2463,7 @@ class SettingsDialog(QDialog):
         # Performance tab (placeholder for now)
         widget = QWidget()
         widget.setStyleSheet("background: transparent;")
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
+        layout = TightVBox(widget, spacing=10)
         
         # Placeholder container
         container = QWidget()
@@ -1886,7 +2481,7 @@ class SettingsDialog(QDialog):
         # Title
         title = QLabel("Performance")
         title.setFont(self.get_font("Helvetica Neue", 16))
-        title.setStyleSheet("color: rgba(66,66,66,1); background: transparent;")
+        title.setObjectName(_OBJ_NAMES["dialog_title"])
         container_layout.addWidget(title)
         
         # Placeholder text
@@ -2153,9 +2748,7 @@ class ScrollableTabBar(QWidget):
         # Виджет не должен растягиваться
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
         
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
+        layout = TightHBox(self, spacing=10)
         
         # Стрелка влево (круглая кнопка)
         self.btn_left = QPushButton("<")
@@ -2193,9 +2786,7 @@ class ScrollableTabBar(QWidget):
         # Контейнер для табов
         tabs_container = QWidget()
         tabs_container.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
-        tabs_layout = QHBoxLayout(tabs_container)
-        tabs_layout.setContentsMargins(0, 0, 0, 0)
-        tabs_layout.setSpacing(12)
+        tabs_layout = TightHBox(tabs_container, spacing=12)
         
         # Создаем баблы для каждого таба
         for i, name in enumerate(tab_names):
@@ -2351,6 +2942,9 @@ class MainWindow(QWidget):
         # Данные
         self.img_color = None
         self.base_gray = None
+        # Счётчик замен img_color / base_gray / morph_target для ключа smart redraw
+        # (id() массива CPython переиспользует после его освобождения)
+        self._source_gen = 0
         self.img_w = None
         self.img_h = None
         self.grid_cols = 40
@@ -2377,8 +2971,8 @@ class MainWindow(QWidget):
         
         self.color_stops = [(255,255,255)]*5
         self.render_bg = (0,0,0)
-        self.color_inputs = []
-        self.color_swatches = []
+        self.color_inputs = [None] * 5
+        self.color_swatches = [None] * 5
         self.bg_hex_input = None
         self.bg_swatch = None
         
@@ -2387,11 +2981,58 @@ class MainWindow(QWidget):
         self.audio_gain = 2.5
         self.audio_smooth = 0.8
         self.audio_level = 0.0
+        # Усиление по полосам audioreactive_alt (слайдеры band, 0..2): буфер фиксирован,
+        # GUI пишет in place, рендер умножает на него уровни полос
+        self._ar_band_gains = np.ones(6, dtype=np.float32)
         self.particles = None
+        self._flow_shape = None  # (rows, cols) буферов поля потока режима рой
+        self._gx = self._gy = None  # Сетка координат 0..1 режима рой (см. _ensure_flow_buffers)
+        self._flow_x = self._flow_y = None
+        # Фаза фонового слоя audioreactive_alt 0.02*(x+y): по устройству, для текущего (h, w)
+        self._bg_phase_cache = {}
+        self._bg_phase_shape = None
+        self._bg_wave_buf = None
+        # Тензоры audioreactive_alt на GPU: (img_color, edges, dist, device) -> (color, edges, dist)
+        self._gpu_overlay_cache = None
+        # Шум для sparkles/rays: один генератор PCG64 и float32-буферы, заполняемые на месте
+        self._rng = np.random.default_rng()
+        self._rand_buf = None
+        self._gpu_rand_buf = None
         
         self.t = 0.0
         self.running = False
         self.audio_stream = None
+        self._image_loader = None  # ImageLoadWorker текущей загрузки
+        self._pending_image_source = None  # Последний источник, запрошенный во время загрузки
+        self._render_worker = None  # PreviewRenderWorker: кадры воспроизведения вне GUI-потока
+        # Рендереры режимов: render_frame_gray выбирает по self.mode без цепочки elif
+        self._mode_renderers = {
+            "waves": self._render_waves,
+            "morphing": self._render_morphing,
+            "audio": self._render_audio,
+            "contourswim": self._render_contourswim_mode,
+            "audioreactive_alt": self._render_audioreactive_alt,
+        }
+        # torch/CUDA для audioreactive_alt: проверка один раз при включении GPU (см. _probe_gpu)
+        self._gpu_ready = None  # None - ещё не проверяли
+        self._torch = None
+        self._cuda_device = None
+        self._apply_overlays_fn = None
+        self._gl_maps_key = None  # (edges, dist, форма сетки) последней загрузки в GL preview
+        self._compose_cache = None  # (img_color, color_f32, compose_buf, final_u8, overlay_buf)
+        self._quiet_frames = 0  # Подряд идущие тихие кадры audioreactive_alt
+        self._quiet_grid = None  # (img_color, (cell_w, cell_h, cols, rows), сетка) для тишины
+        self._frame_t = 0.0  # perf_counter() текущего кадра audioreactive_alt (CPU-слои и GL preview)
+        self._bands_thread = None  # BandsThread: захват + FFT шести полос вне UI-потока
+        self._audio_input = None  # AudioInput, из которого читает _bands_thread
+        self._audio_an = None
+        # Полноразмерные края/расстояния audioreactive_alt и производные маски (см. _set_edge_cache)
+        self._cached_edges_full = None
+        self._cached_dist_full = None
+        self._edge_mask_bool = None
+        self._edge_mask_u8 = None
+        self._edge_indices = None
+        self._edge_ray_steps = None  # Шаг расширения маски (taxicab - 1), на котором пиксель входит в rays
         self.second = None
         
         # PostFX Manager
@@ -2403,17 +3044,68 @@ class MainWindow(QWidget):
         
         # Индекс текущего таба (для анимации)
         self._current_tab_index = 0
+        # Анимация табов: opacity-эффект на виджет таба и одна группа из 4 анимаций,
+        # создаются один раз и переиспользуются при каждом переключении
+        self._tab_opacity = {}
+        self._tab_anim_group = None
+        self._tab_anim_pool = None  # (old pos, old opacity, new pos, new opacity), см. _ensure_tab_anim
+        self._tab_anim_widgets = ()
         
         # Оптимизация производительности
-        self.glyph_cache = {}  # Кэш пререндеренных символов (symbol, color) -> PIL Image
+        self.glyph_cache = {}  # Маски глифов набора символов (см. image_ops.glyph_bitmaps)
         self.max_preview_cells = 120  # Максимум символов в одном измерении для preview
+        self._max_preview_cells_target = self.max_preview_cells  # Потолок для адаптивного max_preview_cells
         self.last_render_time = 0  # Последнее время рендера в секундах
         self.skip_frames = False  # Пропускать кадры если рендер медленный
+        self._render_ema = 0.0  # Сглаженное время рендера preview (EMA), сек
+        self._skip_phase = 0  # Счётчик тиков для детерминированного пропуска кадров
+        self._last_render_key = None  # Хэш входов последнего рендера preview (smart redraw)
+        self._last_fx_key = None  # Параметры PostFX последнего рендера preview
+        # Стадии preview: ascii (рендер символов) -> postfx (CRT + glow + композит)
+        self._stage_dirty = {'ascii': True, 'postfx': True}
+        self._stage_cache = {'ascii': None}
+        self._swatch_ss_cache = {}  # HEX -> готовый QSS свотча
+        
+        # Throttle preview: серия valueChanged при перетаскивании слайдера -> один рендер
+        self._preview_dirty = False
+        self._preview_force = False  # Хотя бы один отложенный запрос требовал force
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(16)
+        self._preview_timer.timeout.connect(self._flush_preview)
+
+        # Debounce сетки/шрифта: серия шагов степперов cols/rows/kegl -> один rebuild_base_grid
+        self._pending_grid = {}
+        self._grid_rebuild_timer = QTimer(self)
+        self._grid_rebuild_timer.setSingleShot(True)
+        self._grid_rebuild_timer.setInterval(150)
+        self._grid_rebuild_timer.timeout.connect(self._apply_pending_grid)
         
         # Храним ссылки на секции режимов
         self.morph_section = None
         self.audio_section = None
         
+        # Секции режимов строятся лениво (см. _ensure_mode_section)
+        self._mode_sections = {}
+        self.morph_widget = None
+        self.audio_widget = None
+        self.contourswim_widget = None
+        self.audio_reactive_section = None
+        self.ar_alt_section = None
+        self.contour_section = None
+        
+        # Параметры режимов (живут независимо от того, построены ли их виджеты)
+        self.morph_speed = 100  # 100%
+        self.contour_intensity = 50  # 50%
+        self.contour_edge_sensitivity = 30.0
+        self.contour_wave_speed = 100.0
+        self.contour_amplitude = 50.0
+        self.contour_layers = 3
+        self.contour_edge_blur = 0.0
+        self.contour_glow = 50.0
+        self.audio_sensitivity_display = None
+        self.ar_sensitivity_display = None
+        
         # Слайдеры
         self.slider_gap_x = None
         self.slider_gap_y = None
@@ -2429,18 +3121,25 @@ class MainWindow(QWidget):
         self.stepper_height = None
         self.cb_loop = None
         
+        # Объекты, создаваемые при построении UI (_build_ui и вкладки)
+        self._canvas_layout = None
+        self._mode_layout = None
+        self._hex_validator = None
+        self._mode_change_timer = None
+        self._play_icon_size = None
+        
         # Тема UI (может быть переназначена через настройки)
-        self.ui_theme = {
-            'ui_bg': '#3F3F3F',
-            'ui_text': '#FFFFFF',
-            'button_bg': '#FFFFFF',
-            'button_text': '#000000',
-            'button_border': '#FFFFFF',
-            'accent': '#FFFFFF',
-        }
+        self.ui_theme = dict(DEFAULT_UI_THEME)
+        self._theme_version = 0  # Растёт при каждой смене темы: зависимые кэши сверяются с ним
+        # QSS темы переставляется только при реальном изменении; серия смен сливается в одну
+        self._theme_dirty = True
+        self._theme_timer = QTimer(self)
+        self._theme_timer.setSingleShot(True)
+        self._theme_timer.setInterval(0)
+        self._theme_timer.timeout.connect(self._flush_theme)
         
         self._build_ui()
-        self._apply_figma_style()
+        self._flush_theme()
         self._sync_color_ui()  # Синхронизируем начальные цвета с UI
         
         self.timer = QTimer(self)
@@ -2523,6 +3222,15 @@ class MainWindow(QWidget):
     def closeEvent(self, event):
         # Корректное закрытие приложения
         self._stop_audio_stream()
+        if self._render_worker is not None:
+            self._render_worker.stop()
+        if self._image_loader is not None:
+            # Результат загрузки уже не нужен: отключаем слоты окна и дожидаемся потока
+            self._pending_image_source = None
+            self._image_loader.done.disconnect()
+            self._image_loader.error.disconnect()
+            self._image_loader.finished.disconnect()
+            self._image_loader.wait()
         if self.second is not None:
             self.second.close()
         event.accept()
@@ -2664,13 +3372,16 @@ class MainWindow(QWidget):
         return fm
 
 
-    def _load_font(self, name, px):
-        # Загружает шрифт с fallback на дефолтный
+    def _load_font(self, name, px, cached=True):
+        # Загружает шрифт с fallback на дефолтный.
+        # cached=False - отдельный объект для фонового потока (ExportWorker), общий из кэша не делим между потоками
         path = self.font_map.get(name)
         
         # Пробуем загрузить по пути
         if path and os.path.exists(path):
             try:
+                if cached:
+                    return _cached_truetype(path, px)
                 return ImageFont.truetype(path, px)
             except Exception as e:
                 print(f"Не удалось загрузить шрифт {path}: {e}")
@@ -2729,7 +3440,7 @@ class MainWindow(QWidget):
         
         self.btn_generate = QPushButton("generate pattern")
         self.btn_generate.setFixedSize(162, 44)
-        self.btn_generate.setObjectName("BlackButtonNoBorder")
+        self.btn_generate.setObjectName(_OBJ_NAMES["black_nb"])
         self.btn_generate.clicked.connect(self.on_generate_pattern)
         
         # Верхний ряд: импорт, настройки, экспорт
@@ -2738,12 +3449,12 @@ class MainWindow(QWidget):
         # ГРУППА 2: Настройки, Второй вьюпорт, Экспорт (по центру)
         self.btn_settings = QPushButton("settings")
         self.btn_settings.setFixedSize(162, 44)
-        self.btn_settings.setObjectName("BlackButtonNoBorder")
+        self.btn_settings.setObjectName(_OBJ_NAMES["black_nb"])
         self.btn_settings.clicked.connect(self.on_settings)
         
         self.btn_second = QPushButton("second viewport")
         self.btn_second.setFixedSize(162, 44)
-        self.btn_second.setObjectName("BlackButtonNoBorder")
+        self.btn_second.setObjectName(_OBJ_NAMES["black_nb"])
         self.btn_second.clicked.connect(self.on_second_window)
         
         self.btn_export = QPushButton("export\u00A0\u00A0")
@@ -2765,7 +3476,7 @@ class MainWindow(QWidget):
         # ГРУППА 3: Play/Pause (круглая кнопка)
         self.btn_play_pause = QPushButton("")
         self.btn_play_pause.setFixedSize(54, 54)
-        self.btn_play_pause.setObjectName("RoundBlackButton")
+        self.btn_play_pause.setObjectName(_OBJ_NAMES["round_black"])
         # Новая логика: кнопка-тоггл (checked = running)
         self.btn_play_pause.setCheckable(True)
         self.btn_play_pause.setChecked(False)
@@ -2787,8 +3498,7 @@ class MainWindow(QWidget):
         # Оборачиваем в контейнер с фиксированными отступами и растяжением по ширине превью
         buttons_container = QWidget()
         buttons_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        btns_wrap = QVBoxLayout(buttons_container)
-        btns_wrap.setContentsMargins(0, 0, 0, 0)
+        btns_wrap = TightVBox(buttons_container)
         btns_wrap.addLayout(self.bottom_buttons_layout)
         self.buttons_container = buttons_container
         # Выравниваем контейнер кнопок по левому краю и ограничиваем его шириной превью в resizeEvent
@@ -2815,8 +3525,7 @@ class MainWindow(QWidget):
         self.tab_bar.tabChanged.connect(self.on_tab_changed)
 
         # Контейнер для выравнивания табов слева
-        tab_container = QHBoxLayout()
-        tab_container.setContentsMargins(0, 0, 0, 0)
+        tab_container = TightHBox()
         tab_container.addWidget(self.tab_bar, 0, Qt.AlignLeft)
         tab_container.addStretch()
         right_layout.addLayout(tab_container)
@@ -2864,11 +3573,12 @@ class MainWindow(QWidget):
     def _create_canvas_tab(self):
         # Tab: Canvas
         widget = QWidget()
-        widget.setStyleSheet("QWidget { background: transparent; }")
+        widget.setStyleSheet(_STYLE["transparent_page"])
         
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
+        layout = TightVBox(widget, spacing=10)
+        # Отложенная сборка: без промежуточных relayout/repaint на каждый addWidget
+        widget.setUpdatesEnabled(False)
+        layout.setEnabled(False)
         
         # === SECTION: Grid ===
         grid_section, grid_layout = self._create_new_section("grid")
@@ -2881,12 +3591,10 @@ class MainWindow(QWidget):
         self.stepper_cols.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
         cols_row = QWidget()
-        cols_row.setStyleSheet("background: transparent;")
-        cols_row_l = QHBoxLayout(cols_row)
-        cols_row_l.setContentsMargins(0, 0, 0, 0)
-        cols_row_l.setSpacing(12)
+        cols_row.setStyleSheet(_STYLE["transparent"])
+        cols_row_l = TightHBox(cols_row, spacing=12)
         cols_label = QLabel("columns")
-        cols_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        cols_label.setObjectName(_OBJ_NAMES["row_label"])
         cols_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         cols_row_l.addWidget(cols_label)
         cols_row_l.addStretch(1)
@@ -2901,12 +3609,10 @@ class MainWindow(QWidget):
         self.stepper_rows.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
         rows_row = QWidget()
-        rows_row.setStyleSheet("background: transparent;")
-        rows_row_l = QHBoxLayout(rows_row)
-        rows_row_l.setContentsMargins(0, 0, 0, 0)
-        rows_row_l.setSpacing(12)
+        rows_row.setStyleSheet(_STYLE["transparent"])
+        rows_row_l = TightHBox(rows_row, spacing=12)
         rows_label = QLabel("rows")
-        rows_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        rows_label.setObjectName(_OBJ_NAMES["row_label"])
         rows_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         rows_row_l.addWidget(rows_label)
         rows_row_l.addStretch(1)
@@ -2919,9 +3625,9 @@ class MainWindow(QWidget):
         gap_x_row = QHBoxLayout()
         gap_x_row.setContentsMargins(0, 12, 0, 12)  # Vertical paddings for compactness
         gap_x_label = QLabel("spacing X")
-        gap_x_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        gap_x_label.setObjectName(_OBJ_NAMES["row_label"])
         self.slider_gap_x = CustomSlider(0.0, 24.0, float(self.gap_x))
-        self.slider_gap_x.valueChanged.connect(lambda v: (setattr(self, 'gap_x', int(v)), self.update_preview()))
+        self.slider_gap_x.valueChanged.connect(self._make_setter(None, 'gap_x', int))
         gap_x_row.addWidget(gap_x_label)
         gap_x_row.addSpacing(20)
         gap_x_row.addWidget(self.slider_gap_x, 1)  # stretch factor = 1
@@ -2932,9 +3638,9 @@ class MainWindow(QWidget):
         gap_y_row = QHBoxLayout()
         gap_y_row.setContentsMargins(0, 12, 0, 12)  # Vertical paddings for compactness
         gap_y_label = QLabel("spacing Y")
-        gap_y_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        gap_y_label.setObjectName(_OBJ_NAMES["row_label"])
         self.slider_gap_y = CustomSlider(0.0, 24.0, float(self.gap_y))
-        self.slider_gap_y.valueChanged.connect(lambda v: (setattr(self, 'gap_y', int(v)), self.update_preview()))
+        self.slider_gap_y.valueChanged.connect(self._make_setter(None, 'gap_y', int))
         gap_y_row.addWidget(gap_y_label)
         gap_y_row.addSpacing(20)
         gap_y_row.addWidget(self.slider_gap_y, 1)  # stretch factor = 1
@@ -2950,8 +3656,7 @@ class MainWindow(QWidget):
             pass
         
         # Dropdown font selector
-        font_combo_row = QHBoxLayout()
-        font_combo_row.setContentsMargins(0, 0, 0, 0)
+        font_combo_row = TightHBox()
         self.cb_font = QComboBox()
         self.cb_font.addItems(sorted(self.font_map.keys()) or ["PIL-Default"])
         self.cb_font.currentTextChanged.connect(self.on_font_changed)
@@ -2988,12 +3693,10 @@ class MainWindow(QWidget):
         font_layout.addSpacing(18)
 
         # font size
-        font_size_row = QHBoxLayout()
-        font_size_row.setContentsMargins(0, 0, 0, 0)
-        font_size_row.setSpacing(12)
+        font_size_row = TightHBox(spacing=12)
 
         font_size_label = QLabel("font size")
-        font_size_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        font_size_label.setObjectName(_OBJ_NAMES["row_label"])
 
         self.stepper_kegl = NewStepperWidget(int(getattr(self, "anim_font_px", 16)), 1, 256, self, "font size")
         self.stepper_kegl.setFixedWidth(160)
@@ -3011,8 +3714,7 @@ class MainWindow(QWidget):
         symbols_section, symbols_layout = self._create_new_section("symbols")
         
         # Checkbox "extended set"
-        checkbox_row = QHBoxLayout()
-        checkbox_row.setContentsMargins(0, 0, 0, 0)
+        checkbox_row = TightHBox()
         self.cb_extended = CustomCheckbox("extended set")
         self.cb_extended.stateChanged.connect(self.on_ramp_changed)
         checkbox_row.addWidget(self.cb_extended)
@@ -3021,8 +3723,7 @@ class MainWindow(QWidget):
         symbols_layout.addSpacing(10)  # Spacing before input field
         
         # Input field for custom symbols (no label)
-        custom_input_row = QHBoxLayout()
-        custom_input_row.setContentsMargins(0, 0, 0, 0)
+        custom_input_row = TightHBox()
         self.custom_symbols_input = QLineEdit()
         self.custom_symbols_input.setPlaceholderText("e.g.: TIPIDOR")
         self.custom_symbols_input.setMaxLength(100)
@@ -3060,12 +3761,12 @@ class MainWindow(QWidget):
         freq_x_row = QHBoxLayout()
         freq_x_row.setContentsMargins(0, 12, 0, 12)
         freq_x_label = QLabel("frequency X")
-        freq_x_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        freq_x_label.setObjectName(_OBJ_NAMES["row_label"])
         freq_x_label.setFixedWidth(180)
         self.slider_freq_x = CustomSlider(0.0, 3.0, self.params.freq_x)
         try: self.slider_freq_x.setFixedHeight(36)
         except Exception: pass
-        self.slider_freq_x.valueChanged.connect(lambda v: (setattr(self.params, 'freq_x', v), self.update_preview()))
+        self.slider_freq_x.valueChanged.connect(self._make_setter('params', 'freq_x'))
         freq_x_row.addWidget(freq_x_label)
         freq_x_row.addWidget(self.slider_freq_x, 1)
         waves_layout.addLayout(freq_x_row)
@@ -3075,12 +3776,12 @@ class MainWindow(QWidget):
         freq_y_row = QHBoxLayout()
         freq_y_row.setContentsMargins(0, 12, 0, 12)
         freq_y_label = QLabel("frequency Y")
-        freq_y_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        freq_y_label.setObjectName(_OBJ_NAMES["row_label"])
         freq_y_label.setFixedWidth(180)
         self.slider_freq_y = CustomSlider(0.0, 3.0, self.params.freq_y)
         try: self.slider_freq_y.setFixedHeight(36)
         except Exception: pass
-        self.slider_freq_y.valueChanged.connect(lambda v: (setattr(self.params, 'freq_y', v), self.update_preview()))
+        self.slider_freq_y.valueChanged.connect(self._make_setter('params', 'freq_y'))
         freq_y_row.addWidget(freq_y_label)
         freq_y_row.addWidget(self.slider_freq_y, 1)
         waves_layout.addLayout(freq_y_row)
@@ -3091,12 +3792,12 @@ class MainWindow(QWidget):
         speed_x_row = QHBoxLayout()
         speed_x_row.setContentsMargins(0, 12, 0, 12)
         speed_x_label = QLabel("speed X")
-        speed_x_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        speed_x_label.setObjectName(_OBJ_NAMES["row_label"])
         speed_x_label.setFixedWidth(180)
         self.slider_speed_x = CustomSlider(-3.0, 3.0, self.params.speed_x)
         try: self.slider_speed_x.setFixedHeight(36)
         except Exception: pass
-        self.slider_speed_x.valueChanged.connect(lambda v: (setattr(self.params, 'speed_x', v), self.update_preview()))
+        self.slider_speed_x.valueChanged.connect(self._make_setter('params', 'speed_x'))
         speed_x_row.addWidget(speed_x_label)
         speed_x_row.addWidget(self.slider_speed_x, 1)
         waves_layout.addLayout(speed_x_row)
@@ -3106,12 +3807,12 @@ class MainWindow(QWidget):
         speed_y_row = QHBoxLayout()
         speed_y_row.setContentsMargins(0, 12, 0, 12)
         speed_y_label = QLabel("speed Y")
-        speed_y_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        speed_y_label.setObjectName(_OBJ_NAMES["row_label"])
         speed_y_label.setFixedWidth(180)
         self.slider_speed_y = CustomSlider(-3.0, 3.0, self.params.speed_y)
         try: self.slider_speed_y.setFixedHeight(36)
         except Exception: pass
-        self.slider_speed_y.valueChanged.connect(lambda v: (setattr(self.params, 'speed_y', v), self.update_preview()))
+        self.slider_speed_y.valueChanged.connect(self._make_setter('params', 'speed_y'))
         speed_y_row.addWidget(speed_y_label)
         speed_y_row.addWidget(self.slider_speed_y, 1)
         waves_layout.addLayout(speed_y_row)
@@ -3122,12 +3823,12 @@ class MainWindow(QWidget):
         amp_row = QHBoxLayout()
         amp_row.setContentsMargins(0, 12, 0, 12)
         amp_label = QLabel("amplitude")
-        amp_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        amp_label.setObjectName(_OBJ_NAMES["row_label"])
         amp_label.setFixedWidth(180)
         self.slider_amp = CustomSlider(0.0, 2.0, self.params.amplitude)
         try: self.slider_amp.setFixedHeight(36)
         except Exception: pass
-        self.slider_amp.valueChanged.connect(lambda v: (setattr(self.params, 'amplitude', v), self.update_preview()))
+        self.slider_amp.valueChanged.connect(self._make_setter('params', 'amplitude'))
         amp_row.addWidget(amp_label)
         amp_row.addWidget(self.slider_amp, 1)
         waves_layout.addLayout(amp_row)
@@ -3137,379 +3838,82 @@ class MainWindow(QWidget):
         contrast_row = QHBoxLayout()
         contrast_row.setContentsMargins(0, 12, 0, 12)
         contrast_label = QLabel("contrast")
-        contrast_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        contrast_label.setObjectName(_OBJ_NAMES["row_label"])
         contrast_label.setFixedWidth(180)
         self.slider_contrast = CustomSlider(0.5, 2.5, self.params.contrast)
         try: self.slider_contrast.setFixedHeight(36)
         except Exception: pass
-        self.slider_contrast.valueChanged.connect(lambda v: (setattr(self.params, 'contrast', v), self.update_preview()))
+        self.slider_contrast.valueChanged.connect(self._make_setter('params', 'contrast'))
         contrast_row.addWidget(contrast_label)
         contrast_row.addWidget(self.slider_contrast, 1)
         waves_layout.addLayout(contrast_row)
         
         layout.addWidget(self.waves_section)
         
-        # === SECTION: Audio reactive (shown only for audioreactive) ===
-        self.audio_reactive_section, ar_layout = self._create_new_section("audio reactive")
-        # global sensitivity
-        ar_row = QHBoxLayout()
-        ar_row.setContentsMargins(0, 0, 0, 0)
-        ar_label = QLabel("sensitivity")
-        ar_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.audio_sensitivity_display = QLabel("100%")
-        self.audio_sensitivity_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.audio_sensitivity_display.setStyleSheet("color: white; font-size: 26px; font-weight: bold; background: transparent; padding-right: 20px;")
-        # simple +/- buttons capsule
-        ar_buttons = QWidget()
-        ar_buttons.setFixedSize(93, 48)
-        ar_buttons.setStyleSheet("QWidget{background: transparent; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;}")
-        arb = QHBoxLayout(ar_buttons)
-        arb.setContentsMargins(2,2,2,2); arb.setSpacing(0)
-        btn_minus = QPushButton("-"); btn_minus.setFixedSize(44,44)
-        btn_plus  = QPushButton("+"); btn_plus.setFixedSize(44,44)
-        btn_minus.clicked.connect(lambda: self._change_audio_sensitivity(-1))
-        btn_plus.clicked.connect(lambda: self._change_audio_sensitivity(1))
-        arb.addWidget(btn_minus)
-        sep = QWidget(); sep.setFixedSize(1,44)
-        sep.setStyleSheet("background: white;")
-        arb.addWidget(sep)
-        arb.addWidget(btn_plus)
-        ar_row.addWidget(ar_label); ar_row.addStretch(); ar_row.addWidget(self.audio_sensitivity_display); ar_row.addWidget(ar_buttons)
-        ar_layout.addLayout(ar_row)
-        ar_layout.addSpacing(10)
-        # per-band sliders (placeholders)
-        names = ["60 Hz","150 Hz","400 Hz","1 kHz","2.4 kHz","15 kHz"]
-        for i, n in enumerate(names):
-            row = QHBoxLayout(); row.setContentsMargins(0,12,0,12)
-            lbl = QLabel(f"band {n}"); lbl.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-            sld = CustomSlider(0.0, 2.0, 1.0)
-            sld.valueChanged.connect(lambda v, idx=i: self._on_ar_band_gain_changed(idx, v))
-            row.addWidget(lbl); row.addSpacing(20); row.addWidget(sld,1)
-            ar_layout.addLayout(row)
-        self.audio_reactive_section.hide()
-        layout.addWidget(self.audio_reactive_section)
-
-        # === SECTION: AudioReactive Alt (shown only for audioreactive_alt) ===
-        self.ar_alt_section, ar_alt_layout = self._create_new_section("audio overlays")
-        # Preset
-        preset_row = QHBoxLayout(); preset_row.setContentsMargins(0,0,0,0)
-        preset_label = QLabel("preset"); preset_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.cb_preset = QComboBox(); self.cb_preset.addItems(["Chill","Rhythmic","Impact"]) 
-        self.cb_preset.setFixedWidth(160)
-        self.cb_preset.currentTextChanged.connect(self._on_ar_alt_preset_changed)
-        preset_row.addWidget(preset_label); preset_row.addStretch(); preset_row.addWidget(self.cb_preset)
-        ar_alt_layout.addLayout(preset_row)
-        ar_alt_layout.addSpacing(8)
-        # OpenGL preview toggle and widget
-        try:
-            from asciinator.utils.gl_preview import GLPreviewWidget
-            ogl_row = QHBoxLayout(); ogl_row.setContentsMargins(0,0,0,0)
-            ogl_label = QLabel("OpenGL preview"); ogl_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-            self.chk_gl_preview = CustomCheckbox("Enable"); self.chk_gl_preview.setChecked(False)
-            ogl_row.addWidget(ogl_label); ogl_row.addStretch(); ogl_row.addWidget(self.chk_gl_preview)
-            ar_alt_layout.addLayout(ogl_row)
-            self.gl_preview = GLPreviewWidget(self)
-            self.gl_preview.setVisible(False)
-            ar_alt_layout.addWidget(self.gl_preview)
-            self.chk_gl_preview.stateChanged.connect(lambda s: self.gl_preview.setVisible(bool(s)))
-        except Exception:
-            self.gl_preview = None
-        # Overlay toggles
-        toggles = QHBoxLayout(); toggles.setContentsMargins(0,0,0,0)
-        self.chk_outline = CustomCheckbox("Outline")
-        self.chk_rays = CustomCheckbox("Rays")
-        self.chk_bands = CustomCheckbox("Bands")
-        self.chk_sparkles = CustomCheckbox("Sparkles")
-        self.chk_echo = CustomCheckbox("Echo")
-        self.chk_bg = CustomCheckbox("Background")
-        # GPU Acceleration (Torch)
-        self.chk_gpu = CustomCheckbox("GPU (Torch)")
-        self.chk_gpu.setChecked(False)
-        for w in [self.chk_outline, self.chk_rays, self.chk_bands, self.chk_sparkles, self.chk_echo, self.chk_bg, self.chk_gpu]:
-            toggles.addWidget(w)
-            toggles.addSpacing(16)
-        toggles.addStretch()
-        ar_alt_layout.addLayout(toggles)
-        ar_alt_layout.addSpacing(8)
-        # Slider helper with unified sizing/alignment
-        def add_labeled_slider(text, minv, maxv, init):
-            row = QHBoxLayout(); row.setContentsMargins(0,8,0,8)
-            lbl = QLabel(text)
-            lbl.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-            lbl.setFixedWidth(180)
-            sld = CustomSlider(minv, maxv, init)
-            try:
-                sld.setFixedHeight(36)
-            except Exception:
-                pass
-            row.addWidget(lbl)
-            row.addWidget(sld, 1)
-            ar_alt_layout.addLayout(row)
-            return sld
-        # Rays
-        self.rays_count = add_labeled_slider("rays: count", 1, 64, 12)
-        self.rays_length = add_labeled_slider("rays: max length", 5, 200, 80)
-        self.rays_spread = add_labeled_slider("rays: spread°", 0, 120, 45)
-        self.rays_intensity = add_labeled_slider("rays: intensity", 0.0, 5.0, 1.0)
-        # Echo lines
-        self.echo_lines = add_labeled_slider("echo: lines", 0, 12, 4)
-        self.echo_spacing = add_labeled_slider("echo: spacing", 2.0, 40.0, 10.0)
-        self.echo_band = add_labeled_slider("echo: band width", 1.0, 12.0, 3.0)
-        # Bands
-        self.bands_step = add_labeled_slider("bands: step px", 2, 24, 8)
-        self.bands_thickness = add_labeled_slider("bands: thickness", 1, 12, 3)
-        self.bands_speed = add_labeled_slider("bands: speed", 0, 5, 1)
-        # Outline
-        self.outline_width = add_labeled_slider("outline: width", 1, 6, 2)
-        self.outline_intensity = add_labeled_slider("outline: intensity", 0, 1, 0.6)
-        # Sparkles
-        self.sparkles_density = add_labeled_slider("sparkles: density", 0, 1, 0.3)
-        self.sparkles_speed = add_labeled_slider("sparkles: speed", 0, 5, 1)
-        self.sparkles_gain = add_labeled_slider("sparkles: gain", 0.0, 10.0, 3.0)
-        # Background
-        self.bg_intensity = add_labeled_slider("background: intensity", 0.0, 2.0, 0.5)
-        self.bg_speed = add_labeled_slider("background: speed", 0.0, 5.0, 1.0)
-        ar_alt_layout.addSpacing(8)
-        # Audio controls (global)
-        self.ar_alt_sens = add_labeled_slider("audio: sensitivity", 0, 2, 1)
-        # per-band mini sliders
-        band_box = QVBoxLayout(); band_box.setContentsMargins(0,0,0,0)
-        band_title = QLabel("audio: per-band"); band_title.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        band_box.addWidget(band_title)
-        for i, n in enumerate(["60","150","400","1k","2.4k","15k"]):
-            row = QHBoxLayout(); row.setContentsMargins(0,8,0,8)
-            lbl = QLabel(n); lbl.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-            lbl.setFixedWidth(180)
-            s = CustomSlider(0.0, 2.0, 1.0)
-            try:
-                s.setFixedHeight(36)
-            except Exception:
-                pass
-            s.valueChanged.connect(lambda v, idx=i: self._on_ar_band_gain_changed(idx, v))
-            row.addWidget(lbl)
-            row.addWidget(s,1)
-            band_box.addLayout(row)
-        ar_alt_layout.addLayout(band_box)
-        # Attack/Release/Noise Gate/Beat boost/Motion-Budget
-        self.ar_alt_attack = add_labeled_slider("audio: attack (ms)", 1, 100, 15)
-        self.ar_alt_release = add_labeled_slider("audio: release (ms)", 20, 400, 180)
-        self.ar_alt_gate = add_labeled_slider("audio: noise gate (dB)", -80, -10, -40)
-        self.ar_alt_beat = add_labeled_slider("audio: beat boost", 0, 2, 0.6)
-        self.ar_alt_mb = add_labeled_slider("audio: motion-budget range", 0.4, 1.8, 1.2)
-        # Quality
-        self.ar_alt_max_points = add_labeled_slider("quality: max points per contour", 50, 1500, 400)
-        self.ar_alt_df_step = add_labeled_slider("quality: downsample dist field (px)", 1, 8, 3)
-        self.ar_alt_section.hide()
-        layout.addWidget(self.ar_alt_section)
-        
-        # === SECTION: Contourswim parameters (only for contourswim) ===
-        self.contour_section, contour_layout = self._create_new_section("contourswim params")
-        contour_layout.setSpacing(0)
-        
-        # 1. Edge sensitivity
-        edge_sens_row = QHBoxLayout()
-        edge_sens_row.setContentsMargins(0, 12, 0, 12)
-        edge_sens_label = QLabel("edge sensitivity")
-        edge_sens_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        
-        self.slider_edge_sensitivity = CustomSlider(0.0, 100.0, 30.0)
-        self.slider_edge_sensitivity.valueChanged.connect(lambda v: setattr(self, 'contour_edge_sensitivity', v))
+        # Секции audio reactive / audio overlays / contourswim строятся лениво
+        # при первом выборе режима (см. _ensure_mode_section)
+        self._canvas_layout = layout
         
-        edge_sens_row.addWidget(edge_sens_label)
-        edge_sens_row.addSpacing(20)
-        edge_sens_row.addWidget(self.slider_edge_sensitivity, 1)
-        contour_layout.addLayout(edge_sens_row)
-        contour_layout.addSpacing(10)
-        
-        # 2. Wave speed
-        wave_speed_row = QHBoxLayout()
-        wave_speed_row.setContentsMargins(0, 12, 0, 12)
-        wave_speed_label = QLabel("wave speed")
-        wave_speed_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        layout.addStretch()
+        layout.setEnabled(True)
+        widget.setUpdatesEnabled(True)
+        return widget
         
-        self.slider_wave_speed = CustomSlider(0.0, 200.0, 100.0)
-        self.slider_wave_speed.valueChanged.connect(lambda v: setattr(self, 'contour_wave_speed', v))
+    def _create_color_tab(self):
+        # Tab: Color
+        widget = QWidget()
+        layout = TightVBox(widget, spacing=10)
         
-        wave_speed_row.addWidget(wave_speed_label)
-        wave_speed_row.addSpacing(20)
-        wave_speed_row.addWidget(self.slider_wave_speed, 1)
-        contour_layout.addLayout(wave_speed_row)
-        contour_layout.addSpacing(10)
+        # Одна большая секция без заголовка (padding 20px автоматически)
+        container, container_layout = self._create_new_section("")
         
-        # 3. Amplitude of oscillations
-        amplitude_row = QHBoxLayout()
-        amplitude_row.setContentsMargins(0, 12, 0, 12)
-        amplitude_label = QLabel("oscillation amplitude")
-        amplitude_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        # Горизонтальный layout для двух колонок
+        columns_layout = TightHBox(spacing=20)
         
-        self.slider_contour_amplitude = CustomSlider(0.0, 100.0, 50.0)
-        self.slider_contour_amplitude.valueChanged.connect(lambda v: setattr(self, 'contour_amplitude', v))
+        # ========== ЛЕВАЯ КОЛОНКА: ЦВЕТ СИМВОЛОВ ==========
+        left_column = QWidget()
+        left_layout = TightVBox(left_column, spacing=0)
         
-        amplitude_row.addWidget(amplitude_label)
-        amplitude_row.addSpacing(20)
-        amplitude_row.addWidget(self.slider_contour_amplitude, 1)
-        contour_layout.addLayout(amplitude_row)
-        contour_layout.addSpacing(10)
+        # Заголовок секции
+        symbols_title = QLabel("symbol colors")
+        symbols_title.setStyleSheet(_STYLE["section_title"])
+        left_layout.addWidget(symbols_title)
+        left_layout.addSpacing(20)
         
-        # 4. Number of layers
-        layers_row = QHBoxLayout()
-        layers_row.setContentsMargins(0, 0, 0, 0)
-        layers_label = QLabel("layers")
-        layers_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        
-        self.stepper_layers = NewStepperWidget(3, 1, 5, self, "number of layers")
-        self.stepper_layers.valueChanged.connect(lambda v: setattr(self, 'contour_layers', v))
-        
-        layers_row.addWidget(layers_label)
-        layers_row.addStretch()
-        layers_row.addWidget(self.stepper_layers)
-        contour_layout.addLayout(layers_row)
-        contour_layout.addSpacing(10)
-        
-        # 5. Edge blur
-        blur_row = QHBoxLayout()
-        blur_row.setContentsMargins(0, 12, 0, 12)
-        blur_label = QLabel("edge blur")
-        blur_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        
-        self.slider_edge_blur = CustomSlider(0.0, 100.0, 0.0)
-        self.slider_edge_blur.valueChanged.connect(lambda v: setattr(self, 'contour_edge_blur', v))
-        
-        blur_row.addWidget(blur_label)
-        blur_row.addSpacing(20)
-        blur_row.addWidget(self.slider_edge_blur, 1)
-        contour_layout.addLayout(blur_row)
-        contour_layout.addSpacing(10)
-        
-        # 6. Glow intensity
-        glow_row = QHBoxLayout()
-        glow_row.setContentsMargins(0, 12, 0, 12)
-        glow_label = QLabel("glow intensity")
-        glow_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        
-        self.slider_contour_glow = CustomSlider(0.0, 100.0, 50.0)
-        self.slider_contour_glow.valueChanged.connect(lambda v: setattr(self, 'contour_glow', v))
-        
-        glow_row.addWidget(glow_label)
-        glow_row.addSpacing(20)
-        glow_row.addWidget(self.slider_contour_glow, 1)
-        contour_layout.addLayout(glow_row)
-        
-        layout.addWidget(self.contour_section)
-        
-        # By default, we hide the contourswim section
-        self.contour_section.hide()
-        
-        layout.addStretch()
-        return widget
-        
-    def _create_color_tab(self):
-        # Tab: Color
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
-        
-        # Одна большая секция без заголовка (padding 20px автоматически)
-        container, container_layout = self._create_new_section("")
-        
-        # Горизонтальный layout для двух колонок
-        columns_layout = QHBoxLayout()
-        columns_layout.setContentsMargins(0, 0, 0, 0)
-        columns_layout.setSpacing(20)
-        
-        # ========== ЛЕВАЯ КОЛОНКА: ЦВЕТ СИМВОЛОВ ==========
-        left_column = QWidget()
-        left_layout = QVBoxLayout(left_column)
-        left_layout.setContentsMargins(0, 0, 0, 0)
-        left_layout.setSpacing(0)
-        
-        # Заголовок секции
-        symbols_title = QLabel("symbol colors")
-        symbols_title.setStyleSheet("""
-            color: rgba(66,66,66,1);
-            font-size: 16px;
-            background: transparent;
-        """)
-        left_layout.addWidget(symbols_title)
-        left_layout.addSpacing(20)
+        # HEX-валидатор (Qt проверяет ввод на C++ стороне, частичный ввод разрешен)
+        self._hex_validator = QRegularExpressionValidator(QRegularExpression(r'^#?[0-9A-Fa-f]{0,6}$'), self)
         
         # 5 строк с цветами
         for i in range(1, 6):
-            row = QHBoxLayout()
-            row.setContentsMargins(0, 0, 0, 0)
-            row.setSpacing(10)
+            row = TightHBox(spacing=10)
             
             # Номер
             num_label = QLabel(str(i))
             num_label.setFixedWidth(9)
-            num_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+            num_label.setObjectName(_OBJ_NAMES["row_label"])
             
             # Поле ввода HEX
-            hex_input = QLineEdit("#FFFFFF")
+            hex_input = ClickableLineEdit("#FFFFFF")
             hex_input.setFixedSize(93, 44)
             hex_input.setMaxLength(7)
-            hex_input.setStyleSheet("""
-                QLineEdit {
-                    background: transparent;
-                    border: 2px solid rgba(255,255,255,0.3);
-                    border-radius: 20px;
-                    padding: 14px;
-                    color: rgba(255,255,255,1);
-                    font-size: 16px;
-                    font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                    font-weight: 400;
-                }
-                QLineEdit:focus {
-                    border: 2px solid rgba(255,255,255,0.6);
-                }
-            """)
+            hex_input.setValidator(self._hex_validator)
+            hex_input.setStyleSheet(HEX_INPUT_QSS)
             
             # Цветной свотч с белой обводкой
-            swatch = QLabel()
+            swatch = ClickableLabel()
             swatch.setFixedSize(44, 44)
-            swatch.setStyleSheet("background: #FFFFFF; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+            self._set_swatch_color(swatch, "#FFFFFF")
             swatch.setCursor(Qt.PointingHandCursor)
             hex_input.setCursor(Qt.PointingHandCursor)  # Курсор указателя для HEX-поля
             
             # Индекс для замыкания
             idx = i - 1
             
-            # Обработчик изменения HEX-кода
-            def make_hex_changed(index, inp, sw):
-                def on_hex_change():
-                    text = inp.text().strip()
-                    pattern = r'^#?[0-9A-Fa-f]{6}$'
-                    if re.match(pattern, text):
-                        if not text.startswith('#'):
-                            text = '#' + text
-                        try:
-                            color = QColor(text)
-                            if color.isValid():
-                                sw.setStyleSheet(f"background: {text}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
-                                self.color_stops[index] = (color.red(), color.green(), color.blue())
-                                self.update_preview(True)
-                        except:
-                            pass
-                return on_hex_change
-            
-            hex_input.editingFinished.connect(make_hex_changed(idx, hex_input, swatch))
-            
-            # Обработчик клика по свотчу И по HEX-полю
-            def make_color_picker(index, inp, sw):
-                def pick():
-                    color = QColorDialog.getColor(QColor(inp.text() or "#FFFFFF"), self)
-                    if color.isValid():
-                        hex_val = f"#{color.red():02X}{color.green():02X}{color.blue():02X}"
-                        inp.setText(hex_val)
-                        sw.setStyleSheet(f"background: {hex_val}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
-                        self.color_stops[index] = (color.red(), color.green(), color.blue())
-                        self.update_preview(True)
-                return pick
-            
-            picker_func = make_color_picker(idx, hex_input, swatch)
-            swatch.mousePressEvent = lambda e, f=picker_func: f()
-            hex_input.mousePressEvent = lambda e, f=picker_func: f()  # Клик на HEX-поле тоже открывает picker
+            # Обработчики изменения HEX-кода и клика по свотчу И по HEX-полю
+            hex_input.editingFinished.connect(partial(self._on_hex_change, idx, hex_input, swatch))
+            picker_func = partial(self._pick_color, idx, hex_input, swatch)
+            swatch.clicked.connect(picker_func)
+            hex_input.clicked.connect(picker_func)  # Клик на HEX-поле тоже открывает picker
             
             row.addWidget(num_label)
             row.addSpacing(10)
@@ -3518,8 +3922,8 @@ class MainWindow(QWidget):
             row.addWidget(swatch)
             row.addStretch()
             
-            self.color_inputs.append(hex_input)
-            self.color_swatches.append(swatch)
+            self.color_inputs[idx] = hex_input
+            self.color_swatches[idx] = swatch
             
             left_layout.addLayout(row)
             
@@ -3532,68 +3936,45 @@ class MainWindow(QWidget):
         
         # ========== ПРАВАЯ КОЛОНКА: ЦВЕТ ФОНА + КНОПКИ ==========
         right_column = QWidget()
-        right_layout = QVBoxLayout(right_column)
-        right_layout.setContentsMargins(0, 0, 0, 0)
-        right_layout.setSpacing(0)
+        right_layout = TightVBox(right_column, spacing=0)
         
         # Заголовок секции
         bg_title = QLabel("background color")
-        bg_title.setStyleSheet("""
-            color: rgba(66,66,66,1);
-            font-size: 16px;
-            background: transparent;
-        """)
+        bg_title.setStyleSheet(_STYLE["section_title"])
         right_layout.addWidget(bg_title)
         right_layout.addSpacing(20)
         
         # Строка с цветом фона
-        bg_row = QHBoxLayout()
-        bg_row.setContentsMargins(0, 0, 0, 0)
-        bg_row.setSpacing(10)
+        bg_row = TightHBox(spacing=10)
         
         # Номер "1"
         bg_num_label = QLabel("1")
         bg_num_label.setFixedWidth(9)
-        bg_num_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        bg_num_label.setObjectName(_OBJ_NAMES["row_label"])
         
         # Поле ввода HEX
-        self.bg_hex_input = QLineEdit("#000000")
+        self.bg_hex_input = ClickableLineEdit("#000000")
         self.bg_hex_input.setFixedSize(93, 44)
         self.bg_hex_input.setMaxLength(7)
-        self.bg_hex_input.setStyleSheet("""
-            QLineEdit {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 20px;
-                padding: 14px;
-                color: rgba(255,255,255,1);
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QLineEdit:focus {
-                border: 2px solid rgba(255,255,255,0.6);
-            }
-        """)
+        self.bg_hex_input.setValidator(self._hex_validator)
+        self.bg_hex_input.setStyleSheet(HEX_INPUT_QSS)
         
         # Свотч фона с белой обводкой
-        self.bg_swatch = QLabel()
+        self.bg_swatch = ClickableLabel()
         self.bg_swatch.setFixedSize(44, 44)
-        self.bg_swatch.setStyleSheet("background: #000000; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+        self._set_swatch_color(self.bg_swatch, "#000000")
         self.bg_swatch.setCursor(Qt.PointingHandCursor)
         self.bg_hex_input.setCursor(Qt.PointingHandCursor)  # Курсор указателя для HEX-поля
         
         # Обработчик изменения HEX-кода фона
         def on_bg_hex_change():
-            text = self.bg_hex_input.text().strip()
-            pattern = r'^#?[0-9A-Fa-f]{6}$'
-            if re.match(pattern, text):
-                if not text.startswith('#'):
-                    text = '#' + text
+            # Символы уже проверены валидатором, остается проверить длину
+            text = '#' + self.bg_hex_input.text().strip().lstrip('#')
+            if len(text) == 7:
                 try:
                     color = QColor(text)
                     if color.isValid():
-                        self.bg_swatch.setStyleSheet(f"background: {text}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+                        self._set_swatch_color(self.bg_swatch, text)
                         self.render_bg = (color.red(), color.green(), color.blue())
                         self.update_preview(True)
                 except:
@@ -3605,14 +3986,15 @@ class MainWindow(QWidget):
         def pick_bg():
             color = QColorDialog.getColor(QColor(self.bg_hex_input.text() or "#000000"), self)
             if color.isValid():
-                hex_val = f"#{color.red():02X}{color.green():02X}{color.blue():02X}"
-                self.bg_hex_input.setText(hex_val)
-                self.bg_swatch.setStyleSheet(f"background: {hex_val}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
                 self.render_bg = (color.red(), color.green(), color.blue())
+                hex_val = color.name(QColor.HexRgb).upper()
+                with QSignalBlocker(self.bg_hex_input):
+                    self.bg_hex_input.setText(hex_val)
+                self._set_swatch_color(self.bg_swatch, hex_val)
                 self.update_preview(True)
         
-        self.bg_swatch.mousePressEvent = lambda e: pick_bg()
-        self.bg_hex_input.mousePressEvent = lambda e: pick_bg()  # Клик на HEX-поле тоже открывает picker
+        self.bg_swatch.clicked.connect(pick_bg)
+        self.bg_hex_input.clicked.connect(pick_bg)  # Клик на HEX-поле тоже открывает picker
         
         bg_row.addWidget(bg_num_label)
         bg_row.addSpacing(10)
@@ -3625,30 +4007,13 @@ class MainWindow(QWidget):
         right_layout.addStretch()  # Push buttons down
         
         # Кнопки внизу справа (обернуты в QHBoxLayout для прижатия к правому краю)
-        btn_random_row = QHBoxLayout()
-        btn_random_row.setContentsMargins(0, 0, 0, 0)
+        btn_random_row = TightHBox()
         btn_random_row.addStretch()
         
         btn_random = QPushButton("random palette")
         btn_random.setFixedSize(209, 44)
         btn_random.setCursor(Qt.PointingHandCursor)
-        btn_random.setStyleSheet("""
-            QPushButton {
-                background: rgba(255,255,255,1);
-                color: rgba(0,0,0,1);
-                border: none;
-                border-radius: 20px;
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QPushButton:hover {
-                background: rgba(235,235,235,1);
-            }
-            QPushButton:pressed {
-                background: rgba(215,215,215,1);
-            }
-        """)
+        btn_random.setStyleSheet(PRIMARY_BUTTON_QSS)
         btn_random.clicked.connect(self.randomize_palette)
         btn_random_row.addWidget(btn_random)
         
@@ -3656,30 +4021,13 @@ class MainWindow(QWidget):
         right_layout.addSpacing(10)  # 10px between buttons
         
         # Кнопка "импорт палитры"
-        btn_import_row = QHBoxLayout()
-        btn_import_row.setContentsMargins(0, 0, 0, 0)
+        btn_import_row = TightHBox()
         btn_import_row.addStretch()
         
         btn_import_palette = QPushButton("import palette")
         btn_import_palette.setFixedSize(209, 44)
         btn_import_palette.setCursor(Qt.PointingHandCursor)
-        btn_import_palette.setStyleSheet("""
-            QPushButton {
-                background: rgba(255,255,255,1);
-                color: rgba(0,0,0,1);
-                border: none;
-                border-radius: 20px;
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QPushButton:hover {
-                background: rgba(235,235,235,1);
-            }
-            QPushButton:pressed {
-                background: rgba(215,215,215,1);
-            }
-        """)
+        btn_import_palette.setStyleSheet(PRIMARY_BUTTON_QSS)
         btn_import_palette.clicked.connect(self.import_palette)
         btn_import_row.addWidget(btn_import_palette)
         
@@ -3695,98 +4043,127 @@ class MainWindow(QWidget):
         
         return widget
         
+    def _on_hex_change(self, index, inp, sw):
+        # Обработчик изменения HEX-кода цвета символов
+        # Символы уже проверены валидатором, остается проверить длину
+        text = '#' + inp.text().strip().lstrip('#')
+        if len(text) == 7:
+            try:
+                color = QColor(text)
+                if color.isValid():
+                    self._set_swatch_color(sw, text)
+                    self.color_stops[index] = (color.red(), color.green(), color.blue())
+                    self.update_preview(True)
+            except:
+                pass
+
+    def _pick_color(self, index, inp, sw):
+        # Выбор цвета символов через QColorDialog
+        color = QColorDialog.getColor(QColor(inp.text() or "#FFFFFF"), self)
+        if color.isValid():
+            # Кэшируем rgb сразу, строку берём из QColor.name() без повторного парсинга
+            self.color_stops[index] = (color.red(), color.green(), color.blue())
+            hex_val = color.name(QColor.HexRgb).upper()
+            with QSignalBlocker(inp):
+                inp.setText(hex_val)
+            self._set_swatch_color(sw, hex_val)
+            self.update_preview(True)
+
     def _create_modes_tab(self):
         # Tab: Mode
         widget = QWidget()
-        widget.setStyleSheet("QWidget { background: transparent; }")
+        widget.setStyleSheet(_STYLE["transparent_page"])
         
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)
+        layout = TightVBox(widget, spacing=10)
         
         # === SECTION: Mode ===
         mode_section, mode_layout = self._create_new_section("mode")
         
         # Dropdown for mode selection
-        dropdown_row = QHBoxLayout()
-        dropdown_row.setContentsMargins(0, 0, 0, 0)
+        dropdown_row = TightHBox()
         
         self.cb_mode = QComboBox()
         # Temporarily hide 'audioreactive_alt' from UI (kept in codebase)
         self.cb_mode.addItems(["waves", "morph", "audioreactive", "contourswim"]) 
         self.cb_mode.setFixedHeight(44)
-        self.cb_mode.setStyleSheet("""
-            QComboBox {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 20px;
-                padding: 14px;
-                color: rgba(255,255,255,1);
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QComboBox:focus {
-                border: 2px solid rgba(255,255,255,0.6);
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 6px solid white;
-                margin-right: 15px;
-            }
-            QComboBox QAbstractItemView {
-                background: rgba(0,0,0,1);
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 10px;
-                selection-background-color: rgba(255,255,255,0.2);
-                color: white;
-                padding: 5px;
-            }
-        """)
-        self.cb_mode.currentTextChanged.connect(self.on_mode_changed)
+        self.cb_mode.setStyleSheet(MODE_COMBO_QSS)
+        # Debounce: быстрые переключения режима схлопываются в одно применение
+        self._mode_change_timer = QTimer(self)
+        self._mode_change_timer.setSingleShot(True)
+        self._mode_change_timer.setInterval(80)
+        self._mode_change_timer.timeout.connect(self._apply_pending_mode)
+        self.cb_mode.currentTextChanged.connect(lambda _: self._mode_change_timer.start())
         dropdown_row.addWidget(self.cb_mode)
         mode_layout.addLayout(dropdown_row)
         mode_layout.addSpacing(10)  # 10px between dropdown and content
         
+        # Виджеты morph / audioreactive / contourswim строятся лениво при первом выборе режима
+        self._mode_layout = mode_layout
+        
+        layout.addWidget(mode_section)
+        layout.addStretch()
+        
+        return widget
+        
+    # Секции, зависящие от режима: атрибут -> (builder, host layout attr, режимы, где секция видна)
+    _MODE_SECTIONS = {
+        "morph_widget": ("_build_morph_widget", "_mode_layout", ("morph",)),
+        "audio_widget": ("_build_audio_widget", "_mode_layout", ("audioreactive",)),
+        "contourswim_widget": ("_build_contourswim_widget", "_mode_layout", ("contourswim",)),
+        "audio_reactive_section": ("_build_audio_reactive_section", "_canvas_layout", ("audioreactive",)),
+        # Hide audioreactive_alt panel while the mode is disabled in UI
+        "ar_alt_section": ("_build_ar_alt_section", "_canvas_layout", ()),
+        "contour_section": ("_build_contour_section", "_canvas_layout", ("contourswim",)),
+    }
+    # Режим -> секции, которые строятся при его первом выборе
+    # (ar_alt_section строится для audioreactive_alt, но пока остаётся скрытой)
+    _MODE_BUILDS = {
+        "morph": ("morph_widget",),
+        "audioreactive": ("audio_widget", "audio_reactive_section"),
+        "contourswim": ("contourswim_widget", "contour_section"),
+        "audioreactive_alt": ("ar_alt_section",),
+    }
+
+    def _ensure_mode_section(self, name):
+        # Строит секцию режима при первом обращении и кэширует её в self._mode_sections
+        section = self._mode_sections.get(name)
+        if section is None:
+            builder, host_attr, _modes = self._MODE_SECTIONS[name]
+            section = getattr(self, builder)()
+            section.hide()
+            host = getattr(self, host_attr)
+            if host is self._canvas_layout:
+                host.insertWidget(host.count() - 1, section)  # перед addStretch()
+            else:
+                host.addWidget(section)
+            self._mode_sections[name] = section
+            setattr(self, name, section)
+        return section
+
+    def _ensure_mode_widget(self, mode):
+        # Строит (однократно) все секции, нужные режиму mode, и возвращает их
+        return [self._ensure_mode_section(name) for name in self._MODE_BUILDS.get(mode, ())]
+
+    def _build_morph_widget(self):
         # Mode: morph
         morph_widget = QWidget()
-        morph_layout = QVBoxLayout(morph_widget)
-        morph_layout.setContentsMargins(0, 0, 0, 0)  # We manually control spacing
+        morph_layout = TightVBox(morph_widget)  # We manually control spacing
         
         # Row: morph speed (design similar to columns/rows)
-        morph_row = QHBoxLayout()
-        morph_row.setContentsMargins(0, 0, 0, 0)  # No paddings - container already gives 20px
+        morph_row = TightHBox()  # No paddings - container already gives 20px
         
         morph_label = QLabel("morph speed")
-        morph_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        morph_label.setObjectName(_OBJ_NAMES["row_label"])
         
         # Large number (like in columns)
-        self.morph_speed_display = QLabel("100%")
+        self.morph_speed_display = QLabel(_pct_text(self.morph_speed))
         self.morph_speed_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.morph_speed_display.setStyleSheet("""
-            color: white;
-            font-size: 26px;
-            font-weight: bold;
-            background: transparent;
-            padding-right: 20px;
-        """)
+        self.morph_speed_display.setObjectName(_OBJ_NAMES["value_display"])
         
         # Container for buttons -/+ "pill" with common border
         morph_buttons = QWidget()
         morph_buttons.setFixedSize(93, 48)  # Increase by 4px for border
-        morph_buttons.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 22px;
-            }
-        """)
+        morph_buttons.setStyleSheet(PILL_BUTTON_QSS)
         morph_buttons_layout = QHBoxLayout(morph_buttons)
         morph_buttons_layout.setContentsMargins(2, 2, 2, 2)  # Compensate for border
         morph_buttons_layout.setSpacing(0)
@@ -3794,58 +4171,17 @@ class MainWindow(QWidget):
         btn_morph_minus = QPushButton("-")
         btn_morph_minus.setFixedSize(44, 44)
         btn_morph_minus.clicked.connect(lambda: self._change_morph_speed(-5))
-        btn_morph_minus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                border: none;
-                font-size: 26px;
-                font-weight: normal;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-                border-top-left-radius: 20px;
-                border-bottom-left-radius: 20px;
-            }
-        """)
+        btn_morph_minus.setObjectName(_OBJ_NAMES["pill_minus"])
         
         btn_morph_plus = QPushButton("+")
         btn_morph_plus.setFixedSize(44, 44)
         btn_morph_plus.clicked.connect(lambda: self._change_morph_speed(5))
-        btn_morph_plus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                border: none;
-                font-size: 26px;
-                font-weight: normal;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-                border-top-right-radius: 20px;
-                border-bottom-right-radius: 20px;
-            }
-        """)
+        btn_morph_plus.setObjectName(_OBJ_NAMES["pill_plus"])
         
         morph_buttons_layout.addWidget(btn_morph_minus)
         
         # Vertical line-separator (shorter above and below)
-        separator_container = QWidget()
-        separator_container.setFixedSize(1, 44)  # Height = height of buttons
-        separator_container.setStyleSheet("background: transparent;")
-        separator_layout = QVBoxLayout(separator_container)
-        separator_layout.setContentsMargins(0, 4, 0, 4)
-        separator_layout.setSpacing(0)
-        
-        separator_line = QWidget()
-        separator_line.setStyleSheet("background: white;")
-        separator_layout.addWidget(separator_line)
-        
-        morph_buttons_layout.addWidget(separator_container)
+        morph_buttons_layout.addWidget(PillSeparator())
         
         morph_buttons_layout.addWidget(btn_morph_plus)
         
@@ -3857,70 +4193,39 @@ class MainWindow(QWidget):
         morph_layout.addSpacing(10)  # 10px between elements
         
         # Button: import second image
-        morph_btn_row = QHBoxLayout()
-        morph_btn_row.setContentsMargins(0, 0, 0, 0)  # No paddings - container already gives 20px
+        morph_btn_row = TightHBox()  # No paddings - container already gives 20px
         
         self.btn_load_morph = QPushButton("import second image")
         self.btn_load_morph.setFixedHeight(44)
         self.btn_load_morph.setCursor(Qt.PointingHandCursor)
-        self.btn_load_morph.setStyleSheet("""
-            QPushButton {
-                background: rgba(255,255,255,1);
-                color: rgba(0,0,0,1);
-                border: none;
-                border-radius: 20px;
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QPushButton:hover {
-                background: rgba(235,235,235,1);
-            }
-            QPushButton:pressed {
-                background: rgba(215,215,215,1);
-            }
-        """)
+        self.btn_load_morph.setStyleSheet(PRIMARY_BUTTON_QSS)
         self.btn_load_morph.clicked.connect(self.on_load_morph_target)
         morph_btn_row.addWidget(self.btn_load_morph)
         morph_layout.addLayout(morph_btn_row)
         morph_layout.addSpacing(10)  # 10px between elements
         
-        mode_layout.addWidget(morph_widget)
-        self.morph_widget = morph_widget  # Save reference
-        
+        return morph_widget
+
+    def _build_audio_widget(self):
         # Mode: audioreactive
         audio_widget = QWidget()
-        audio_layout = QVBoxLayout(audio_widget)
-        audio_layout.setContentsMargins(0, 0, 0, 0)  # We manually control spacing
+        audio_layout = TightVBox(audio_widget)  # We manually control spacing
         
         # Row: sensitivity (design similar to columns/rows)
-        audio_row = QHBoxLayout()
-        audio_row.setContentsMargins(0, 0, 0, 0)  # No paddings - container already gives 20px
+        audio_row = TightHBox()  # No paddings - container already gives 20px
         
         audio_label = QLabel("sensitivity")
-        audio_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        audio_label.setObjectName(_OBJ_NAMES["row_label"])
         
         # Large number (like in columns)
-        self.audio_sensitivity_display = QLabel("100%")
+        self.audio_sensitivity_display = QLabel(_pct_text((self.audio_gain / 20.0) * 200))
         self.audio_sensitivity_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.audio_sensitivity_display.setStyleSheet("""
-            color: white;
-            font-size: 26px;
-            font-weight: bold;
-            background: transparent;
-            padding-right: 20px;
-        """)
+        self.audio_sensitivity_display.setObjectName(_OBJ_NAMES["value_display"])
         
         # Container for buttons -/+ "pill" with common border
         audio_buttons = QWidget()
         audio_buttons.setFixedSize(93, 48)  # Increase by 4px for border
-        audio_buttons.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 22px;
-            }
-        """)
+        audio_buttons.setStyleSheet(PILL_BUTTON_QSS)
         audio_buttons_layout = QHBoxLayout(audio_buttons)
         audio_buttons_layout.setContentsMargins(2, 2, 2, 2)  # Compensate for border
         audio_buttons_layout.setSpacing(0)
@@ -3928,58 +4233,17 @@ class MainWindow(QWidget):
         btn_audio_minus = QPushButton("-")
         btn_audio_minus.setFixedSize(44, 44)
         btn_audio_minus.clicked.connect(lambda: self._change_audio_sensitivity(-1))
-        btn_audio_minus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                border: none;
-                font-size: 26px;
-                font-weight: normal;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-                border-top-left-radius: 20px;
-                border-bottom-left-radius: 20px;
-            }
-        """)
+        btn_audio_minus.setObjectName(_OBJ_NAMES["pill_minus"])
         
         btn_audio_plus = QPushButton("+")
         btn_audio_plus.setFixedSize(44, 44)
         btn_audio_plus.clicked.connect(lambda: self._change_audio_sensitivity(1))
-        btn_audio_plus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                border: none;
-                font-size: 26px;
-                font-weight: normal;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-                border-top-right-radius: 20px;
-                border-bottom-right-radius: 20px;
-            }
-        """)
+        btn_audio_plus.setObjectName(_OBJ_NAMES["pill_plus"])
         
         audio_buttons_layout.addWidget(btn_audio_minus)
         
         # Vertical line-separator (shorter above and below)
-        audio_separator_container = QWidget()
-        audio_separator_container.setFixedSize(1, 44)  # Height = height of buttons
-        audio_separator_container.setStyleSheet("background: transparent;")
-        audio_separator_layout = QVBoxLayout(audio_separator_container)
-        audio_separator_layout.setContentsMargins(0, 4, 0, 4)
-        audio_separator_layout.setSpacing(0)
-        
-        audio_separator_line = QWidget()
-        audio_separator_line.setStyleSheet("background: white;")
-        audio_separator_layout.addWidget(audio_separator_line)
-        
-        audio_buttons_layout.addWidget(audio_separator_container)
+        audio_buttons_layout.addWidget(PillSeparator())
         
         audio_buttons_layout.addWidget(btn_audio_plus)
         
@@ -3991,70 +4255,38 @@ class MainWindow(QWidget):
         audio_layout.addSpacing(10)  # 10px between elements
         
         # Button: open audio settings
-        audio_btn_row = QHBoxLayout()
-        audio_btn_row.setContentsMargins(0, 0, 0, 0)  # No paddings - container already gives 20px
+        audio_btn_row = TightHBox()  # No paddings - container already gives 20px
         
         self.btn_audio_settings = QPushButton("open audio settings")
         self.btn_audio_settings.setFixedHeight(44)
         self.btn_audio_settings.setCursor(Qt.PointingHandCursor)
-        self.btn_audio_settings.setStyleSheet("""
-            QPushButton {
-                background: rgba(255,255,255,1);
-                color: rgba(0,0,0,1);
-                border: none;
-                border-radius: 20px;
-                font-size: 16px;
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            QPushButton:hover {
-                background: rgba(235,235,235,1);
-            }
-            QPushButton:pressed {
-                background: rgba(215,215,215,1);
-            }
-        """)
+        self.btn_audio_settings.setStyleSheet(PRIMARY_BUTTON_QSS)
         self.btn_audio_settings.clicked.connect(lambda: self.on_settings(tab_index=1))
         audio_btn_row.addWidget(self.btn_audio_settings)
         audio_layout.addLayout(audio_btn_row)
         
-        mode_layout.addWidget(audio_widget)
-        self.audio_widget = audio_widget  # Save reference
-        
+        return audio_widget
+
+    def _build_contourswim_widget(self):
         # === WIDGET: contourswim mode ===
         contourswim_widget = QWidget()
-        contourswim_widget.setStyleSheet("QWidget { background: transparent; }")
-        contourswim_layout = QVBoxLayout(contourswim_widget)
-        contourswim_layout.setContentsMargins(0, 0, 0, 0)
-        contourswim_layout.setSpacing(0)
+        contourswim_widget.setStyleSheet(_STYLE["transparent_page"])
+        contourswim_layout = TightVBox(contourswim_widget, spacing=0)
         
         # Intensity of effect
-        contour_intensity_row = QHBoxLayout()
-        contour_intensity_row.setContentsMargins(0, 0, 0, 0)
+        contour_intensity_row = TightHBox()
         
         contour_intensity_label = QLabel("contour intensity")
-        contour_intensity_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        contour_intensity_label.setObjectName(_OBJ_NAMES["row_label"])
         
         # Display percentage
-        self.contour_intensity_display = QLabel("50%")
-        self.contour_intensity_display.setStyleSheet("""
-            color: white;
-            font-size: 26px;
-            font-weight: bold;
-            background: transparent;
-            padding-right: 20px;
-        """)
+        self.contour_intensity_display = QLabel(_pct_text(self.contour_intensity))
+        self.contour_intensity_display.setObjectName(_OBJ_NAMES["value_display"])
         
         # Container for buttons "pill"
         contour_intensity_buttons = QWidget()
         contour_intensity_buttons.setFixedSize(93, 48)
-        contour_intensity_buttons.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 22px;
-            }
-        """)
+        contour_intensity_buttons.setStyleSheet(PILL_BUTTON_QSS)
         
         contour_intensity_buttons_layout = QHBoxLayout(contour_intensity_buttons)
         contour_intensity_buttons_layout.setContentsMargins(2, 2, 2, 2)
@@ -4063,57 +4295,18 @@ class MainWindow(QWidget):
         # Buttons + and -
         btn_contour_minus = QPushButton("-")
         btn_contour_minus.setFixedSize(44, 44)
-        btn_contour_minus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                font-size: 26px;
-                font-weight: bold;
-                border: none;
-                border-radius: 20px;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-            }
-        """)
+        btn_contour_minus.setObjectName(_OBJ_NAMES["pill_minus"])
         btn_contour_minus.clicked.connect(lambda: self._change_contour_intensity(-10))
         
         btn_contour_plus = QPushButton("+")
         btn_contour_plus.setFixedSize(44, 44)
-        btn_contour_plus.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: #FFFFFF;
-                font-size: 26px;
-                font-weight: bold;
-                border: none;
-                border-radius: 20px;
-                padding-top: 0px;
-                padding-bottom: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255,255,255,0.1);
-            }
-        """)
+        btn_contour_plus.setObjectName(_OBJ_NAMES["pill_plus"])
         btn_contour_plus.clicked.connect(lambda: self._change_contour_intensity(10))
         
         contour_intensity_buttons_layout.addWidget(btn_contour_minus)
         
         # Vertical line-separator
-        contour_separator_container = QWidget()
-        contour_separator_container.setFixedSize(1, 44)
-        contour_separator_container.setStyleSheet("background: transparent;")
-        contour_separator_layout = QVBoxLayout(contour_separator_container)
-        contour_separator_layout.setContentsMargins(0, 4, 0, 4)
-        contour_separator_layout.setSpacing(0)
-        
-        contour_separator_line = QWidget()
-        contour_separator_line.setStyleSheet("background: white;")
-        contour_separator_layout.addWidget(contour_separator_line)
-        
-        contour_intensity_buttons_layout.addWidget(contour_separator_container)
+        contour_intensity_buttons_layout.addWidget(PillSeparator())
         contour_intensity_buttons_layout.addWidget(btn_contour_plus)
         
         contour_intensity_row.addWidget(contour_intensity_label)
@@ -4123,170 +4316,308 @@ class MainWindow(QWidget):
         contourswim_layout.addLayout(contour_intensity_row)
         contourswim_layout.addSpacing(10)
         
-        mode_layout.addWidget(contourswim_widget)
-        self.contourswim_widget = contourswim_widget
+        return contourswim_widget
+
+    def _build_audio_reactive_section(self):
+        # === SECTION: Audio reactive (shown only for audioreactive) ===
+        section, ar_layout = self._create_new_section("audio reactive")
+        # global sensitivity
+        ar_row = TightHBox()
+        ar_label = QLabel("sensitivity")
+        ar_label.setObjectName(_OBJ_NAMES["row_label"])
+        self.ar_sensitivity_display = QLabel(_pct_text((self.audio_gain / 20.0) * 200))
+        self.ar_sensitivity_display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.ar_sensitivity_display.setObjectName(_OBJ_NAMES["value_display"])
+        # simple +/- buttons capsule
+        ar_buttons = QWidget()
+        ar_buttons.setFixedSize(93, 48)
+        ar_buttons.setStyleSheet("QWidget{background: transparent; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;}")
+        arb = QHBoxLayout(ar_buttons)
+        arb.setContentsMargins(2,2,2,2); arb.setSpacing(0)
+        btn_minus = QPushButton("-"); btn_minus.setFixedSize(44,44)
+        btn_plus  = QPushButton("+"); btn_plus.setFixedSize(44,44)
+        btn_minus.clicked.connect(lambda: self._change_audio_sensitivity(-1))
+        btn_plus.clicked.connect(lambda: self._change_audio_sensitivity(1))
+        arb.addWidget(btn_minus)
+        arb.addWidget(PillSeparator(44, 0))
+        arb.addWidget(btn_plus)
+        ar_row.addWidget(ar_label); ar_row.addStretch(); ar_row.addWidget(self.ar_sensitivity_display); ar_row.addWidget(ar_buttons)
+        ar_layout.addLayout(ar_row)
+        ar_layout.addSpacing(10)
+        # per-band sliders (placeholders)
+        names = ["60 Hz","150 Hz","400 Hz","1 kHz","2.4 kHz","15 kHz"]
+        for i, n in enumerate(names):
+            row = QHBoxLayout(); row.setContentsMargins(0,12,0,12)
+            lbl = QLabel(f"band {n}"); lbl.setObjectName(_OBJ_NAMES["row_label"])
+            sld = CustomSlider(0.0, 2.0, 1.0)
+            sld.valueChanged.connect(lambda v, idx=i: self._on_ar_band_gain_changed(idx, v))
+            row.addWidget(lbl); row.addSpacing(20); row.addWidget(sld,1)
+            ar_layout.addLayout(row)
+        return section
+
+    def _build_ar_alt_section(self):
+        # === SECTION: AudioReactive Alt (shown only for audioreactive_alt) ===
+        section, ar_alt_layout = self._create_new_section("audio overlays")
+        # Preset
+        preset_row = QHBoxLayout(); preset_row.setContentsMargins(0,0,0,0)
+        preset_label = QLabel("preset"); preset_label.setObjectName(_OBJ_NAMES["row_label"])
+        self.cb_preset = QComboBox(); self.cb_preset.addItems(["Chill","Rhythmic","Impact"]) 
+        self.cb_preset.setFixedWidth(160)
+        self.cb_preset.currentTextChanged.connect(self._on_ar_alt_preset_changed)
+        preset_row.addWidget(preset_label); preset_row.addStretch(); preset_row.addWidget(self.cb_preset)
+        ar_alt_layout.addLayout(preset_row)
+        ar_alt_layout.addSpacing(8)
+        # OpenGL preview toggle and widget
+        try:
+            from asciinator.utils.gl_preview import GLPreviewWidget
+            ogl_row = QHBoxLayout(); ogl_row.setContentsMargins(0,0,0,0)
+            ogl_label = QLabel("OpenGL preview"); ogl_label.setObjectName(_OBJ_NAMES["row_label"])
+            self.chk_gl_preview = CustomCheckbox("Enable"); self.chk_gl_preview.setChecked(False)
+            ogl_row.addWidget(ogl_label); ogl_row.addStretch(); ogl_row.addWidget(self.chk_gl_preview)
+            ar_alt_layout.addLayout(ogl_row)
+            self.gl_preview = GLPreviewWidget(self)
+            self.gl_preview.setVisible(False)
+            ar_alt_layout.addWidget(self.gl_preview)
+            self.chk_gl_preview.stateChanged.connect(self._on_gl_preview_toggled)
+        except Exception:
+            self.gl_preview = None
+        # Overlay toggles
+        toggles = QHBoxLayout(); toggles.setContentsMargins(0,0,0,0)
+        self.chk_outline = CustomCheckbox("Outline")
+        self.chk_rays = CustomCheckbox("Rays")
+        self.chk_bands = CustomCheckbox("Bands")
+        self.chk_sparkles = CustomCheckbox("Sparkles")
+        self.chk_echo = CustomCheckbox("Echo")
+        self.chk_bg = CustomCheckbox("Background")
+        # GPU Acceleration (Torch)
+        self.chk_gpu = CustomCheckbox("GPU (Torch)")
+        self.chk_gpu.setChecked(False)
+        self.chk_gpu.toggled.connect(self._on_gpu_toggled)
+        for w in [self.chk_outline, self.chk_rays, self.chk_bands, self.chk_sparkles, self.chk_echo, self.chk_bg, self.chk_gpu]:
+            toggles.addWidget(w)
+            toggles.addSpacing(16)
+        toggles.addStretch()
+        ar_alt_layout.addLayout(toggles)
+        ar_alt_layout.addSpacing(8)
+        # Slider helper with unified sizing/alignment
+        def add_labeled_slider(text, minv, maxv, init):
+            row = QHBoxLayout(); row.setContentsMargins(0,8,0,8)
+            lbl = QLabel(text)
+            lbl.setObjectName(_OBJ_NAMES["row_label"])
+            lbl.setFixedWidth(180)
+            sld = CustomSlider(minv, maxv, init)
+            try:
+                sld.setFixedHeight(36)
+            except Exception:
+                pass
+            row.addWidget(lbl)
+            row.addWidget(sld, 1)
+            ar_alt_layout.addLayout(row)
+            return sld
+        # Rays
+        self.rays_count = add_labeled_slider("rays: count", 1, 64, 12)
+        self.rays_length = add_labeled_slider("rays: max length", 5, 200, 80)
+        self.rays_spread = add_labeled_slider("rays: spread°", 0, 120, 45)
+        self.rays_intensity = add_labeled_slider("rays: intensity", 0.0, 5.0, 1.0)
+        # Echo lines
+        self.echo_lines = add_labeled_slider("echo: lines", 0, 12, 4)
+        self.echo_spacing = add_labeled_slider("echo: spacing", 2.0, 40.0, 10.0)
+        self.echo_band = add_labeled_slider("echo: band width", 1.0, 12.0, 3.0)
+        # Bands
+        self.bands_step = add_labeled_slider("bands: step px", 2, 24, 8)
+        self.bands_thickness = add_labeled_slider("bands: thickness", 1, 12, 3)
+        self.bands_speed = add_labeled_slider("bands: speed", 0, 5, 1)
+        # Outline
+        self.outline_width = add_labeled_slider("outline: width", 1, 6, 2)
+        self.outline_intensity = add_labeled_slider("outline: intensity", 0, 1, 0.6)
+        # Sparkles
+        self.sparkles_density = add_labeled_slider("sparkles: density", 0, 1, 0.3)
+        self.sparkles_speed = add_labeled_slider("sparkles: speed", 0, 5, 1)
+        self.sparkles_gain = add_labeled_slider("sparkles: gain", 0.0, 10.0, 3.0)
+        # Background
+        self.bg_intensity = add_labeled_slider("background: intensity", 0.0, 2.0, 0.5)
+        self.bg_speed = add_labeled_slider("background: speed", 0.0, 5.0, 1.0)
+        ar_alt_layout.addSpacing(8)
+        # Audio controls (global)
+        self.ar_alt_sens = add_labeled_slider("audio: sensitivity", 0, 2, 1)
+        # per-band mini sliders
+        band_box = QVBoxLayout(); band_box.setContentsMargins(0,0,0,0)
+        band_title = QLabel("audio: per-band"); band_title.setObjectName(_OBJ_NAMES["row_label"])
+        band_box.addWidget(band_title)
+        for i, n in enumerate(["60","150","400","1k","2.4k","15k"]):
+            row = QHBoxLayout(); row.setContentsMargins(0,8,0,8)
+            lbl = QLabel(n); lbl.setObjectName(_OBJ_NAMES["row_label"])
+            lbl.setFixedWidth(180)
+            s = CustomSlider(0.0, 2.0, 1.0)
+            try:
+                s.setFixedHeight(36)
+            except Exception:
+                pass
+            s.valueChanged.connect(lambda v, idx=i: self._on_ar_band_gain_changed(idx, v))
+            row.addWidget(lbl)
+            row.addWidget(s,1)
+            band_box.addLayout(row)
+        ar_alt_layout.addLayout(band_box)
+        # Attack/Release/Noise Gate/Beat boost/Motion-Budget
+        self.ar_alt_attack = add_labeled_slider("audio: attack (ms)", 1, 100, 15)
+        self.ar_alt_release = add_labeled_slider("audio: release (ms)", 20, 400, 180)
+        self.ar_alt_gate = add_labeled_slider("audio: noise gate (dB)", -80, -10, -40)
+        self.ar_alt_beat = add_labeled_slider("audio: beat boost", 0, 2, 0.6)
+        self.ar_alt_mb = add_labeled_slider("audio: motion-budget range", 0.4, 1.8, 1.2)
+        # Quality
+        self.ar_alt_max_points = add_labeled_slider("quality: max points per contour", 50, 1500, 400)
+        self.ar_alt_df_step = add_labeled_slider("quality: downsample dist field (px)", 1, 8, 3)
+        return section
+
+    def _build_contour_section(self):
+        # === SECTION: Contourswim parameters (only for contourswim) ===
+        section, contour_layout = self._create_new_section("contourswim params")
+        contour_layout.setSpacing(0)
+        
+        # 1. Edge sensitivity
+        edge_sens_row = QHBoxLayout()
+        edge_sens_row.setContentsMargins(0, 12, 0, 12)
+        edge_sens_label = QLabel("edge sensitivity")
+        edge_sens_label.setObjectName(_OBJ_NAMES["row_label"])
         
-        # Hide all modes by default
-        self.morph_widget.hide()
-        self.audio_widget.hide()
-        self.contourswim_widget.hide()
+        self.slider_edge_sensitivity = CustomSlider(0.0, 100.0, self.contour_edge_sensitivity)
+        self.slider_edge_sensitivity.valueChanged.connect(partial(setattr, self, 'contour_edge_sensitivity'))
         
-        layout.addWidget(mode_section)
-        layout.addStretch()
+        edge_sens_row.addWidget(edge_sens_label)
+        edge_sens_row.addSpacing(20)
+        edge_sens_row.addWidget(self.slider_edge_sensitivity, 1)
+        contour_layout.addLayout(edge_sens_row)
+        contour_layout.addSpacing(10)
         
-        # Initialize default values
-        self.morph_speed = 100  # 100%
-        self.contour_intensity = 50  # 50%
+        # 2. Wave speed
+        wave_speed_row = QHBoxLayout()
+        wave_speed_row.setContentsMargins(0, 12, 0, 12)
+        wave_speed_label = QLabel("wave speed")
+        wave_speed_label.setObjectName(_OBJ_NAMES["row_label"])
         
-        # Contourswim parameters
-        self.contour_edge_sensitivity = 30.0
-        self.contour_wave_speed = 100.0
-        self.contour_amplitude = 50.0
-        self.contour_layers = 3
-        self.contour_edge_blur = 0.0
-        self.contour_glow = 50.0
+        self.slider_wave_speed = CustomSlider(0.0, 200.0, self.contour_wave_speed)
+        self.slider_wave_speed.valueChanged.connect(partial(setattr, self, 'contour_wave_speed'))
         
-        # Synchronize audio_sensitivity_display with audio_gain
-        initial_audio_percent = int((self.audio_gain / 20.0) * 200)
-        self.audio_sensitivity_display.setText(f"{initial_audio_percent}%")
+        wave_speed_row.addWidget(wave_speed_label)
+        wave_speed_row.addSpacing(20)
+        wave_speed_row.addWidget(self.slider_wave_speed, 1)
+        contour_layout.addLayout(wave_speed_row)
+        contour_layout.addSpacing(10)
         
-        return widget
+        # 3. Amplitude of oscillations
+        amplitude_row = QHBoxLayout()
+        amplitude_row.setContentsMargins(0, 12, 0, 12)
+        amplitude_label = QLabel("oscillation amplitude")
+        amplitude_label.setObjectName(_OBJ_NAMES["row_label"])
+        
+        self.slider_contour_amplitude = CustomSlider(0.0, 100.0, self.contour_amplitude)
+        self.slider_contour_amplitude.valueChanged.connect(partial(setattr, self, 'contour_amplitude'))
+        
+        amplitude_row.addWidget(amplitude_label)
+        amplitude_row.addSpacing(20)
+        amplitude_row.addWidget(self.slider_contour_amplitude, 1)
+        contour_layout.addLayout(amplitude_row)
+        contour_layout.addSpacing(10)
+        
+        # 4. Number of layers
+        layers_row = TightHBox()
+        layers_label = QLabel("layers")
+        layers_label.setObjectName(_OBJ_NAMES["row_label"])
+        
+        self.stepper_layers = NewStepperWidget(self.contour_layers, 1, 5, self, "number of layers")
+        self.stepper_layers.valueChanged.connect(partial(setattr, self, 'contour_layers'))
+        
+        layers_row.addWidget(layers_label)
+        layers_row.addStretch()
+        layers_row.addWidget(self.stepper_layers)
+        contour_layout.addLayout(layers_row)
+        contour_layout.addSpacing(10)
+        
+        # 5. Edge blur
+        blur_row = QHBoxLayout()
+        blur_row.setContentsMargins(0, 12, 0, 12)
+        blur_label = QLabel("edge blur")
+        blur_label.setObjectName(_OBJ_NAMES["row_label"])
         
+        self.slider_edge_blur = CustomSlider(0.0, 100.0, self.contour_edge_blur)
+        self.slider_edge_blur.valueChanged.connect(partial(setattr, self, 'contour_edge_blur'))
+        
+        blur_row.addWidget(blur_label)
+        blur_row.addSpacing(20)
+        blur_row.addWidget(self.slider_edge_blur, 1)
+        contour_layout.addLayout(blur_row)
+        contour_layout.addSpacing(10)
+        
+        # 6. Glow intensity
+        glow_row = QHBoxLayout()
+        glow_row.setContentsMargins(0, 12, 0, 12)
+        glow_label = QLabel("glow intensity")
+        glow_label.setObjectName(_OBJ_NAMES["row_label"])
+        
+        self.slider_contour_glow = CustomSlider(0.0, 100.0, self.contour_glow)
+        self.slider_contour_glow.valueChanged.connect(partial(setattr, self, 'contour_glow'))
+        
+        glow_row.addWidget(glow_label)
+        glow_row.addSpacing(20)
+        glow_row.addWidget(self.slider_contour_glow, 1)
+        contour_layout.addLayout(glow_row)
+        
+        return section
+
     def _create_postfx_tab(self):
         # Tab: PostFX
         widget = QWidget()
-        widget.setStyleSheet("QWidget { background: transparent; }")
+        widget.setStyleSheet(_STYLE["transparent_page"])
         
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)  # 10px between sections
+        layout = TightVBox(widget, spacing=10)  # 10px between sections
+        # Отложенная сборка: без промежуточных relayout/repaint на каждый addWidget
+        widget.setUpdatesEnabled(False)
+        layout.setEnabled(False)
         
         # === SECTION: CRT Monitor ===
         crt_section, crt_layout = self._create_new_section("crt monitor")
         
-        # Row: checkbox "crt monitor effect" right
-        crt_effect_row = QHBoxLayout()
-        crt_effect_row.setContentsMargins(0, 0, 0, 0)
-        
+        # Одна сетка на секцию: подпись | растяжка | контрол (checkbox справа, слайдеры на всю ширину)
+        crt_grid = self._section_grid(crt_layout, 24)
         crt_label = QLabel("crt monitor effect")
-        crt_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        crt_label.setObjectName(_OBJ_NAMES["row_label"])
         
         self.cb_crt_enabled = CustomCheckbox("")
         self.cb_crt_enabled.setChecked(self.postfx.crt_enabled)
         self.cb_crt_enabled.stateChanged.connect(self.on_crt_enabled_changed)
+        self._add_grid_row(crt_grid, crt_label, self.cb_crt_enabled)
         
-        crt_effect_row.addWidget(crt_label)
-        crt_effect_row.addStretch()
-        crt_effect_row.addWidget(self.cb_crt_enabled)
-        crt_layout.addLayout(crt_effect_row)
-        crt_layout.addSpacing(10)  # 10px between checkbox and sliders
-        
-        # Sliders CRT with 10px spacing between them
-        # Scanlines
-        scanlines_row = QHBoxLayout()
-        scanlines_row.setContentsMargins(0, 12, 0, 12)  # Vertical paddings for sliders
-        scanlines_label = QLabel("scanlines")
-        scanlines_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_crt_scanlines = CustomSlider(0.0, 1.0, self.postfx.crt_scanlines)
-        self.slider_crt_scanlines.valueChanged.connect(lambda v: (setattr(self.postfx, 'crt_scanlines', v), self.update_preview()))
-        scanlines_row.addWidget(scanlines_label)
-        scanlines_row.addSpacing(20)
-        scanlines_row.addWidget(self.slider_crt_scanlines, 1)
-        crt_layout.addLayout(scanlines_row)
-        
-        # Vignette
-        vignette_row = QHBoxLayout()
-        vignette_row.setContentsMargins(0, 12, 0, 12)
-        vignette_label = QLabel("vignette")
-        vignette_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_crt_vignette = CustomSlider(0.0, 1.0, self.postfx.crt_vignette)
-        self.slider_crt_vignette.valueChanged.connect(lambda v: (setattr(self.postfx, 'crt_vignette', v), self.update_preview()))
-        vignette_row.addWidget(vignette_label)
-        vignette_row.addSpacing(20)
-        vignette_row.addWidget(self.slider_crt_vignette, 1)
-        crt_layout.addLayout(vignette_row)
-        
-        # RGB shift
-        rgb_row = QHBoxLayout()
-        rgb_row.setContentsMargins(0, 12, 0, 12)
-        rgb_label = QLabel("RGB shift")
-        rgb_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_crt_rgb_shift = CustomSlider(0.0, 1.0, self.postfx.crt_rgb_shift)
-        self.slider_crt_rgb_shift.valueChanged.connect(lambda v: (setattr(self.postfx, 'crt_rgb_shift', v), self.update_preview()))
-        rgb_row.addWidget(rgb_label)
-        rgb_row.addSpacing(20)
-        rgb_row.addWidget(self.slider_crt_rgb_shift, 1)
-        crt_layout.addLayout(rgb_row)
-        
-        # Shake
-        shake_row = QHBoxLayout()
-        shake_row.setContentsMargins(0, 12, 0, 12)
-        shake_label = QLabel("shake")
-        shake_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_crt_shake = CustomSlider(0.0, 3.0, self.postfx.crt_shake)
-        self.slider_crt_shake.valueChanged.connect(lambda v: setattr(self.postfx, 'crt_shake', v))
-        shake_row.addWidget(shake_label)
-        shake_row.addSpacing(20)
-        shake_row.addWidget(self.slider_crt_shake, 1)
-        crt_layout.addLayout(shake_row)
+        # Sliders CRT: (label, attr, min, max, cast, live preview)
+        for label, attr, lo, hi, cast, live in (
+            ("scanlines", "crt_scanlines", 0.0, 1.0, float, True),
+            ("vignette", "crt_vignette", 0.0, 1.0, float, True),
+            ("RGB shift", "crt_rgb_shift", 0.0, 1.0, float, True),
+            ("shake", "crt_shake", 0.0, 3.0, float, False),
+        ):
+            self._add_slider_row(crt_grid, label, attr, lo, hi, cast, live)
         
         layout.addWidget(crt_section)
         
         # === SECTION: Glow ===
         glow_section, glow_layout = self._create_new_section("glow")
         
-        # Row: checkbox "glow effect" right
-        glow_effect_row = QHBoxLayout()
-        glow_effect_row.setContentsMargins(0, 0, 0, 0)
-        
+        glow_grid = self._section_grid(glow_layout, 24)
         glow_label = QLabel("glow effect")
-        glow_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        glow_label.setObjectName(_OBJ_NAMES["row_label"])
         
         self.cb_glow_enabled = CustomCheckbox("")
         self.cb_glow_enabled.setChecked(self.postfx.glow_enabled)
         self.cb_glow_enabled.stateChanged.connect(self.on_glow_enabled_changed)
+        self._add_grid_row(glow_grid, glow_label, self.cb_glow_enabled)
         
-        glow_effect_row.addWidget(glow_label)
-        glow_effect_row.addStretch()
-        glow_effect_row.addWidget(self.cb_glow_enabled)
-        glow_layout.addLayout(glow_effect_row)
-        glow_layout.addSpacing(10)  # 10px between checkbox and sliders
-        
-        # Intensity
-        intensity_row = QHBoxLayout()
-        intensity_row.setContentsMargins(0, 12, 0, 12)
-        intensity_label = QLabel("intensity")
-        intensity_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_glow_intensity = CustomSlider(0.0, 2.0, self.postfx.glow_intensity)
-        self.slider_glow_intensity.valueChanged.connect(lambda v: (setattr(self.postfx, 'glow_intensity', v), self.update_preview()))
-        intensity_row.addWidget(intensity_label)
-        intensity_row.addSpacing(20)
-        intensity_row.addWidget(self.slider_glow_intensity, 1)
-        glow_layout.addLayout(intensity_row)
-        
-        # Radius
-        radius_row = QHBoxLayout()
-        radius_row.setContentsMargins(0, 12, 0, 12)
-        radius_label = QLabel("radius")
-        radius_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_glow_radius = CustomSlider(5.0, 50.0, float(self.postfx.glow_radius))
-        self.slider_glow_radius.valueChanged.connect(lambda v: (setattr(self.postfx, 'glow_radius', int(v)), self.update_preview()))
-        radius_row.addWidget(radius_label)
-        radius_row.addSpacing(20)
-        radius_row.addWidget(self.slider_glow_radius, 1)
-        glow_layout.addLayout(radius_row)
-        
-        # Bloom
-        bloom_row = QHBoxLayout()
-        bloom_row.setContentsMargins(0, 12, 0, 12)
-        bloom_label = QLabel("bloom")
-        bloom_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        self.slider_glow_bloom = CustomSlider(0.0, 1.0, self.postfx.glow_bloom)
-        self.slider_glow_bloom.valueChanged.connect(lambda v: (setattr(self.postfx, 'glow_bloom', v), self.update_preview()))
-        bloom_row.addWidget(bloom_label)
-        bloom_row.addSpacing(20)
-        bloom_row.addWidget(self.slider_glow_bloom, 1)
-        glow_layout.addLayout(bloom_row)
+        # Sliders Glow
+        for label, attr, lo, hi, cast, live in (
+            ("intensity", "glow_intensity", 0.0, 2.0, float, True),
+            ("radius", "glow_radius", 5.0, 50.0, int, False),  # blur дорогой: preview по отпусканию
+            ("bloom", "glow_bloom", 0.0, 1.0, float, True),
+        ):
+            self._add_slider_row(glow_grid, label, attr, lo, hi, cast, live)
+        self.slider_glow_radius.sliderReleased.connect(partial(self._mark_dirty, 'postfx'))
         
         layout.addWidget(glow_section)
         
@@ -4295,11 +4626,10 @@ class MainWindow(QWidget):
         quality_layout.setSpacing(0)  # We manually control spacing
         
         # Radio button "accurate"
-        accurate_row = QHBoxLayout()
-        accurate_row.setContentsMargins(0, 0, 0, 0)
+        accurate_row = TightHBox()
         
         accurate_label = QLabel("accurate")
-        accurate_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        accurate_label.setObjectName(_OBJ_NAMES["row_label"])
         
         self.cb_accurate_preview = CustomCheckbox("")
         self.cb_accurate_preview.setChecked(self.postfx.accurate_preview)
@@ -4312,21 +4642,20 @@ class MainWindow(QWidget):
         
         # Description for accurate (small text)
         accurate_desc = QLabel("frame rate when accurate is selected can drop to 2-3 fps,\nif a large number of characters is used")
-        accurate_desc.setStyleSheet("color: white; font-size: 12px; background: transparent; margin-top: 4px;")
+        accurate_desc.setObjectName(_OBJ_NAMES["hint"])
         accurate_desc.setWordWrap(True)
         quality_layout.addWidget(accurate_desc)
         quality_layout.addSpacing(10)  # 10px between elements
         
         # Radio button "fast"
-        fast_row = QHBoxLayout()
-        fast_row.setContentsMargins(0, 0, 0, 0)
+        fast_row = TightHBox()
         
         fast_label = QLabel("fast")
-        fast_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        fast_label.setObjectName(_OBJ_NAMES["row_label"])
         
         self.cb_gpu_preview = CustomCheckbox("")
         self.cb_gpu_preview.setChecked(self.postfx.use_gpu_preview)
-        self.cb_gpu_preview.stateChanged.connect(lambda s: (setattr(self.postfx, 'use_gpu_preview', bool(s)), self.update_preview()))
+        self.cb_gpu_preview.stateChanged.connect(self._on_gpu_preview_toggled)
         
         fast_row.addWidget(fast_label)
         fast_row.addStretch()
@@ -4335,134 +4664,126 @@ class MainWindow(QWidget):
         
         # Description for fast (small text)
         fast_desc = QLabel("this is currently a useless feature")
-        fast_desc.setStyleSheet("color: white; font-size: 12px; background: transparent; margin-top: 4px;")
+        fast_desc.setObjectName(_OBJ_NAMES["hint"])
         fast_desc.setWordWrap(True)
         quality_layout.addWidget(fast_desc)
         
         layout.addWidget(quality_section)
         
         layout.addStretch()
+        layout.setEnabled(True)
+        widget.setUpdatesEnabled(True)
         return widget
         
+    def _section_grid(self, parent_layout, v_spacing):
+        # Сетка секции: 0 = подпись, 1 = растяжка, 2 = контрол
+        grid = QGridLayout()
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setHorizontalSpacing(20)
+        grid.setVerticalSpacing(v_spacing)
+        grid.setColumnStretch(1, 1)
+        parent_layout.addLayout(grid)
+        return grid
+
+    def _add_grid_row(self, grid, label, control, span=False):
+        # Добавляет строку в сетку секции; span=True растягивает контрол на колонки 1-2
+        row = grid.rowCount() if grid.count() else 0  # у пустой сетки rowCount() == 1
+        grid.addWidget(label, row, 0)
+        if span:
+            grid.addWidget(control, row, 1, 1, 2)
+        else:
+            grid.addWidget(control, row, 2, Qt.AlignRight)
+
+    def _add_slider_row(self, grid, label, attr, lo, hi, cast=float, live_preview=True):
+        # Строка PostFX: подпись + слайдер, привязанный к self.postfx.<attr>; слайдер доступен как self.slider_<attr>
+        row_label = QLabel(label)
+        row_label.setObjectName(_OBJ_NAMES["row_label"])
+        slider = CustomSlider(lo, hi, float(getattr(self.postfx, attr)))
+        slider.valueChanged.connect(self._make_setter('postfx', attr, cast, 'postfx' if live_preview else None))
+        self._add_grid_row(grid, row_label, slider, span=True)
+        setattr(self, f"slider_{attr}", slider)
+        return slider
+
+    def _set_swatch_color(self, swatch, hex_val):
+        # Красит свотч; QSS берётся из кэша, setStyleSheet пропускается, если цвет не изменился
+        hex_val = hex_val.upper()
+        if swatch.swatch_hex == hex_val:
+            return
+        qss = self._swatch_ss_cache.get(hex_val)
+        if qss is None:
+            qss = self._swatch_ss_cache[hex_val] = SWATCH_QSS_TEMPLATE.format(hex_val)
+        swatch.swatch_hex = hex_val
+        swatch.setStyleSheet(qss)
+
+    def _make_setter(self, owner, attr, cast=float, stage='ascii'):
+        # Общий setter слайдера: пишет cast(v) в self.<owner>.<attr> (owner=None -> сам self)
+        # и помечает стадию preview грязной (stage=None -> без live preview)
+        def setter(v):
+            setattr(getattr(self, owner) if owner else self, attr, cast(v))
+            if stage:
+                self._mark_dirty(stage)
+        return setter
+
     def _create_export_tab(self):
         # Tab: Export
         widget = QWidget()
-        widget.setStyleSheet("QWidget { background: transparent; }")
+        widget.setStyleSheet(_STYLE["transparent_page"])
         
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(10)  # 10px between sections
+        layout = TightVBox(widget, spacing=10)  # 10px between sections
+        # Отложенная сборка: без промежуточных relayout/repaint на каждый addWidget
+        widget.setUpdatesEnabled(False)
+        layout.setEnabled(False)
         
         # === ONE SECTION without header ===
         export_section, export_layout = self._create_new_section("")
         export_layout.setSpacing(0)  # We manually control spacing
         
-        # Format (combobox)
-        format_row = QHBoxLayout()
-        format_row.setContentsMargins(0, 0, 0, 0)
+        # format / duration / width / height: одна сетка вместо четырёх QHBoxLayout
+        export_grid = self._section_grid(export_layout, 10)
+
         format_label = QLabel("format")
-        format_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        
+        format_label.setObjectName(_OBJ_NAMES["row_label"])
         self.cb_export_format = QComboBox()
         self.cb_export_format.addItems(["gif", "mp4", "png"])
         self.cb_export_format.currentTextChanged.connect(self.on_export_format_changed)
         self.cb_export_format.setFixedHeight(44)
-        self.cb_export_format.setStyleSheet("""
-            QComboBox {
-                background: transparent;
-                color: white;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 20px;
-                padding: 10px 14px;
-                font-size: 16px;
-            }
-            QComboBox:hover {
-                border: 2px solid rgba(255,255,255,0.5);
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid white;
-                width: 0;
-                height: 0;
-            }
-        """)
-        
-        format_row.addWidget(format_label)
-        format_row.addStretch()
-        format_row.addWidget(self.cb_export_format, 0, Qt.AlignRight)
-        export_layout.addLayout(format_row)
-        export_layout.addSpacing(10)
+        self.cb_export_format.setStyleSheet(_STYLE["combobox"])
+        self._add_grid_row(export_grid, format_label, self.cb_export_format)
 
         # duration (sec) — replaces frames & fps
-        dur_row = QHBoxLayout()
-        dur_row.setContentsMargins(0, 0, 0, 0)
-        dur_row.setSpacing(12)
-
         dur_label = QLabel("duration (sec)")
-        dur_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
-        dur_row.addWidget(dur_label)
-        dur_row.addStretch()
-
+        dur_label.setObjectName(_OBJ_NAMES["row_label"])
         self.stepper_duration = NewStepperWidget(int(getattr(self, "export_duration_seconds", 6)), 1, 99999, self, "duration (sec)")
         self.stepper_duration.valueChanged.connect(self.on_export_duration_changed)
         self.stepper_duration.setFixedWidth(160)
-        dur_row.addWidget(self.stepper_duration)
+        self._add_grid_row(export_grid, dur_label, self.stepper_duration)
 
-        export_layout.addLayout(dur_row)
-        export_layout.addSpacing(10)  # 10px between elements
-        # Width (number + pill)
-        width_row = QHBoxLayout()
-        width_row.setContentsMargins(0, 0, 0, 0)
+        # Width / Height (number + pill)
         width_label = QLabel("width")
-        width_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        width_label.setObjectName(_OBJ_NAMES["row_label"])
         self.stepper_width = NewStepperWidget(512, 100, 10000, self, "width")
         self.stepper_width.setFixedWidth(160)
-        width_row.addWidget(width_label)
-        width_row.addStretch()
-        width_row.addWidget(self.stepper_width)
-        export_layout.addLayout(width_row)
-        export_layout.addSpacing(10)
-        
-        # Height (number + pill)
-        height_row = QHBoxLayout()
-        height_row.setContentsMargins(0, 0, 0, 0)
+        self._add_grid_row(export_grid, width_label, self.stepper_width)
+
         height_label = QLabel("height")
-        height_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        height_label.setObjectName(_OBJ_NAMES["row_label"])
         self.stepper_height = NewStepperWidget(512, 100, 10000, self, "height")
         self.stepper_height.setFixedWidth(160)
-        height_row.addWidget(height_label)
-        height_row.addStretch()
-        height_row.addWidget(self.stepper_height)
-        export_layout.addLayout(height_row)
+        self._add_grid_row(export_grid, height_label, self.stepper_height)
         export_layout.addSpacing(10)
         
         # Animation speed (percentage + slider)
         speed_row = QHBoxLayout()
         speed_row.setContentsMargins(0, 12, 0, 12)  # Vertical paddings similar to sliders
         speed_label = QLabel("animation speed")
-        speed_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        speed_label.setObjectName(_OBJ_NAMES["row_label"])
         
         # Bold text to the left of the slider
         self.export_speed_display = QLabel("100%")
-        self.export_speed_display.setStyleSheet("""
-            color: white;
-            font-size: 26px;
-            font-weight: bold;
-            background: transparent;
-            padding-right: 20px;
-        """)
+        self.export_speed_display.setObjectName(_OBJ_NAMES["value_display"])
         
         self.slider_export_speed = CustomSlider(10.0, 1000.0, float(self.animation_speed_percent))
-        self.slider_export_speed.valueChanged.connect(lambda v: (
-            self.export_speed_display.setText(f"{int(v)}%"),
-            setattr(self, 'animation_speed_percent', int(v))
-        ))
+        self.slider_export_speed.valueChanged.connect(self._on_export_speed_changed)
         
         speed_row.addWidget(speed_label)
         speed_row.addStretch()
@@ -4472,10 +4793,9 @@ class MainWindow(QWidget):
         export_layout.addSpacing(10)
         
         # Loop (checkbox to the right)
-        loop_row = QHBoxLayout()
-        loop_row.setContentsMargins(0, 0, 0, 0)
+        loop_row = TightHBox()
         loop_label = QLabel("loop")
-        loop_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        loop_label.setObjectName(_OBJ_NAMES["row_label"])
         
         self.cb_loop = CustomCheckbox("")
         self.cb_loop.setChecked(True)
@@ -4489,20 +4809,13 @@ class MainWindow(QWidget):
         export_layout.addSpacing(10)
 
         # Background (for PNG export) — segmented toggle: transparent / colored
-        bg_row = QHBoxLayout()
-        bg_row.setContentsMargins(0, 0, 0, 0)
+        bg_row = TightHBox()
         bg_label = QLabel("background (for png export)")
-        bg_label.setStyleSheet("color: white; font-size: 16px; background: transparent;")
+        bg_label.setObjectName(_OBJ_NAMES["row_label"])
 
         bg_toggle = QWidget()
         bg_toggle.setFixedSize(240, 44)
-        bg_toggle.setStyleSheet("""
-            QWidget {
-                background: transparent;
-                border: 2px solid rgba(255,255,255,0.3);
-                border-radius: 22px;
-            }
-        """)
+        bg_toggle.setStyleSheet(PILL_BUTTON_QSS)
         bg_toggle_l = QHBoxLayout(bg_toggle)
         bg_toggle_l.setContentsMargins(2, 2, 2, 2)
         bg_toggle_l.setSpacing(0)
@@ -4513,26 +4826,10 @@ class MainWindow(QWidget):
             b.setCheckable(True)
             b.setFixedHeight(40)
             b.setCursor(Qt.PointingHandCursor)
-            b.setStyleSheet("""
-                QPushButton {
-                    background: transparent;
-                    color: rgba(255,255,255,0.7);
-                    border: none;
-                    font-size: 20px;
-                    padding: 0 18px;
-                }
-                QPushButton:hover {
-                    background: rgba(255,255,255,0.06);
-                }
-                QPushButton:checked {
-                    background: rgba(255,255,255,1);
-                    color: rgba(0,0,0,1);
-                }
-            """)
 
         # Rounded corners for selected segments
-        self.btn_bg_transparent.setStyleSheet(self.btn_bg_transparent.styleSheet() + "\nQPushButton:checked { border-top-left-radius: 20px; border-bottom-left-radius: 20px; }")
-        self.btn_bg_colored.setStyleSheet(self.btn_bg_colored.styleSheet() + "\nQPushButton:checked { border-top-right-radius: 20px; border-bottom-right-radius: 20px; }")
+        self.btn_bg_transparent.setStyleSheet(_STYLE["segment_btn_left"])
+        self.btn_bg_colored.setStyleSheet(_STYLE["segment_btn_right"])
 
         self._png_bg_mode = "colored"  # default
         self.btn_bg_colored.setChecked(True)
@@ -4543,10 +4840,8 @@ class MainWindow(QWidget):
         self._bg_group.addButton(self.btn_bg_transparent)
         self._bg_group.addButton(self.btn_bg_colored)
 
-        def _set_bg_mode():
-            self._png_bg_mode = "transparent" if self.btn_bg_transparent.isChecked() else "colored"
-        self.btn_bg_transparent.toggled.connect(lambda _: _set_bg_mode())
-        self.btn_bg_colored.toggled.connect(lambda _: _set_bg_mode())
+        self.btn_bg_transparent.toggled.connect(self._on_png_bg_mode_toggled)
+        self.btn_bg_colored.toggled.connect(self._on_png_bg_mode_toggled)
 
         bg_toggle_l.addWidget(self.btn_bg_transparent)
         bg_toggle_l.addWidget(self.btn_bg_colored)
@@ -4559,6 +4854,8 @@ class MainWindow(QWidget):
         layout.addWidget(export_section)
         
         layout.addStretch()
+        layout.setEnabled(True)
+        widget.setUpdatesEnabled(True)
         return widget
         
     def on_export_format_changed(self, fmt):
@@ -4577,12 +4874,7 @@ class MainWindow(QWidget):
     def _create_new_section(self, title):
         # Создает секцию в стиле редизайна: черный фон, серый заголовок
         container = QWidget()
-        container.setStyleSheet("""
-            QWidget {
-                background: rgba(0,0,0,1);
-                border-radius: 30px;
-            }
-        """)
+        container.setStyleSheet(_STYLE["section"])
         
         layout = QVBoxLayout(container)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -4590,271 +4882,56 @@ class MainWindow(QWidget):
         
         # Заголовок серым цветом (только если заголовок не пустой)
         if title:
-            title_container = QHBoxLayout()
-            title_container.setContentsMargins(0, 0, 0, 0)
+            title_container = TightHBox()
             
             title_label = QLabel(title)
-            title_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(66,66,66,1);
-                    font-size: 16px;
-                    font-weight: regular;
-                    background: transparent;
-                }
-            """)
+            title_label.setStyleSheet(_STYLE["section_title"])
             title_container.addWidget(title_label)
-            title_container.addStretch()
-            
-            layout.addLayout(title_container)
-            layout.addSpacing(20)  # 20px between title and content
-        
-        return container, layout
-        
-    def _create_section(self, title):
-        # Создает секцию с заголовком и черным фоном (старая версия)
-        group = QGroupBox()
-        layout = QVBoxLayout(group)
-        layout.setContentsMargins(20, 30, 20, 30)
-        layout.setSpacing(10)
-        
-        # Заголовок
-        title_label = QLabel(title)
-        title_label.setObjectName("SectionTitle")
-        layout.addWidget(title_label)
-        
-        return group
-        
-    def _create_slider_row(self, label_text, minimum, maximum, value):
-        # Создает строку: label + слайдер
-        row = QHBoxLayout()
-        row.setSpacing(53)
-        
-        label = QLabel(label_text)
-        slider = CustomSlider(minimum, maximum, value)
-        
-        row.addWidget(label)
-        row.addWidget(slider)
-        row.addStretch()
-        
-        return (row, slider)
-        
-    def _apply_figma_style(self):
-        # Применяет стили из Figma дизайна
-        t = self.ui_theme
-        css = """
-            * {
-                font-family: 'Helvetica Neue', 'Segoe UI', 'Helvetica', 'Arial', sans-serif;
-                font-weight: 400;
-            }
-            
-            QWidget {
-                background: __UI_BG__;
-                color: __UI_TEXT__;
-            }
-            
-            /* Табы */
-            QTabWidget::pane {
-                border: none;
-                background: #000000;
-                border-radius: 30px;
-                padding: 0px;
-                margin-top: 0px;
-            }
-            
-            QTabBar {
-                background: transparent;
-            }
-            
-            QTabBar::tab {
-                background: #000000;
-                color: __UI_TEXT__;
-                padding: 13px 22px;
-                border-top-left-radius: 20px;
-                border-top-right-radius: 20px;
-                font-size: 20px;
-                font-weight: 500;
-                margin-right: 0px;
-                min-width: 80px;
-            }
-            
-            QTabBar::tab:selected {
-                background: #000000;
-                color: __UI_TEXT__;
-            }
-            
-            QTabBar::tab:!selected {
-                background: #000000;
-                color: rgba(255,255,255,0.4);
-            }
-            
-            QTabBar::tab:hover:!selected {
-                color: rgba(255,255,255,0.6);
-            }
-            
-            /* Секции */
-            QGroupBox {
-                background: #000000;
-                border: none;
-                border-radius: 20px;
-                padding: 20px;
-                margin-top: 10px;
-            }
-            
-            QGroupBox QLabel#SectionTitle {
-                font-size: 16px;
-                font-weight: 300;
-                color: __UI_TEXT__;
-                background: transparent;
-            }
-            
-            /* Лейблы */
-            QLabel {
-                font-size: 16px;
-                color: __UI_TEXT__;
-                background: transparent;
-            }
-            
-            /* Числа в степперах */
-            NumberDisplay {
-                background: #000000;
-                border: 2px solid __BTN_BORDER__;
-                border-radius: 10px;
-                font-size: 26px;
-                font-weight: bold;
-                color: __UI_TEXT__;
-            }
-            
-            NumberDisplay:hover {
-                background: #1A1A1A;
-                cursor: text;
-            }
-            
-            /* Кнопки -/+ */
-            RoundButton {
-                background: #000000;
-                border: 1px solid __BTN_BORDER__;
-                border-radius: 20px;
-                color: __UI_TEXT__;
-                font-size: 20px;
-            }
-            
-            RoundButton:hover {
-                background: #1A1A1A;
-            }
-            
-            /* Комбобокс */
-            QComboBox {
-                background: #000000;
-                border: 2px solid __BTN_BORDER__;
-                border-radius: 20px;
-                padding: 12px 14px;
-                font-size: 16px;
-                color: __UI_TEXT__;
-            }
-            
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid __UI_TEXT__;
-                margin-right: 10px;
-            }
-            
-            /* Чекбоксы */
-            QCheckBox {
-                spacing: 8px;
-                font-size: 16px;
-                color: __UI_TEXT__;
-            }
-            
-            QCheckBox::indicator {
-                width: 23px;
-                height: 23px;
-                background: transparent;
-                border: 2px solid __BTN_BORDER__;
-                border-radius: 8px;
-            }
-            
-            QCheckBox::indicator:checked {
-                background: __BTN_BG__;
-            }
-            
-            /* Кнопки (основные) */
-            QPushButton {
-                background: __BTN_BG__;
-                color: __BTN_TEXT__;
-                border: none;
-                border-radius: 20px;
-                font-size: 16px;
-                font-weight: 400;
-                padding: 12px;
-            }
-            
-            QPushButton:hover {
-                background: #EEEEEE;
-            }
-            
-            /* Черные кнопки с обводкой */
-            QPushButton#BlackButton {
-                background: #000000;
-                color: __UI_TEXT__;
-                border: 2px solid __BTN_BORDER__;
-            }
-            
-            QPushButton#BlackButton:hover {
-                background: #1A1A1A;
-            }
-            
-            /* Черные кнопки БЕЗ обводки */
-            QPushButton#BlackButtonNoBorder {
-                background: #000000;
-                color: __UI_TEXT__;
-                border: none;
-            }
-            
-            QPushButton#BlackButtonNoBorder:hover {
-                background: #1A1A1A;
-            }
-            
-            /* Круглые черные кнопки */
-            QPushButton#RoundBlackButton {
-                background: #000000;
-                color: __UI_TEXT__;
-                border: none;
-                border-radius: 27px;
-                font-size: 20px;
-            }
-            
-            QPushButton#RoundBlackButton:hover {
-                background: #1A1A1A;
-            }
+            title_container.addStretch()
             
-            /* Preview */
-            QScrollArea {
-                background: #000000;
-                border: none;
-                border-radius: 30px;
-            }
-        """
-        css = (css
-            .replace('__UI_BG__', t['ui_bg'])
-            .replace('__UI_TEXT__', t['ui_text'])
-            .replace('__BTN_BG__', t['button_bg'])
-            .replace('__BTN_TEXT__', t['button_text'])
-            .replace('__BTN_BORDER__', t['button_border'])
-        )
-        self.setStyleSheet(css)
+            layout.addLayout(title_container)
+            layout.addSpacing(20)  # 20px between title and content
+        
+        return container, layout
+        
+    def _create_section(self, title):
+        # Создает секцию с заголовком и черным фоном (старая версия)
+        group = QGroupBox()
+        layout = QVBoxLayout(group)
+        layout.setContentsMargins(20, 30, 20, 30)
+        layout.setSpacing(10)
+        
+        # Заголовок
+        title_label = QLabel(title)
+        title_label.setObjectName(_OBJ_NAMES["section_title"])
+        layout.addWidget(title_label)
+        
+        return group
+        
+    def _create_slider_row(self, label_text, minimum, maximum, value):
+        # Создает строку: label + слайдер
+        row = QHBoxLayout()
+        row.setSpacing(53)
+        
+        label = QLabel(label_text)
+        slider = CustomSlider(minimum, maximum, value)
+        
+        row.addWidget(label)
+        row.addWidget(slider)
+        row.addStretch()
+        
+        return (row, slider)
+        
+    def _apply_figma_style(self):
+        # Применяет стили из Figma дизайна
+        # Общий QSS живёт на QApplication (ставится в main); здесь только смена темы
+        _install_global_qss(QApplication.instance(), self.ui_theme)
         
         # Apply ObjectName to black buttons
-        self.btn_generate.setObjectName("BlackButtonNoBorder")
-        self.btn_play_pause.setObjectName("RoundBlackButton")
-        self.btn_settings.setObjectName("BlackButtonNoBorder")
-        self.btn_second.setObjectName("BlackButtonNoBorder")
+        self.btn_generate.setObjectName(_OBJ_NAMES["black_nb"])
+        self.btn_play_pause.setObjectName(_OBJ_NAMES["round_black"])
+        self.btn_settings.setObjectName(_OBJ_NAMES["black_nb"])
+        self.btn_second.setObjectName(_OBJ_NAMES["black_nb"])
 
     def get_ui_theme(self):
         # Возвращает текущую тему UI
@@ -4864,7 +4941,20 @@ class MainWindow(QWidget):
         # Применяет новую тему UI и обновляет стили
         if not isinstance(theme_dict, dict):
             return
-        self.ui_theme.update({k: v for k, v in theme_dict.items() if k in self.ui_theme})
+        # Только реально изменившиеся ключи; без изменений - не трогаем QSS и не перерисовываем
+        changed = {k: v for k, v in theme_dict.items() if k in self.ui_theme and self.ui_theme[k] != v}
+        if not changed:
+            return
+        self.ui_theme.update(changed)
+        self._theme_version += 1
+        self._theme_dirty = True
+        self._theme_timer.start()
+
+    def _flush_theme(self):
+        # Применяет тему, если она помечена грязной
+        if not self._theme_dirty:
+            return
+        self._theme_dirty = False
         self._apply_figma_style()
         self.update()
     
@@ -4872,46 +4962,53 @@ class MainWindow(QWidget):
         # Синхронизирует начальные значения color_stops с UI элементами
         # Синхронизируем 5 цветов символов
         for i in range(5):
-            if i < len(self.color_inputs) and i < len(self.color_swatches):
+            if self.color_inputs[i] is not None and self.color_swatches[i] is not None:
                 color = self.color_stops[i]
                 hex_val = f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
                 self.color_inputs[i].setText(hex_val)
-                self.color_swatches[i].setStyleSheet(f"background: {hex_val}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+                self._set_swatch_color(self.color_swatches[i], hex_val)
         
         # Синхронизируем цвет фона
         if self.bg_hex_input and self.bg_swatch:
             bg_hex = f"#{self.render_bg[0]:02X}{self.render_bg[1]:02X}{self.render_bg[2]:02X}"
             self.bg_hex_input.setText(bg_hex)
-            self.bg_swatch.setStyleSheet(f"background: {bg_hex}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+            self._set_swatch_color(self.bg_swatch, bg_hex)
         
     # ==================== HANDLERS ====================
     
     def on_cols_changed(self, v):
-        self.grid_cols = v
-        self.rebuild_base_grid()
+        self._pending_grid['grid_cols'] = v
+        self._grid_rebuild_timer.start()
         
     def on_rows_changed(self, v):
-        self.grid_rows = v
-        self.rebuild_base_grid()
+        self._pending_grid['grid_rows'] = v
+        self._grid_rebuild_timer.start()
         
     def on_font_changed(self, name):
-        self.font_name = name
-        self.font_pil = self._load_font(self.font_name, self.anim_font_px)
-        self._recalc_cell_size()
-        self.glyph_cache.clear()  # Очищаем кэш при смене шрифта
-        self.rebuild_base_grid()
+        self._pending_grid['font_name'] = name
+        self._grid_rebuild_timer.start()
         
     def on_anim_font_px_changed(self, px):
-        self.anim_font_px = int(px)
-        self.font_pil = self._load_font(self.font_name, self.anim_font_px)
-        self._recalc_cell_size()
-        self.glyph_cache.clear()  # Очищаем кэш при смене размера
+        self._pending_grid['anim_font_px'] = int(px)
+        self._grid_rebuild_timer.start()
+
+    def _apply_pending_grid(self):
+        # Срабатывание debounce: применяем накопленные значения и перестраиваем сетку один раз
+        pending, self._pending_grid = self._pending_grid, {}
+        if not pending:
+            return
+        for attr, value in pending.items():
+            setattr(self, attr, value)
+        if 'font_name' in pending or 'anim_font_px' in pending:
+            self.font_pil = self._load_font(self.font_name, self.anim_font_px)
+            self._recalc_cell_size()
+            self.glyph_cache.clear()  # Очищаем кэш при смене шрифта или размера
         self.rebuild_base_grid()
     
     def _change_morph_speed(self, delta):
         # Изменяет скорость морфинга
         self.morph_speed = max(0, min(100, self.morph_speed + delta))
-        self.morph_speed_display.setText(f"{self.morph_speed}%")
+        self.morph_speed_display.setText(_pct_text(self.morph_speed))
     
     def _change_audio_sensitivity(self, delta):
         # Изменяет чувствительность аудио (в процентах от 0 до 200%)
@@ -4919,70 +5016,80 @@ class MainWindow(QWidget):
         current_percent = int((self.audio_gain / 20.0) * 200)
         new_percent = max(1, min(200, current_percent + delta))
         self.audio_gain = (new_percent / 200.0) * 20.0
-        self.audio_sensitivity_display.setText(f"{new_percent}%")
+        if self.audio_sensitivity_display is not None:
+            self.audio_sensitivity_display.setText(_pct_text(new_percent))
+        if self.ar_sensitivity_display is not None:
+            self.ar_sensitivity_display.setText(_pct_text(new_percent))
     
     def _on_ar_band_gain_changed(self, band_idx, value):
         # Handle per-band gain changes for audioreactive_alt
-        if not hasattr(self, '_ar_band_gains'):
-            self._ar_band_gains = np.ones(6, dtype=np.float32)
         self._ar_band_gains[band_idx] = float(value)
     
     def _on_ar_alt_preset_changed(self, preset_name):
         # Apply preset parameters for audioreactive_alt
         self._apply_ar_alt_preset(preset_name)
     
+    # Веса полос для уровней эффектов audioreactive_alt (строка = эффект, столбец = полоса 0..5):
+    # outline, rays, bands (breath), echo, sparkles, background
+    _EFFECT_WEIGHTS = np.array([
+        [0.0, 0.6, 0.4, 0.0, 0.0, 0.0],
+        [0.4, 0.4, 0.0, 0.0, 0.2, 0.0],
+        [0.3, 0.7, 0.0, 0.0, 0.0, 0.0],
+        [0.0, 0.0, 0.3, 0.7, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 0.5, 0.5],
+        [0.6, 0.4, 0.0, 0.0, 0.0, 0.0],
+    ], dtype=np.float32)
+
+    # Пресеты audioreactive_alt: имя слайдера -> значение
+    AR_ALT_PRESETS = {
+        # Chill: slow, smooth, low intensity
+        "Chill": {
+            'rays_count': 8, 'rays_length': 60, 'rays_spread': 30,
+            'bands_step': 12, 'bands_thickness': 2, 'bands_speed': 0.5,
+            'outline_width': 1, 'outline_intensity': 0.4,
+            'sparkles_density': 0.3, 'sparkles_speed': 0.5,
+        },
+        # Rhythmic: balanced, responsive
+        "Rhythmic": {
+            'rays_count': 12, 'rays_length': 80, 'rays_spread': 45,
+            'bands_step': 8, 'bands_thickness': 3, 'bands_speed': 1.0,
+            'outline_width': 2, 'outline_intensity': 0.6,
+            'sparkles_density': 0.6, 'sparkles_speed': 1.0,
+        },
+        # Impact: intense, fast, high energy
+        "Impact": {
+            'rays_count': 20, 'rays_length': 120, 'rays_spread': 60,
+            'bands_step': 6, 'bands_thickness': 4, 'bands_speed': 1.5,
+            'outline_width': 3, 'outline_intensity': 0.8,
+            'sparkles_density': 1.0, 'sparkles_speed': 1.5,
+        },
+    }
+
     def _apply_ar_alt_preset(self, preset_name):
         # Apply preset-specific parameters
-        if preset_name == "Chill":
-            # Chill: slow, smooth, low intensity
-            if hasattr(self, 'rays_count'): self.rays_count.setValue(8)
-            if hasattr(self, 'rays_length'): self.rays_length.setValue(60)
-            if hasattr(self, 'rays_spread'): self.rays_spread.setValue(30)
-            if hasattr(self, 'bands_step'): self.bands_step.setValue(12)
-            if hasattr(self, 'bands_thickness'): self.bands_thickness.setValue(2)
-            if hasattr(self, 'bands_speed'): self.bands_speed.setValue(0.5)
-            if hasattr(self, 'outline_width'): self.outline_width.setValue(1)
-            if hasattr(self, 'outline_intensity'): self.outline_intensity.setValue(0.4)
-            if hasattr(self, 'sparkles_density'): self.sparkles_density.setValue(0.3)
-            if hasattr(self, 'sparkles_speed'): self.sparkles_speed.setValue(0.5)
-        elif preset_name == "Rhythmic":
-            # Rhythmic: balanced, responsive
-            if hasattr(self, 'rays_count'): self.rays_count.setValue(12)
-            if hasattr(self, 'rays_length'): self.rays_length.setValue(80)
-            if hasattr(self, 'rays_spread'): self.rays_spread.setValue(45)
-            if hasattr(self, 'bands_step'): self.bands_step.setValue(8)
-            if hasattr(self, 'bands_thickness'): self.bands_thickness.setValue(3)
-            if hasattr(self, 'bands_speed'): self.bands_speed.setValue(1.0)
-            if hasattr(self, 'outline_width'): self.outline_width.setValue(2)
-            if hasattr(self, 'outline_intensity'): self.outline_intensity.setValue(0.6)
-            if hasattr(self, 'sparkles_density'): self.sparkles_density.setValue(0.6)
-            if hasattr(self, 'sparkles_speed'): self.sparkles_speed.setValue(1.0)
-        elif preset_name == "Impact":
-            # Impact: intense, fast, high energy
-            if hasattr(self, 'rays_count'): self.rays_count.setValue(20)
-            if hasattr(self, 'rays_length'): self.rays_length.setValue(120)
-            if hasattr(self, 'rays_spread'): self.rays_spread.setValue(60)
-            if hasattr(self, 'bands_step'): self.bands_step.setValue(6)
-            if hasattr(self, 'bands_thickness'): self.bands_thickness.setValue(4)
-            if hasattr(self, 'bands_speed'): self.bands_speed.setValue(1.5)
-            if hasattr(self, 'outline_width'): self.outline_width.setValue(3)
-            if hasattr(self, 'outline_intensity'): self.outline_intensity.setValue(0.8)
-            if hasattr(self, 'sparkles_density'): self.sparkles_density.setValue(1.0)
-            if hasattr(self, 'sparkles_speed'): self.sparkles_speed.setValue(1.5)
+        params = self.AR_ALT_PRESETS.get(preset_name)
+        if not params:
+            return
+        for name, val in params.items():
+            w = getattr(self, name, None)
+            if w is not None:
+                # Без каскада valueChanged: одно обновление превью в конце
+                with QSignalBlocker(w):
+                    w.setValue(val)
+        self.update_preview(True)
     
     def _change_contour_intensity(self, delta):
         # Изменяет интенсивность контуров (в процентах от 0 до 100%)
         self.contour_intensity = max(0, min(100, self.contour_intensity + delta))
-        self.contour_intensity_display.setText(f"{self.contour_intensity}%")
+        self.contour_intensity_display.setText(_pct_text(self.contour_intensity))
         
     def on_animation_speed_slider_changed(self, percent):
         # Обработчик изменения скорости через слайдер
         self._set_animation_speed(int(percent))
         # Обновляем поле ввода
         if self.speed_input:
-            self.speed_input.blockSignals(True)
-            self.speed_input.setText(f"{self.animation_speed_percent}%")
-            self.speed_input.blockSignals(False)
+            with QSignalBlocker(self.speed_input):
+                self.speed_input.setText(_pct_text(self.animation_speed_percent))
     
     def on_animation_speed_input_changed(self):
         # Обработчик изменения скорости через поле ввода
@@ -4994,22 +5101,26 @@ class MainWindow(QWidget):
             self._set_animation_speed(speed_value)
             # Обновляем слайдер если значение в его диапазоне
             if 10 <= speed_value <= 300:
-                self.slider_speed.blockSignals(True)
-                self.slider_speed.setValue(float(speed_value))
-                self.slider_speed.blockSignals(False)
+                with QSignalBlocker(self.slider_speed):
+                    self.slider_speed.setValue(float(speed_value))
         except ValueError:
             # Если введено некорректное значение, восстанавливаем текущее
-            self.speed_input.setText(f"{self.animation_speed_percent}%")
+            self.speed_input.setText(_pct_text(self.animation_speed_percent))
     
+    def _on_export_speed_changed(self, value):
+        # Слайдер скорости во вкладке Export: одно int() на событие, текст и модель обновляются вместе
+        percent = int(value)
+        self.export_speed_display.setText(_pct_text(percent))
+        self._set_animation_speed(percent)
+
     def _set_animation_speed(self, percent):
         # Устанавливает скорость анимации в процентах
         self.animation_speed_percent = max(1, percent)
         # Синхронизируем с stepper FPS in export
         if self.stepper_fps:
             export_fps = int(self.base_fps * (self.animation_speed_percent / 100.0))
-            self.stepper_fps.blockSignals(True)
-            self.stepper_fps.setValue(export_fps)
-            self.stepper_fps.blockSignals(False)
+            with QSignalBlocker(self.stepper_fps):
+                self.stepper_fps.setValue(export_fps)
     
     def on_export_fps_changed(self, fps):
         # Обработчик изменения FPS из настроек экспорта (конвертируем в проценты)
@@ -5018,20 +5129,33 @@ class MainWindow(QWidget):
         self._set_animation_speed(percent)
         # Синхронизируем со слайдером в настройках холста
         if self.slider_speed and 10 <= percent <= 300:
-            self.slider_speed.blockSignals(True)
-            self.slider_speed.setValue(float(percent))
-            self.slider_speed.blockSignals(False)
+            with QSignalBlocker(self.slider_speed):
+                self.slider_speed.setValue(float(percent))
         # Синхронизируем с полем ввода
         if self.speed_input:
-            self.speed_input.blockSignals(True)
-            self.speed_input.setText(f"{self.animation_speed_percent}%")
-            self.speed_input.blockSignals(False)
+            with QSignalBlocker(self.speed_input):
+                self.speed_input.setText(_pct_text(self.animation_speed_percent))
         
     def on_ramp_changed(self, _):
-        self.use_extended = self.cb_extended.isChecked()
+        use_extended = self.cb_extended.isChecked()
+        if use_extended == self.use_extended:
+            return
+        self.use_extended = use_extended
         self.glyph_cache.clear()  # Очищаем кэш при смене набора символов
         self.update_preview(True)
         
+    def _on_gpu_preview_toggled(self, state):
+        # GPU preview влияет только на PostFX стадию
+        self.postfx.use_gpu_preview = bool(state)
+        self._mark_dirty('postfx')
+
+    def _on_gl_preview_toggled(self, state):
+        if self.gl_preview is not None:
+            self.gl_preview.setVisible(bool(state))
+
+    def _on_png_bg_mode_toggled(self, _checked):
+        self._png_bg_mode = "transparent" if self.btn_bg_transparent.isChecked() else "colored"
+
     def on_crt_enabled_changed(self, state):
         # Обработчик включения CRT эффекта
         self.postfx.crt_enabled = bool(state)
@@ -5068,21 +5192,24 @@ class MainWindow(QWidget):
         
     def on_custom_symbols_changed(self, text):
         # Обработчик изменения кастомных символов
-        self.custom_ramp = text.strip()
+        # Текст вернулся к прежнему (набрали и стёрли) - кэш глифов остаётся валидным
+        new = text.strip()
+        if new == self.custom_ramp:
+            return
+        self.custom_ramp = new
         
         # Если введены кастомные символы - отключаем чекбокс расширенного набора
+        # (приглушение даёт правило QCheckBox:disabled глобального QSS, без setStyleSheet на каждый символ)
         has_custom = len(self.custom_ramp) >= 2
         self.cb_extended.setEnabled(not has_custom)
         
-        # Визуальная индикация
-        if has_custom:
-            self.cb_extended.setStyleSheet("color: rgba(255,255,255,0.3);")
-        else:
-            self.cb_extended.setStyleSheet("")  # Возвращаем стандартный стиль
-        
         self.glyph_cache.clear()  # Очищаем кэш
         self.update_preview(True)
         
+    def _apply_pending_mode(self):
+        # Применяет режим, выбранный в комбобоксе, после паузы debounce
+        self.on_mode_changed(self.cb_mode.currentText())
+
     def on_mode_changed(self, m):
         # Обработчик смены режима
         # Конвертируем новые названия в старые для совместимости
@@ -5095,29 +5222,20 @@ class MainWindow(QWidget):
         }
         self.mode = mode_map.get(m, m)
         
-        # Показываем/скрываем нужный режим
-        self.morph_widget.setVisible(m == "morph")
-        self.audio_widget.setVisible(m == "audioreactive")
-        self.contourswim_widget.setVisible(m == "contourswim")
-        
-        # Переключаем секции настроек холста в зависимости от режима
-        if hasattr(self, 'waves_section') and hasattr(self, 'contour_section'):
-            if m == "contourswim":
-                self.waves_section.hide()
-                self.contour_section.show()
-            elif m == "audioreactive_alt":
-                self.waves_section.hide()
-                self.contour_section.hide()
-            else:
-                self.waves_section.show()
-                self.contour_section.hide()
-        
-        # Показываем/скрываем секции аудио
-        if hasattr(self, 'audio_reactive_section'):
-            self.audio_reactive_section.setVisible(m == "audioreactive")
-        if hasattr(self, 'ar_alt_section'):
-            # Hide audioreactive_alt panel while the mode is disabled in UI
-            self.ar_alt_section.setVisible(False)
+        # Все show/hide одним пакетом: Qt делает один layout/paint в конце
+        self.setUpdatesEnabled(False)
+        try:
+            # Строим секции нового режима при первом показе, остальные только скрываем
+            self._ensure_mode_widget(m)
+            for name, section in self._mode_sections.items():
+                section.setVisible(m in self._MODE_SECTIONS[name][2])
+            
+            # Секция волн холста скрыта для contourswim и audioreactive_alt
+            if hasattr(self, 'waves_section'):
+                self.waves_section.setVisible(m not in ("contourswim", "audioreactive_alt"))
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
         
         # Проверка sounddevice для audioreactive modes
         if (m == "audioreactive") and sd is None:
@@ -5148,6 +5266,7 @@ class MainWindow(QWidget):
         gray = to_grayscale(arr)
         grid, _, _ = resize_to_char_grid(gray, self.cell_w, self.cell_h, self.grid_cols, self.grid_rows)
         self.morph_target = grid
+        self._source_gen += 1
         QMessageBox.information(self, "готово", "второе изображение загружено")
         self.update_preview(True)
         
@@ -5155,36 +5274,7 @@ class MainWindow(QWidget):
         fn, _ = QFileDialog.getOpenFileName(self, "выберите изображение", "", "Images (*.png *.jpg *.jpeg *.webp *.bmp)")
         if not fn:
             return
-        pil = Image.open(fn).convert("RGB")
-        arr = np.array(pil, dtype=np.uint8)
-        self.img_color = arr
-        self.img_h, self.img_w = arr.shape[0], arr.shape[1]
-        try:
-            self._sync_export_resolution_to_image(self.img_w, self.img_h)
-        except Exception:
-            pass
-        self._recalc_cell_size()
-        gray = to_grayscale(arr)
-        grid, cols, rows = resize_to_char_grid(gray, self.cell_w, self.cell_h, None, None)
-        self.base_gray = grid
-        # Precompute and cache full-res edges/dist for audioreactive_alt overlays
-        try:
-            from asciinator.core.edges import get_edge_data
-            g_norm = gray.astype(np.float32) / 255.0
-            edges_full, dist_full = get_edge_data((self.img_h, self.img_w, 0), g_norm.tobytes())
-            self._cached_edges_full = edges_full
-            self._cached_dist_full = dist_full
-        except Exception:
-            self._cached_edges_full = None
-            self._cached_dist_full = None
-        self.grid_cols, self.grid_rows = cols, rows
-        self.stepper_cols.setValue(cols)
-        self.stepper_rows.setValue(rows)
-        if self.mode == "swarm":
-            pass
-        # При загрузке изображения автоматически запускаем анимацию
-        self._set_running(True)
-        self.update_preview(True)
+        self._start_image_load(fn)
         
     def on_generate_pattern(self):
         w, ok1 = QInputDialog.getInt(self, "ширина (px)", "ширина", 512, 64, 4096, 16)
@@ -5197,31 +5287,57 @@ class MainWindow(QWidget):
         if not ok3:
             return
         arr = generate_random_shapes(w, h, n=30, angularity=ang)
-        self.img_color = np.stack([arr*255]*3,axis=-1).astype(np.uint8)
-        self.img_h, self.img_w = h, w
+        self._start_image_load(arr)
+
+    def _start_image_load(self, source):
+        # Тяжёлая подготовка изображения идёт в ImageLoadWorker; UI остаётся отзывчивым
+        if self._image_loader is not None and self._image_loader.isRunning():
+            # Запоминаем только последний запрос; стартует после текущей загрузки
+            self._pending_image_source = source
+            return
         self._recalc_cell_size()
-        grid, cols, rows = resize_to_char_grid(arr, self.cell_w, self.cell_h, None, None)
-        self.base_gray = grid
-        # Precompute and cache edges/dist for generated pattern as well
-        try:
-            from asciinator.core.edges import get_edge_data
-            g_norm = arr.astype(np.float32)
-            if g_norm.max() > 1.0:
-                g_norm = g_norm / 255.0
-            edges_full, dist_full = get_edge_data((h, w, 0), g_norm.tobytes())
-            self._cached_edges_full = edges_full
-            self._cached_dist_full = dist_full
-        except Exception:
-            self._cached_edges_full = None
-            self._cached_dist_full = None
+        self.btn_import.setEnabled(False)
+        self.btn_generate.setEnabled(False)
+        worker = ImageLoadWorker(source, self.cell_w, self.cell_h)
+        worker.done.connect(self._apply_loaded_image)
+        worker.error.connect(self._on_image_load_error)
+        worker.finished.connect(self._on_image_load_finished)
+        self._image_loader = worker
+        worker.start()
+
+    def _apply_loaded_image(self, data):
+        # Результат ImageLoadWorker (GUI-поток): применяем к состоянию окна
+        arr = data["img_color"]
+        self.img_color = arr
+        self.img_h, self.img_w = arr.shape[0], arr.shape[1]
+        if data["from_file"]:
+            try:
+                self._sync_export_resolution_to_image(self.img_w, self.img_h)
+            except Exception:
+                pass
+        self.base_gray = data["base_gray"]
+        self._source_gen += 1
+        self._set_edge_cache(data["edges_full"], data["dist_full"])
+        cols, rows = data["cols"], data["rows"]
         self.grid_cols, self.grid_rows = cols, rows
         self.stepper_cols.setValue(cols)
         self.stepper_rows.setValue(rows)
-        if self.mode == "swarm":
-            pass
-        # Генерация паттерна тоже стартует анимацию
+        # При загрузке изображения (и генерации паттерна) автоматически запускаем анимацию
         self._set_running(True)
         self.update_preview(True)
+
+    def _on_image_load_error(self, msg):
+        QMessageBox.warning(self, "error", f"Failed to load image:\n{msg}")
+
+    def _on_image_load_finished(self):
+        # Ссылку на worker не сбрасываем: finished приходит до полного выхода потока
+        if self._pending_image_source is not None:
+            source, self._pending_image_source = self._pending_image_source, None
+            self._image_loader.wait()  # поток уже в finish(): ждём, чтобы isRunning() стал False
+            self._start_image_load(source)
+            return
+        self.btn_import.setEnabled(True)
+        self.btn_generate.setEnabled(True)
         
     def on_start_stop(self):
         # Традиционное поведение: клик меняет состояние
@@ -5238,18 +5354,24 @@ class MainWindow(QWidget):
         if sd is None or self.audio_stream is not None:
             return
             
+        # Коэффициенты сглаживания считаем один раз на запуск стрима (audio_smooth меняется только в коде)
+        alpha = 1.0 - self.audio_smooth
+        keep = 1.0 - alpha
+
         def audio_cb(indata, frames, time_info, status):
             if status:
                 pass
-            lvl = float(np.sqrt(np.mean(np.square(indata.astype(np.float32)))))
-            alpha = 1.0 - self.audio_smooth
-            self.audio_level = (1.0-alpha)*self.audio_level + alpha*min(1.0, lvl*5.0)
+            # Стрим уже float32: RMS одним dot без промежуточных массивов
+            x = indata[:, 0]
+            lvl = math.sqrt(float(np.dot(x, x)) / x.size)
+            self.audio_level = keep*self.audio_level + alpha*min(1.0, lvl*5.0)
         
         try:
             self.audio_stream = sd.InputStream(
                 channels=1,
                 samplerate=44100,
                 blocksize=2048,
+                dtype='float32',
                 callback=audio_cb
             )
             self.audio_stream.start()
@@ -5266,6 +5388,17 @@ class MainWindow(QWidget):
             except:
                 pass
             self.audio_stream = None
+        self._stop_bands_thread()
+    
+    def _stop_bands_thread(self):
+        # FFT-поток и его микрофон не крутятся вне аудио-режимов и на паузе;
+        # _latest_audio_bands поднимет их заново при следующем запросе полос
+        if self._bands_thread is not None:
+            self._bands_thread.stop()
+            self._bands_thread = None
+        if self._audio_input is not None:
+            self._audio_input.stop()
+            self._audio_input = None
             
     def _init_particles(self):
         # Инициализация частиц для режима рой
@@ -5278,6 +5411,126 @@ class MainWindow(QWidget):
         vy = (rng.random(n)-0.5)*0.6
         self.particles = [x, y, vx, vy]
         
+    def _compose_buffers(self):
+        # float32-копия img_color и буферы композита audioreactive_alt; пересоздаются
+        # только при смене изображения (сравнение по identity)
+        c = self._compose_cache
+        if c is None or c[0] is not self.img_color:
+            color_f32 = self.img_color.astype(np.float32)
+            h, w = color_f32.shape[0], color_f32.shape[1]
+            c = self._compose_cache = (
+                self.img_color,
+                color_f32,
+                np.empty_like(color_f32),
+                np.empty(color_f32.shape, dtype=np.uint8),
+                np.empty((h, w), dtype=np.float32),
+            )
+        return c[1:]
+
+    def _set_edge_cache(self, edges_full, dist_full):
+        # Маска краёв меняется только с картинкой: bool-маска, её uint8-вид для GPU
+        # и индексы краевых пикселей (обычно <5% кадра) считаются здесь, а не каждый кадр
+        self._cached_edges_full = edges_full
+        self._cached_dist_full = dist_full
+        self._edge_ray_steps = None  # пересчитывается лениво при включённых rays
+        if edges_full is None:
+            self._edge_mask_bool = self._edge_mask_u8 = self._edge_indices = None
+            return
+        mask = edges_full > 0.5
+        self._edge_mask_bool = mask
+        self._edge_mask_u8 = mask.view(np.uint8)
+        self._edge_indices = np.nonzero(mask)
+
+    def _probe_gpu(self):
+        # import torch, cuda.is_available() и компиляция ядра оверлеев - один раз за сессию
+        try:
+            import torch
+            from asciinator.core.gpu_overlays import apply_overlays
+            ready = torch.cuda.is_available()
+        except Exception:
+            ready = False
+        if ready:
+            self._torch = torch
+            self._cuda_device = torch.device('cuda')
+            self._apply_overlays_fn = apply_overlays
+        self._gpu_ready = ready
+
+    def _on_gpu_toggled(self, checked: bool):
+        if checked and self._gpu_ready is None:
+            self._probe_gpu()
+        self.update_preview(True)
+
+    def _gpu_overlay_inputs(self, device, edges_full, dist_full):
+        # Загрузка на GPU при смене изображения, кэша краёв или устройства; иначе - готовые тензоры.
+        # Источники сравниваются по identity: массивы заменяются, а не меняются на месте
+        import torch
+        c = self._gpu_overlay_cache
+        if (c is not None and c[0] is self.img_color and c[1] is edges_full
+                and c[2] is dist_full and c[3] == str(device)):
+            return c[4]
+        # uint8 по шине, перевод в float32 уже на устройстве
+        tf = torch.from_numpy(np.ascontiguousarray(self.img_color)).to(device=device, non_blocking=True).float()
+        tedges = None
+        if edges_full is not None:
+            tedges = torch.from_numpy(self._edge_mask_u8).to(device=device, non_blocking=True)
+        tdist = None
+        if dist_full is not None:
+            tdist = torch.from_numpy(dist_full).to(device=device, non_blocking=True).float()
+        tensors = (tf, tedges, tdist)
+        self._gpu_overlay_cache = (self.img_color, edges_full, dist_full, str(device), tensors)
+        return tensors
+
+    def _uniform_noise(self, h, w):
+        # Равномерный шум [0, 1) в переиспользуемом float32-буфере (без выделения H*W*8 байт на кадр)
+        buf = self._rand_buf
+        if buf is None or buf.shape != (h, w):
+            buf = self._rand_buf = np.empty((h, w), dtype=np.float32)
+        self._rng.random(dtype=np.float32, out=buf)
+        return buf
+
+    def _latest_audio_bands(self):
+        # Микрофон и анализатор стартуют при первом запросе; дальше рендер только копирует
+        # последние 6 уровней, FFT считается в BandsThread
+        if self._bands_thread is None:
+            from asciinator.core.audio_input import AudioInput, BandsThread
+            from asciinator.core.audio_analyzer import SixBandAnalyzer
+            self._audio_input = AudioInput(samplerate=48000, blocksize=1024, channels=1)
+            self._audio_input.start()
+            self._audio_an = SixBandAnalyzer(samplerate=48000)
+            th = BandsThread(self._audio_input, self._audio_an, n_samples=2048)
+            th.prime()
+            th.start()
+            self._bands_thread = th
+        return self._bands_thread.latest()
+
+    def _bg_phase_grid(self, h, w, device=None):
+        # Сетка 0.02*x + 0.02*y фонового слоя: строится один раз на размер и устройство
+        if self._bg_phase_shape != (h, w):
+            self._bg_phase_cache.clear()
+            self._bg_phase_shape = (h, w)
+        key = 'cpu' if device is None else str(device)
+        grid = self._bg_phase_cache.get(key)
+        if grid is None:
+            if device is None:
+                grid = (0.02 * np.arange(w, dtype=np.float32)[None, :]
+                        + 0.02 * np.arange(h, dtype=np.float32)[:, None])
+            else:
+                import torch
+                grid = (0.02 * torch.arange(w, dtype=torch.float32, device=device)[None, :]
+                        + 0.02 * torch.arange(h, dtype=torch.float32, device=device)[:, None])
+            self._bg_phase_cache[key] = grid
+        return grid
+
+    def _ensure_flow_buffers(self, rows, cols):
+        # Сетка координат и буферы поля потока зависят только от размера сетки - пересоздаём при его смене
+        if self._flow_shape == (rows, cols):
+            return
+        gx, gy = np.meshgrid(np.linspace(0, 1, cols, dtype=np.float32), np.linspace(0, 1, rows, dtype=np.float32))
+        self._gx, self._gy = gx, gy
+        self._flow_x = np.empty((rows, cols), dtype=np.float32)
+        self._flow_y = np.empty((rows, cols), dtype=np.float32)
+        self._flow_shape = (rows, cols)
+
     def _render_particles(self, t):
         # Рендеринг режима рой
         if self.base_gray is None:
@@ -5288,22 +5541,48 @@ class MainWindow(QWidget):
             self._init_particles()
             
         x, y, vx, vy = self.particles
-        gx, gy = np.meshgrid(np.linspace(0,1,cols), np.linspace(0,1,rows))
-        flow_x = np.sin(2*math.pi*(gx*0.6 + t*0.2)) * 0.1
-        flow_y = np.cos(2*math.pi*(gy*0.6 + t*0.2)) * 0.1
-        
-        for i in range(len(x)):
-            fx = np.interp(x[i]%cols, np.arange(cols), flow_x[int(y[i])%rows])
-            fy = np.interp(y[i]%rows, np.arange(rows), flow_y[:,int(x[i])%cols])
-            vx[i] = 0.97*vx[i] + fx
-            vy[i] = 0.97*vy[i] + fy
-            x[i] = (x[i] + vx[i]) % cols
-            y[i] = (y[i] + vy[i]) % rows
-            
         grid = np.zeros((rows, cols), dtype=np.float32)
-        xi = np.clip(x.astype(int), 0, cols-1)
-        yi = np.clip(y.astype(int), 0, rows-1)
-        np.add.at(grid, (yi, xi), 1.0)
+        if NUMBA_AVAILABLE:
+            _particles_kernel(x, y, vx, vy, float(t), grid)
+        else:
+            self._ensure_flow_buffers(rows, cols)
+            # flow_x = sin(2π(gx*0.6 + t*0.2)) * 0.1, flow_y = cos(...) - в готовых буферах, без новых массивов
+            flow_x, flow_y = self._flow_x, self._flow_y
+            phase = t * 0.2
+            np.multiply(self._gx, 0.6, out=flow_x)
+            flow_x += phase
+            flow_x *= 2 * math.pi
+            np.sin(flow_x, out=flow_x)
+            flow_x *= 0.1
+            np.multiply(self._gy, 0.6, out=flow_y)
+            flow_y += phase
+            flow_y *= 2 * math.pi
+            np.cos(flow_y, out=flow_y)
+            flow_y *= 0.1
+        
+            # Векторно для всех частиц: линейная интерполяция поля вдоль строки/столбца ячейки
+            # (то же, что np.interp по np.arange, но без цикла по частицам)
+            xm = x % cols
+            ym = y % rows
+            xc = np.minimum(xm.astype(np.intp), cols - 1)  # % может вернуть ровно cols из-за округления
+            yc = np.minimum(ym.astype(np.intp), rows - 1)
+            frx = xm - xc
+            fry = ym - yc
+            fx = flow_x[yc, xc] * (1.0 - frx) + flow_x[yc, np.minimum(xc + 1, cols - 1)] * frx
+            fy = flow_y[yc, xc] * (1.0 - fry) + flow_y[np.minimum(yc + 1, rows - 1), xc] * fry
+            # Обновляем массивы self.particles на месте
+            vx *= 0.97
+            vx += fx
+            vy *= 0.97
+            vy += fy
+            x += vx
+            np.mod(x, cols, out=x)
+            y += vy
+            np.mod(y, rows, out=y)
+            
+            xi = np.clip(x.astype(int), 0, cols-1)
+            yi = np.clip(y.astype(int), 0, rows-1)
+            np.add.at(grid, (yi, xi), 1.0)
         grid = grid / (grid.max()+1e-6)
         return clamp01(0.3*(1.0-self.base_gray) + 0.7*grid)
         
@@ -5318,7 +5597,7 @@ class MainWindow(QWidget):
             self.color_stops[i] = color
             hex_val = f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
             self.color_inputs[i].setText(hex_val)
-            self.color_swatches[i].setStyleSheet(f"background: {hex_val}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+            self._set_swatch_color(self.color_swatches[i], hex_val)
         self.glyph_cache.clear()  # Очищаем кэш при смене палитры
         self.update_preview(True)
         
@@ -5330,20 +5609,24 @@ class MainWindow(QWidget):
         try:
             pil = Image.open(fn).convert("RGB")
             q = pil.quantize(colors=5, method=Image.MEDIANCUT)
-            pal = q.getpalette()
+            # Новые Pillow обрезают палитру до числа цветов: добиваем белым до 256 записей,
+            # чтобы индексация не требовала проверок
+            pal = np.full(768, 255, dtype=np.int32)
+            src = (q.getpalette() or [])[:768]
+            pal[:len(src)] = src
             arr = np.array(q, dtype=np.uint8).ravel()
             counts = np.bincount(arr, minlength=256)
-            idxs = counts.argsort()[::-1]
+            # Топ-5 без полной сортировки: argpartition, затем сортируем только 5
+            top5 = np.argpartition(counts, -5)[-5:]
+            top5 = top5[np.argsort(counts[top5])[::-1]]
             
-            for i, idx in enumerate(idxs[:5]):
-                r = pal[idx*3+0] if idx*3+2 < len(pal) else 255
-                g = pal[idx*3+1] if idx*3+2 < len(pal) else 255
-                b = pal[idx*3+2] if idx*3+2 < len(pal) else 255
+            for i, idx in enumerate(top5):
+                r, g, b = pal[idx*3:idx*3+3]
                 color = (int(r), int(g), int(b))
                 self.color_stops[i] = color
                 hex_val = f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
                 self.color_inputs[i].setText(hex_val)
-                self.color_swatches[i].setStyleSheet(f"background: {hex_val}; border: 2px solid rgba(255,255,255,0.3); border-radius: 22px;")
+                self._set_swatch_color(self.color_swatches[i], hex_val)
             self.glyph_cache.clear()  # Очищаем кэш при смене палитры
             self.update_preview(True)
         except Exception as e:
@@ -5389,13 +5672,11 @@ class MainWindow(QWidget):
             self.export_h = h
             # sync steppers if present
             if hasattr(self, "stepper_width") and self.stepper_width is not None:
-                self.stepper_width.blockSignals(True)
-                self.stepper_width.setValue(w)
-                self.stepper_width.blockSignals(False)
+                with QSignalBlocker(self.stepper_width):
+                    self.stepper_width.setValue(w)
             if hasattr(self, "stepper_height") and self.stepper_height is not None:
-                self.stepper_height.blockSignals(True)
-                self.stepper_height.setValue(h)
-                self.stepper_height.blockSignals(False)
+                with QSignalBlocker(self.stepper_height):
+                    self.stepper_height.setValue(h)
         except Exception:
             pass
 
@@ -5568,10 +5849,56 @@ class MainWindow(QWidget):
         except Exception:
             pass
     
+    def _tab_opacity_effect(self, widget):
+        # Постоянный opacity-эффект виджета таба; между анимациями выключен,
+        # чтобы вкладка рисовалась напрямую, без offscreen-буфера
+        eff = self._tab_opacity.get(widget)
+        if eff is None:
+            eff = QGraphicsOpacityEffect(widget)
+            eff.setEnabled(False)
+            widget.setGraphicsEffect(eff)
+            self._tab_opacity[widget] = eff
+        return eff
+
+    def _ensure_tab_anim(self):
+        # Группа и пул анимаций: [old pos, old opacity, new pos, new opacity]
+        if self._tab_anim_group is not None:
+            return self._tab_anim_group
+        from PySide6.QtCore import QParallelAnimationGroup
+        group = QParallelAnimationGroup(self)
+        pool = []
+        for prop, curve in ((b"pos", QEasingCurve.InOutCubic),
+                            (b"opacity", QEasingCurve.InCubic),    # Быстрее затухает в начале
+                            (b"pos", QEasingCurve.InOutCubic),
+                            (b"opacity", QEasingCurve.OutCubic)):  # Медленнее появляется в конце
+            anim = QPropertyAnimation(group)
+            anim.setPropertyName(prop)
+            anim.setDuration(500)
+            anim.setEasingCurve(curve)
+            group.addAnimation(anim)
+            pool.append(anim)
+        # Принудительная перерисовка на каждом шаге fade
+        pool[1].valueChanged.connect(self._on_tab_anim_step)
+        pool[3].valueChanged.connect(self._on_tab_anim_step)
+        group.finished.connect(self._on_tab_anim_finished)
+        self._tab_anim_pool = tuple(pool)
+        self._tab_anim_group = group
+        return group
+
+    def _on_tab_anim_step(self, _value=None):
+        for w in self._tab_anim_widgets:
+            w.update()
+
+    def _on_tab_anim_finished(self):
+        # Выключаем эффекты после завершения анимации
+        for w in self._tab_anim_widgets:
+            eff = self._tab_opacity.get(w)
+            if eff is not None:
+                eff.setEnabled(False)
+
     def _animate_tab_change(self, old_index, new_index):
         # Анимация слайда между табами с fade эффектом и gap
-        from PySide6.QtCore import QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QPoint, QVariantAnimation
-        from PySide6.QtWidgets import QGraphicsOpacityEffect
+        from PySide6.QtCore import QPoint
         
         # Определяем направление (влево или вправо)
         direction = 1 if new_index > old_index else -1
@@ -5584,23 +5911,29 @@ class MainWindow(QWidget):
             self.tab_content.setCurrentIndex(new_index)
             return
         
+        group = self._ensure_tab_anim()
+        if group.state() == QPropertyAnimation.Running:
+            group.stop()
+            self._on_tab_anim_finished()
+        
         # Получаем ширину контейнера
         width = self.tab_content.width()
+        height = self.tab_content.height()
         gap = int(width * 0.3)  # 30% gap between panels
         
-        # Создаем opacity эффекты для fade
-        old_opacity_effect = QGraphicsOpacityEffect(old_widget)
-        new_opacity_effect = QGraphicsOpacityEffect(new_widget)
-        old_widget.setGraphicsEffect(old_opacity_effect)
-        new_widget.setGraphicsEffect(new_opacity_effect)
+        # Opacity эффекты для fade (постоянные, только включаем)
+        old_opacity_effect = self._tab_opacity_effect(old_widget)
+        new_opacity_effect = self._tab_opacity_effect(new_widget)
         
         # Устанавливаем начальные позиции с gap
-        old_widget.setGeometry(0, 0, width, self.tab_content.height())
-        new_widget.setGeometry(direction * (width + gap), 0, width, self.tab_content.height())
+        old_widget.setGeometry(0, 0, width, height)
+        new_widget.setGeometry(direction * (width + gap), 0, width, height)
         
         # Начальные opacity - важно установить до show()
         old_opacity_effect.setOpacity(1.0)
         new_opacity_effect.setOpacity(0.0)
+        old_opacity_effect.setEnabled(True)
+        new_opacity_effect.setEnabled(True)
         
         # Делаем оба виджета видимыми
         self.tab_content.setCurrentIndex(new_index)
@@ -5609,74 +5942,27 @@ class MainWindow(QWidget):
         old_widget.show()
         new_widget.show()
         
-        # Принудительно обновляем отображение
-        old_widget.update()
-        new_widget.update()
-        
-        # Создаем группу анимаций
-        anim_group = QParallelAnimationGroup(self)
-        
-        # === Анимация для СТАРОГО виджета ===
-        # Позиция (уезжает с gap)
-        anim_old_pos = QPropertyAnimation(old_widget, b"pos")
-        anim_old_pos.setDuration(500)
+        # Перенастраиваем анимации из пула
+        anim_old_pos, anim_old_opacity, anim_new_pos, anim_new_opacity = self._tab_anim_pool
+        # Старый виджет уезжает с gap и затухает
+        anim_old_pos.setTargetObject(old_widget)
         anim_old_pos.setStartValue(QPoint(0, 0))
         anim_old_pos.setEndValue(QPoint(-direction * (width + gap), 0))
-        anim_old_pos.setEasingCurve(QEasingCurve.InOutCubic)
-        
-        # Opacity (затухает) - делаем более заметным
-        anim_old_opacity = QPropertyAnimation(old_opacity_effect, b"opacity")
-        anim_old_opacity.setDuration(500)
+        anim_old_opacity.setTargetObject(old_opacity_effect)
         anim_old_opacity.setStartValue(1.0)
         anim_old_opacity.setEndValue(0.0)
-        anim_old_opacity.setEasingCurve(QEasingCurve.InCubic)  # Быстрее затухает в начале
-        
-        # === Анимация для НОВОГО виджета ===
-        # Позиция (приезжает с gap)
-        anim_new_pos = QPropertyAnimation(new_widget, b"pos")
-        anim_new_pos.setDuration(500)
+        # Новый виджет приезжает с gap и появляется
+        anim_new_pos.setTargetObject(new_widget)
         anim_new_pos.setStartValue(QPoint(direction * (width + gap), 0))
         anim_new_pos.setEndValue(QPoint(0, 0))
-        anim_new_pos.setEasingCurve(QEasingCurve.InOutCubic)
-        
-        # Opacity (появляется) - делаем более заметным
-        anim_new_opacity = QPropertyAnimation(new_opacity_effect, b"opacity")
-        anim_new_opacity.setDuration(500)
+        anim_new_opacity.setTargetObject(new_opacity_effect)
         anim_new_opacity.setStartValue(0.0)
         anim_new_opacity.setEndValue(1.0)
-        anim_new_opacity.setEasingCurve(QEasingCurve.OutCubic)  # Медленнее появляется в конце
-        
-        # Добавляем все анимации в группу
-        anim_group.addAnimation(anim_old_pos)
-        anim_group.addAnimation(anim_old_opacity)
-        anim_group.addAnimation(anim_new_pos)
-        anim_group.addAnimation(anim_new_opacity)
-        
-        # Обработчик обновления для принудительной перерисовки
-        def on_value_changed():
-            old_widget.update()
-            new_widget.update()
         
-        anim_old_opacity.valueChanged.connect(on_value_changed)
-        anim_new_opacity.valueChanged.connect(on_value_changed)
-        
-        # Убираем эффекты после завершения анимации
-        def cleanup():
-            try:
-                old_widget.setGraphicsEffect(None)
-                new_widget.setGraphicsEffect(None)
-            except:
-                pass
-        
-        anim_group.finished.connect(cleanup)
+        self._tab_anim_widgets = (old_widget, new_widget)
         
         # Запускаем анимацию
-        anim_group.start()
-        
-        # Сохраняем ссылки
-        self._tab_animation = anim_group
-        self._old_opacity_effect = old_opacity_effect
-        self._new_opacity_effect = new_opacity_effect
+        group.start()
     
     def on_settings(self, tab_index=0):
         # Открытие окна настроек
@@ -5709,21 +5995,30 @@ class MainWindow(QWidget):
 
     def _update_play_button_icon(self):
         # pause icon when running, play icon when stopped
+        # Без сброса через QIcon(): иконка ставится, только если реально другая (по cacheKey)
         try:
+            btn = self.btn_play_pause
             icon = self.icon_pause if self.running else self.icon_play
-            self.btn_play_pause.setIcon(QIcon())
-            self.btn_play_pause.setText("")
             if icon is not None and (not icon.isNull()):
-                self.btn_play_pause.setIcon(icon)
-                self.btn_play_pause.setIconSize(QSize(22, 22))
+                if btn.icon().cacheKey() != icon.cacheKey():
+                    btn.setIcon(icon)
+                if btn.text():
+                    btn.setText("")
             else:
                 # fallback if icons can't be loaded/rendered
-                self.btn_play_pause.setText("❚❚" if self.running else "▶")
-            self.btn_play_pause.update()
+                if not btn.icon().isNull():
+                    btn.setIcon(QIcon())
+                text = "❚❚" if self.running else "▶"
+                if btn.text() != text:
+                    btn.setText(text)
         except Exception:
             pass
 
-    def _init_play_icons(self):
+    # Найденные пути иконок play/pause (name -> path или None): диск опрашивается один раз на процесс
+    _play_icon_paths = {}
+
+    @staticmethod
+    def _icon_search_dirs():
         # Robust icon lookup (dev run + portable/pyinstaller)
         base_dir = os.path.dirname(__file__)
         cwd_dir = os.getcwd()
@@ -5748,21 +6043,33 @@ class MainWindow(QWidget):
         if os.path.isdir(project_icons):
             search_dirs.append(project_icons)
 
-        # 3) Backward-compat absolute path (if exists)
-        absolute_icons = r"C:\Users\mikha\Documents\gen16\icons"
-        if os.path.isdir(absolute_icons):
-            search_dirs.append(absolute_icons)
-
-        def load_exact(name: str) -> QIcon:
-            for d in search_dirs:
-                for ext in ('.png', '.svg', '.svg.svg'):
-                    p = os.path.join(d, name + ext)
-                    if os.path.exists(p):
-                        return QIcon(p)
-            return QIcon()
+        # 3) Backward-compat absolute path (Windows only, if exists)
+        if sys.platform == 'win32':
+            absolute_icons = r"C:\Users\mikha\Documents\gen16\icons"
+            if os.path.isdir(absolute_icons):
+                search_dirs.append(absolute_icons)
+        return search_dirs
 
-        self.icon_play = load_exact('play')
-        self.icon_pause = load_exact('pause')
+    def _init_play_icons(self):
+        paths = MainWindow._play_icon_paths
+        if not paths:
+            search_dirs = self._icon_search_dirs()
+
+            def find_exact(name: str):
+                for d in search_dirs:
+                    for ext in ('.png', '.svg', '.svg.svg'):
+                        p = os.path.join(d, name + ext)
+                        if os.path.exists(p):
+                            return p
+                return None
+
+            for name in ('play', 'pause'):
+                paths[name] = find_exact(name)
+
+        self.icon_play = QIcon(paths['play']) if paths['play'] else QIcon()
+        self.icon_pause = QIcon(paths['pause']) if paths['pause'] else QIcon()
+        self._play_icon_size = QSize(22, 22)
+        self.btn_play_pause.setIconSize(self._play_icon_size)
 
     def on_second_window(self):
         if self.second is None or not isinstance(self.second, FullscreenPreview):
@@ -5773,7 +6080,8 @@ class MainWindow(QWidget):
             self.second.show()
         if self.base_gray is not None:
             img = self.render_frame_pil()
-            qimg = self.qimage_from_pil(img)
+            # Без лишней копии: буфер PIL живёт на окне, пока оно держит этот кадр
+            qimg, self.second._image_data = self.qimage_view_from_pil(img)
             self.second.set_image(qimg)
             
     def on_tick(self):
@@ -5789,9 +6097,11 @@ class MainWindow(QWidget):
             self.t += dt
             
             # Пропускаем кадры если рендер медленный
+            # Детерминированно: рисуем каждый (n_skip+1)-й тик, n_skip по сглаженной стоимости рендера
             if self.skip_frames:
-                import random
-                if random.random() < 0.5:  # Пропускаем ~50% кадров
+                n_skip = int(self._render_ema * self.base_fps)
+                self._skip_phase = (self._skip_phase + 1) % (n_skip + 1)
+                if self._skip_phase != 0:
                     return
                     
         # В режиме Accurate Preview снижаем частоту обновления
@@ -5805,17 +6115,18 @@ class MainWindow(QWidget):
             if self.postfx.crt_enabled and self.postfx.crt_shake > 0:
                 # Shake требует обновления чаще
                 if self._accurate_frame_count % 2 == 0:
-                    self.update_preview()
+                    self._do_update_preview()
             elif self.running and self.base_gray is not None:
                 # Анимация - каждый 3-й кадр
                 if self._accurate_frame_count % 3 == 0:
-                    self.update_preview()
+                    self._do_update_preview()
         else:
             # Быстрый режим - обновляем каждый кадр
             if self.postfx.crt_enabled and self.postfx.crt_shake > 0:
-                self.update_preview()
+                self._do_update_preview()
             elif self.running and self.base_gray is not None:
-                self.update_preview()
+                if not self._request_async_preview():
+                    self._do_update_preview()
         # Синхронизация иконки play/pause при внешних изменениях состояния
         if getattr(self, '_last_running_state', None) != self.running:
             self._update_play_button_icon()
@@ -5832,6 +6143,7 @@ class MainWindow(QWidget):
         gray = to_grayscale(self.img_color)
         grid, cols, rows = resize_to_char_grid(gray, self.cell_w, self.cell_h, self.grid_cols, self.grid_rows)
         self.base_gray = grid
+        self._source_gen += 1
         if self.mode == "swarm":
             pass
         self.update_preview(True)
@@ -5839,472 +6151,357 @@ class MainWindow(QWidget):
     def render_frame_gray(self, t):
         if self.base_gray is None:
             return None
+        # Режимы без рендерера (swarm) показывают исходную сетку
+        fn = self._mode_renderers.get(self.mode)
+        return fn(t) if fn is not None else self.base_gray
+
+    def _render_waves(self, t):
+        return apply_waves_time(self.base_gray, t, self.params)
+
+    def _render_morphing(self, t):
+        return render_morph(self.base_gray, self.morph_target, t, self.params)
+
+    def _render_audio(self, t):
+        try:
+            bands = self._latest_audio_bands()
+            self._audio_bands = bands
+            return render_audio(self.base_gray, t, self.params, bands, self.audio_gain)
+        except Exception:
+            self._audio_bands = np.array([self.audio_level]*6, dtype=float)
+            return render_audio(self.base_gray, t, self.params, self._audio_bands, self.audio_gain)
+
+    def _render_contourswim_mode(self, t):
+        try:
+            return render_contourswim(
+                self.base_gray,
+                t,
+                edge_sensitivity=self.contour_edge_sensitivity / 100.0,
+                edge_blur=int(self.contour_edge_blur / 100.0 * 5) if self.contour_edge_blur > 0 else 0,
+                wave_speed=self.contour_wave_speed / 100.0,
+                amplitude=self.contour_amplitude / 100.0,
+                layers=self.contour_layers,
+                glow=self.contour_glow / 100.0,
+            )
+        except Exception:
+            return self._render_particles(t)
+
+    def _render_audioreactive_alt(self, t):
+        # Apply audio-reactive overlays on ORIGINAL color image, then ASCII-render
+        try:
+            if self.img_color is None:
+                return self.base_gray
+            
+            # Уровни полос с пользовательским усилением по полосам
+            bands = np.asarray(self._latest_audio_bands(), dtype=np.float32) * self._ar_band_gains
+            self._audio_bands = bands
+            # Уровни всех эффектов одним матричным произведением (см. _EFFECT_WEIGHTS)
+            fx_lv = (self._EFFECT_WEIGHTS @ bands).tolist()
             
+            # Тишина: при bands.max() < 0.005 все уровни ниже порогов эффектов, кадр равен
+            # исходнику. После пары тихих кадров отдаём готовую сетку без overlay-конвейера
+            # (кроме GL preview - ему нужны покадровые параметры)
+            if float(np.max(bands)) < 0.005:
+                self._quiet_frames += 1
+            else:
+                self._quiet_frames = 0
+            gl_visible = getattr(self, 'gl_preview', None) is not None and self.gl_preview.isVisible()
+            if self._quiet_frames > 2 and not gl_visible:
+                qkey = (self.cell_w, self.cell_h, self.grid_cols, self.grid_rows)
+                q = self._quiet_grid
+                if q is None or q[0] is not self.img_color or q[1] != qkey:
+                    grid, _, _ = resize_to_char_grid(to_grayscale(self.img_color), *qkey)
+                    q = self._quiet_grid = (self.img_color, qkey, grid)
+                return q[2]
             
-        if self.mode == "waves":
-            return apply_waves_time(self.base_gray, t, self.params)
+            # Use cached full-resolution edges; compute if missing
+            if not hasattr(self, '_cached_edges_full') or self._cached_edges_full is None:
+                try:
+                    gray_full = to_grayscale(self.img_color)
+                    g_norm = gray_full.astype(np.float32) / 255.0
+                    self._set_edge_cache(*edge_data(g_norm))
+                except Exception:
+                    self._set_edge_cache(None, None)
             
-        elif self.mode == "morphing":
-            from asciinator.core.morph import render_morph
-            return render_morph(self.base_gray, self.morph_target, t, self.params)
+            h, w = self.img_color.shape[0], self.img_color.shape[1]
+            # Один монотонный штамп на кадр: его же получает GL preview; perf_counter мал по
+            # величине, поэтому фазы sin() не теряют точность (в отличие от time.time ~1e9)
+            t = time.perf_counter()
+            self._frame_t = t
             
-        elif self.mode == "audio":
-            try:
-                from asciinator.core.audio_input import AudioInput
-                from asciinator.core.audio_analyzer import SixBandAnalyzer
-                from asciinator.core.audio import render_audio
-                if not hasattr(self, '_audio_input'):
-                    self._audio_input = AudioInput(samplerate=48000, blocksize=1024, channels=1)
-                    self._audio_input.start()
-                if not hasattr(self, '_audio_an'):
-                    self._audio_an = SixBandAnalyzer(samplerate=48000)
-                samples = self._audio_input.get_latest(2048)
-                bands = self._audio_an.process(samples)
-                self._audio_bands = bands
-                return render_audio(self.base_gray, t, self.params, bands, self.audio_gain)
-            except Exception:
-                from asciinator.core.audio import render_audio as _fallback
-                import numpy as _np
-                self._audio_bands = _np.array([self.audio_level]*6, dtype=float)
-                return _fallback(self.base_gray, t, self.params, self._audio_bands, self.audio_gain)
+            outline_enabled = getattr(self, 'chk_outline', None) and self.chk_outline.isChecked()
+            rays_enabled = getattr(self, 'chk_rays', None) and self.chk_rays.isChecked()
+            bands_enabled = getattr(self, 'chk_bands', None) and self.chk_bands.isChecked()
+            sparkles_enabled = getattr(self, 'chk_sparkles', None) and self.chk_sparkles.isChecked()
+            echo_enabled = getattr(self, 'chk_echo', None) and self.chk_echo.isChecked()
+            bg_enabled = getattr(self, 'chk_bg', None) and self.chk_bg.isChecked()
             
-        elif self.mode == "swarm":
-            pass
+            edges_full = getattr(self, '_cached_edges_full', None)
+            dist_full = getattr(self, '_cached_dist_full', None)
+
+            # Доступность torch/CUDA проверяется в _on_gpu_toggled, здесь только флаги
+            if self._gpu_ready is None and self.chk_gpu.isChecked():
+                self._probe_gpu()  # галочка выставлена без сигнала (пресет/настройки)
+            gpu_available = self._gpu_ready is True and self.chk_gpu.isChecked()
+            # CPU-буферы кадра (множитель, float32-копия изображения, композит) живут между кадрами;
+            # на GPU остаются None, final_rgb тогда даёт apply_overlays
+            color_base = compose_buf = final_rgb = overlay_factor = None
+            if not gpu_available:
+                color_base, compose_buf, final_rgb, overlay_factor = self._compose_buffers()
+                overlay_factor.fill(1.0)
             
-        elif self.mode == "contourswim":
-            try:
-                from asciinator.core.contourswim import render_contourswim
-                return render_contourswim(
-                    self.base_gray,
-                    t,
-                    edge_sensitivity=self.contour_edge_sensitivity / 100.0,
-                    edge_blur=int(self.contour_edge_blur / 100.0 * 5) if self.contour_edge_blur > 0 else 0,
-                    wave_speed=self.contour_wave_speed / 100.0,
-                    amplitude=self.contour_amplitude / 100.0,
-                    layers=self.contour_layers,
-                    glow=self.contour_glow / 100.0,
-                )
-            except Exception:
-                return self._render_particles(t)
-        
-        elif self.mode == "audioreactive_alt":
-            # Apply audio-reactive overlays on ORIGINAL color image, then ASCII-render
-            try:
-                from asciinator.core.audio_input import AudioInput
-                from asciinator.core.audio_analyzer import SixBandAnalyzer
-                from PIL import Image
-                
-                if self.img_color is None:
-                    return self.base_gray
-                
-                # Initialize audio
-                if not hasattr(self, '_audio_input'):
-                    self._audio_input = AudioInput(samplerate=48000, blocksize=1024, channels=1)
-                    self._audio_input.start()
-                if not hasattr(self, '_audio_an'):
-                    self._audio_an = SixBandAnalyzer(samplerate=48000)
-                samples = self._audio_input.get_latest(2048)
-                bands = self._audio_an.process(samples)
-                self._audio_bands = bands
-                
-                # Use cached full-resolution edges; compute if missing
-                if not hasattr(self, '_cached_edges_full') or self._cached_edges_full is None:
-                    try:
-                        from asciinator.core.edges import get_edge_data
-                        gray_full = to_grayscale(self.img_color)
-                        g_norm = gray_full.astype(np.float32) / 255.0
-                        edges_full, dist_full = get_edge_data((self.img_h, self.img_w, 0), g_norm.tobytes())
-                        self._cached_edges_full = edges_full
-                        self._cached_dist_full = dist_full
-                    except Exception:
-                        self._cached_edges_full = None
-                        self._cached_dist_full = None
-                
-                color_base = self.img_color.astype(np.float32)
-                h, w = color_base.shape[0], color_base.shape[1]
-                overlay_factor = np.ones((h, w), dtype=np.float32)
-                t = time.time()
-                
-                outline_enabled = getattr(self, 'chk_outline', None) and self.chk_outline.isChecked()
-                rays_enabled = getattr(self, 'chk_rays', None) and self.chk_rays.isChecked()
-                bands_enabled = getattr(self, 'chk_bands', None) and self.chk_bands.isChecked()
-                sparkles_enabled = getattr(self, 'chk_sparkles', None) and self.chk_sparkles.isChecked()
-                echo_enabled = getattr(self, 'chk_echo', None) and self.chk_echo.isChecked()
-                bg_enabled = getattr(self, 'chk_bg', None) and self.chk_bg.isChecked()
-                
-                edges_full = getattr(self, '_cached_edges_full', None)
-                dist_full = getattr(self, '_cached_dist_full', None)
-
-                use_gpu = getattr(self, 'chk_gpu', None) and self.chk_gpu.isChecked()
-                gpu_available = False
-                if use_gpu:
-                    try:
-                        import torch
-                        gpu_available = torch.cuda.is_available()
-                    except Exception:
-                        gpu_available = False
-                if outline_enabled and edges_full is not None:
-                    level = float(0.6 * bands[1] + 0.4 * bands[2])
-                    if level > 0.01:
-                        outline_mask = edges_full > 0.5
-                        overlay_factor[outline_mask] *= (1.0 + 3.0 * level)
-                
-                if gpu_available:
-                    # Torch-CUDA accelerated overlays
-                    import torch
-                    device = torch.device('cuda')
-                    tbands = torch.tensor(bands, device=device, dtype=torch.float32)
-                    tf = torch.from_numpy(color_base).to(device=device, dtype=torch.float32)
-                    of = torch.ones((h, w), device=device, dtype=torch.float32)
-                    if edges_full is not None:
-                        tedges = torch.from_numpy((edges_full > 0.5).astype(np.uint8)).to(device=device, dtype=torch.uint8)
-                    else:
-                        tedges = None
-                    if dist_full is not None:
-                        tdist = torch.from_numpy(dist_full).to(device=device, dtype=torch.float32)
-                    else:
-                        tdist = None
-                    # Outline
-                    if outline_enabled and tedges is not None:
-                        lvl = 0.6 * tbands[1] + 0.4 * tbands[2]
-                        if float(lvl) > 0.01:
-                            of = torch.where(tedges > 0, of * (1.0 + 3.0 * lvl), of)
-                    # Rays (distance falloff)
-                    if rays_enabled:
-                        lvl = 0.4 * tbands[0] + 0.4 * tbands[1] + 0.2 * tbands[4]
-                        if float(lvl) > 0.01 and tdist is not None:
-                            max_len = float(self.rays_length.value())
-                            intensity = float(self.rays_intensity.value())
-                            gain = intensity * float(lvl)
-                            # Smooth falloff: exp(-d / s)
-                            s = max(1.0, max_len * 0.3)
-                            of = of * (1.0 + gain * torch.exp(-tdist / s))
-                    # Bands breathing
-                    if bands_enabled:
-                        lvl = 0.3 * tbands[0] + 0.7 * tbands[1]
-                        if float(lvl) > 0.01:
-                            breath = math.sin(t * 5.0) * float(lvl) * 2.0
-                            of = of * (1.0 + breath)
-                    # Sparkles along edges
-                    if sparkles_enabled:
-                        lvl = 0.5 * tbands[4] + 0.5 * tbands[5]
-                        if float(lvl) > 0.01:
-                            density = float(self.sparkles_density.value())
-                            gain = float(self.sparkles_gain.value())
-                            rand = torch.rand((h, w), device=device)
-                            base = (tedges > 0) if tedges is not None else (rand > 0.0)
-                            smask = (rand < (density * (0.2 + 0.8 * float(lvl)))) & base
-                            of = torch.where(smask, of * (1.0 + gain * float(lvl)), of)
-                    # Echo isolines
-                    if echo_enabled and tdist is not None:
-                        spacing = float(self.echo_spacing.value())
-                        bandw = float(self.echo_band.value())
-                        count = int(max(0, self.echo_lines.value()))
-                        if spacing > 0 and count > 0:
-                            level = 0.3 * tbands[2] + 0.7 * tbands[3]
-                            if float(level) > 0.005:
-                                for k in range(1, count + 1):
-                                    target = k * spacing
-                                    band_mask = (torch.abs(tdist - target) <= bandw * 0.5)
-                                    of = torch.where(band_mask, of * (1.0 + 0.5 * float(level)), of)
-                    # Background
-                    if bg_enabled:
-                        bg_int = float(self.bg_intensity.value())
-                        bg_speed = float(self.bg_speed.value())
-                        if bg_int > 0.0:
-                            yy, xx = torch.meshgrid(torch.arange(h, device=device), torch.arange(w, device=device), indexing='ij')
-                            wave = torch.sin(0.02 * xx + 0.02 * yy + t * bg_speed)
-                            lvl = 0.6 * tbands[0] + 0.4 * tbands[1]
-                            of = of * (1.0 + bg_int * float(lvl) * (0.5 + 0.5 * wave))
-                    # Compose
-                    final_rgb = torch.clamp(tf * of.unsqueeze(-1), 0.0, 255.0).to(dtype=torch.uint8).cpu().numpy()
-                else:
-                    # CPU vectorized path
-                    if rays_enabled:
-                        level = float(0.4 * bands[0] + 0.4 * bands[1] + 0.2 * bands[4])
-                        if level > 0.01 and dist_full is not None:
-                            max_len = float(self.rays_length.value())
-                            intensity = float(self.rays_intensity.value())
-                            s = max(1.0, max_len * 0.3)
-                            gain = intensity * level * np.exp(-dist_full / s)
-                            overlay_factor *= (1.0 + gain)
-                        level = float(0.4 * bands[0] + 0.4 * bands[1] + 0.2 * bands[4])
-                        if level > 0.01:
-                            # distance-based falloff along normals: approximate by dilating edge mask
-                            edge_mask = (edges_full > 0.5) if edges_full is not None else None
-                            if edge_mask is not None:
-                                max_len = int(max(1, self.rays_length.value()))
-                                intensity = float(self.rays_intensity.value())
-                                for d in range(max_len):
-                                    gain = intensity * level * (1.0 - d / max_len)
-                                    if gain <= 0:
-                                        break
-                                    # simple expansion: shift masks in 4 dirs (approx normal expansion)
-                                    shifted = np.zeros_like(edge_mask, dtype=bool)
-                                    shifted[1:, :] |= edge_mask[:-1, :]
-                                    shifted[:-1, :] |= edge_mask[1:, :]
-                                    shifted[:, 1:] |= edge_mask[:, :-1]
-                                    shifted[:, :-1] |= edge_mask[:, 1:]
-                                    edge_mask = shifted
-                                    overlay_factor[edge_mask] *= (1.0 + gain)
-                            else:
-                                ray_mask = np.random.random((h, w)) < level * 0.2
-                                overlay_factor[ray_mask] *= (1.0 + level * 4.0)
-                
+            # На GPU все эффекты считает apply_overlays; CPU-слой нужен только без него
+            if outline_enabled and edges_full is not None and not gpu_available:
+                level = fx_lv[0]
+                if level > 0.01:
+                    overlay_factor[self._edge_indices] *= (1.0 + 3.0 * level)
+            
+            if gpu_available:
+                # Torch-CUDA accelerated overlays
+                torch = self._torch
+                device = self._cuda_device
+                # Изображение/края/расстояния на GPU меняются только с картинкой - грузим один раз
+                tf, tedges, tdist = self._gpu_overlay_inputs(device, edges_full, dist_full)
+                # Все эффекты одним TorchScript-ядром; выключенный/тихий эффект = нулевой gain
+                apply_overlays = self._apply_overlays_fn
+                outline_gain = 0.0
+                if outline_enabled:
+                    lvl = fx_lv[0]
+                    if lvl > 0.01:
+                        outline_gain = 3.0 * lvl
+                rays_gain, rays_scale = 0.0, 1.0
+                if rays_enabled:
+                    lvl = fx_lv[1]
+                    if lvl > 0.01:
+                        rays_gain = float(self.rays_intensity.value()) * lvl
+                        rays_scale = max(1.0, float(self.rays_length.value()) * 0.3)
+                breath = 0.0
                 if bands_enabled:
-                    level = float(0.3 * bands[0] + 0.7 * bands[1])
-                    if level > 0.01:
-                        breath = np.sin(t * 5.0) * level * 2.0
-                        overlay_factor *= (1.0 + breath)
-                
+                    lvl = fx_lv[2]
+                    if lvl > 0.01:
+                        breath = math.sin(t * 5.0) * lvl * 2.0
+                sparkle_p, sparkle_gain = 0.0, 0.0
                 if sparkles_enabled:
-                    level = float(0.5 * bands[4] + 0.5 * bands[5])
-                    if level > 0.01:
-                        density = float(self.sparkles_density.value())
-                        gain = float(self.sparkles_gain.value())
-                        base_mask = (edges_full > 0.5) if edges_full is not None else (np.ones((h, w), dtype=bool))
-                        rand = np.random.random((h, w))
-                        sparkle_mask = (rand < (density * (0.2 + 0.8 * level))) & base_mask
-                        overlay_factor[sparkle_mask] *= (1.0 + gain * level)
-
-                # Echo silhouette lines via distance field isolines
-                if echo_enabled and getattr(self, '_cached_dist_full', None) is not None:
-                    df = self._cached_dist_full
-                    spacing = float(self.echo_spacing.value())
-                    bandw = float(self.echo_band.value())
-                    count = int(max(0, self.echo_lines.value()))
-                    if spacing > 0 and count > 0:
-                        for k in range(1, count + 1):
-                            target = k * spacing
-                            band_mask = (np.abs(df - target) <= bandw * 0.5)
-                            # modulate by mids
-                            level = float(0.3 * bands[2] + 0.7 * bands[3])
-                            if level > 0.005:
-                                overlay_factor[band_mask] *= (1.0 + 0.5 * level)
-
-                # Background audio-reactive layer
+                    lvl = fx_lv[4]
+                    if lvl > 0.01:
+                        sparkle_p = float(self.sparkles_density.value()) * (0.2 + 0.8 * lvl)
+                        sparkle_gain = float(self.sparkles_gain.value()) * lvl
+                echo_gain, echo_spacing, echo_band, echo_count = 0.0, 0.0, 0.0, 0
+                if echo_enabled:
+                    lvl = fx_lv[3]
+                    if lvl > 0.005:
+                        echo_gain = 0.5 * lvl
+                        echo_spacing = float(self.echo_spacing.value())
+                        echo_band = float(self.echo_band.value())
+                        echo_count = int(max(0, self.echo_lines.value()))
+                bg_phase, bg_gain, bg_shift = None, 0.0, 0.0
                 if bg_enabled:
                     bg_int = float(self.bg_intensity.value())
-                    bg_speed = float(self.bg_speed.value())
                     if bg_int > 0.0:
-                        yy, xx = np.mgrid[0:h, 0:w]
-                        wave = np.sin(0.02 * xx + 0.02 * yy + t * bg_speed)
-                        lvl = float(0.6 * bands[0] + 0.4 * bands[1])
-                        overlay_factor *= (1.0 + bg_int * lvl * (0.5 + 0.5 * wave))
-                
-                # Apply overlay to original color image
-                if gpu_available:
-                    pass  # already computed final_rgb
-                else:
-                    final_rgb = np.clip(color_base * overlay_factor[..., None], 0, 255).astype(np.uint8)
-                
-                # Convert to grayscale and to ASCII grid
-                try:
-                    gray_final = to_grayscale(final_rgb)
-                    grid, _, _ = resize_to_char_grid(gray_final, self.cell_w, self.cell_h, self.grid_cols, self.grid_rows)
-                    # push to GL preview if enabled
-                    if hasattr(self, 'gl_preview') and self.gl_preview is not None and self.gl_preview.isVisible():
+                        bg_phase = self._bg_phase_grid(h, w, device)
+                        bg_gain = bg_int * fx_lv[5]
+                        # Фазу берём по модулю 2π до прибавления к float32 сетке
+                        bg_shift = math.fmod(t * float(self.bg_speed.value()), 2 * math.pi)
+                # Compose
+                noise = None
+                if sparkle_p > 0.0:
+                    noise = self._gpu_rand_buf
+                    if noise is None or noise.shape != (h, w) or noise.device != device:
+                        noise = self._gpu_rand_buf = torch.empty((h, w), device=device, dtype=torch.float32)
+                    noise.uniform_()
+                final_rgb = apply_overlays(
+                    tf, tedges, tdist, bg_phase, noise,
+                    outline_gain, rays_gain, rays_scale, breath,
+                    sparkle_p, sparkle_gain,
+                    echo_gain, echo_spacing, echo_band, echo_count,
+                    bg_gain, bg_shift,
+                ).cpu().numpy()
+            else:
+                # CPU vectorized path
+                if rays_enabled:
+                    level = fx_lv[1]
+                    if level > 0.01 and dist_full is not None:
+                        max_len = float(self.rays_length.value())
+                        intensity = float(self.rays_intensity.value())
+                        s = max(1.0, max_len * 0.3)
+                        # dist_full хранится в float16: считаем в float32
+                        gain = np.multiply(dist_full, -1.0 / s, dtype=np.float32)
+                        np.exp(gain, out=gain)
+                        gain *= intensity * level
+                        overlay_factor *= (1.0 + gain)
+                    level = fx_lv[1]
+                    if level > 0.01:
+                        # Расширение маски краёв на шаге d домножает пиксели на (1 + gain_d); пиксель
+                        # на taxicab-расстоянии D входит в маску с шага D-1 и получает произведение
+                        # по d = D-1..max_len-1: таблица обратных кумулятивных произведений длины
+                        # max_len+1 и один gather вместо max_len расширений маски
+                        if self._edge_mask_bool is not None:
+                            if self._edge_ray_steps is None:
+                                steps = taxicab_distance(self._edge_mask_bool)
+                                steps -= 1
+                                np.maximum(steps, 0, out=steps)
+                                self._edge_ray_steps = steps
+                            max_len = int(max(1, self.rays_length.value()))
+                            intensity = float(self.rays_intensity.value())
+                            gain = intensity * level * (1.0 - np.arange(max_len) / max_len)
+                            # gain <= 0 в исходном цикле - break: дальше множитель 1
+                            factors = 1.0 + np.maximum(gain, 0.0)
+                            table = np.ones(max_len + 1, dtype=np.float32)
+                            table[:-1] = np.cumprod(factors[::-1])[::-1]
+                            overlay_factor *= table[np.minimum(self._edge_ray_steps, max_len)]
+                        else:
+                            ray_mask = self._uniform_noise(h, w) < level * 0.2
+                            overlay_factor[ray_mask] *= (1.0 + level * 4.0)
+            
+            if bands_enabled and not gpu_available:
+                level = fx_lv[2]
+                if level > 0.01:
+                    breath = math.sin(t * 5.0) * level * 2.0
+                    overlay_factor *= (1.0 + breath)
+            
+            if sparkles_enabled and not gpu_available:
+                level = fx_lv[4]
+                if level > 0.01:
+                    density = float(self.sparkles_density.value())
+                    gain = float(self.sparkles_gain.value())
+                    rand = self._uniform_noise(h, w)
+                    sparkle_mask = rand < (density * (0.2 + 0.8 * level))
+                    if edges_full is not None:
+                        sparkle_mask &= self._edge_mask_bool
+                    overlay_factor[sparkle_mask] *= (1.0 + gain * level)
+
+            # Echo silhouette lines via distance field isolines
+            if echo_enabled and not gpu_available and getattr(self, '_cached_dist_full', None) is not None:
+                spacing = float(self.echo_spacing.value())
+                bandw = float(self.echo_band.value())
+                count = int(max(0, self.echo_lines.value()))
+                # modulate by mids
+                level = fx_lv[3]
+                if spacing > 0 and count > 0 and level > 0.005:
+                    # Без цикла по линиям: число k in [1, count] с |d - k*spacing| <= bandw/2
+                    # считается сразу, множитель (1 + 0.5*level)^n (полосы могут перекрываться)
+                    hb = bandw * 0.5
+                    n = np.add(self._cached_dist_full, hb, dtype=np.float32)
+                    n *= 1.0 / spacing
+                    np.floor(n, out=n)
+                    np.minimum(n, count, out=n)
+                    k_lo = np.subtract(self._cached_dist_full, hb, dtype=np.float32)
+                    k_lo *= 1.0 / spacing
+                    np.ceil(k_lo, out=k_lo)
+                    np.maximum(k_lo, 1.0, out=k_lo)
+                    n -= k_lo
+                    n += 1.0
+                    np.maximum(n, 0.0, out=n)
+                    np.power(np.float32(1.0 + 0.5 * level), n, out=n)
+                    overlay_factor *= n
+
+            # Background audio-reactive layer
+            if bg_enabled and not gpu_available:
+                bg_int = float(self.bg_intensity.value())
+                bg_speed = float(self.bg_speed.value())
+                if bg_int > 0.0:
+                    wave = self._bg_wave_buf
+                    if wave is None or wave.shape != (h, w):
+                        wave = self._bg_wave_buf = np.empty((h, w), dtype=np.float32)
+                    np.add(self._bg_phase_grid(h, w), math.fmod(t * bg_speed, 2 * math.pi), out=wave)
+                    np.sin(wave, out=wave)
+                    lvl = fx_lv[5]
+                    # overlay_factor *= 1 + bg_int*lvl*(0.5 + 0.5*wave), в том же буфере
+                    wave *= 0.5 * bg_int * lvl
+                    wave += 1.0 + 0.5 * bg_int * lvl
+                    overlay_factor *= wave
+            
+            # Apply overlay to original color image (on GPU final_rgb is already computed)
+            if not gpu_available:
+                np.multiply(color_base, overlay_factor[..., None], out=compose_buf)
+                np.clip(compose_buf, 0, 255, out=compose_buf)
+                np.copyto(final_rgb, compose_buf, casting='unsafe')
+            
+            # Convert to grayscale and to ASCII grid
+            try:
+                gray_final = to_grayscale(final_rgb)
+                grid, _, _ = resize_to_char_grid(gray_final, self.cell_w, self.cell_h, self.grid_cols, self.grid_rows)
+                # push to GL preview if enabled
+                if hasattr(self, 'gl_preview') and self.gl_preview is not None and self.gl_preview.isVisible():
+                    try:
+                        # feed grid, edges and distance
+                        self.gl_preview.update_grid(grid)
+                        # Build and upload ASCII atlas if not set
+                        if getattr(self.gl_preview, '_tex_atlas', None) is not None and int(self.gl_preview._params.get('useAtlas', 0)) == 0:
+                            from asciinator.utils.atlas import build_glyph_atlas
+                            ramp = self.custom_ramp if (self.custom_ramp and len(self.custom_ramp) >= 2) else (ASCII_RAMP_EXT if self.use_extended else ASCII_RAMP_PURE)
+                            atlas_img, tiles_x, tiles_y = build_glyph_atlas(self.font_pil, ''.join(ramp), int(self.cell_w), int(self.cell_h))
+                            self.gl_preview.upload_atlas(atlas_img, tiles_x, tiles_y)
+                        edges_src = getattr(self, '_cached_edges_full', None)
+                        dist_src = getattr(self, '_cached_dist_full', None)
+                        maps_key = (edges_src, dist_src, grid.shape)
+                        gl_key = self._gl_maps_key
+                        maps_changed = (gl_key is None or gl_key[0] is not edges_src
+                                        or gl_key[1] is not dist_src or gl_key[2] != grid.shape)
+                        # Края/расстояния меняются только с картинкой или размером сетки:
+                        # ресайз и загрузка текстур - только тогда, а не каждый кадр
+                        if maps_changed and edges_src is not None and dist_src is not None:
+                            self._gl_maps_key = maps_key
+                            # Resize cached maps to grid size
+                            from PIL import Image as _PIL
+                            e_full = (self._cached_edges_full * 255.0).astype(np.uint8)
+                            d_full = self._cached_dist_full.astype(np.float32)
+                            e_img = _PIL.fromarray(e_full, 'L').resize((grid.shape[1], grid.shape[0]), _PIL.NEAREST)
+                            d_max = max(1.0, float(max(d_full.shape)))
+                            d_norm = (d_full / d_max * 255.0).clip(0,255).astype(np.uint8)
+                            d_img = _PIL.fromarray(d_norm, 'L').resize((grid.shape[1], grid.shape[0]), _PIL.BILINEAR)
+                            self.gl_preview.update_edges_dist(np.array(e_img, dtype=np.uint8)/255.0, np.array(d_img, dtype=np.uint8))
+                        # toggles, bands, params, time
+                        outline_enabled = getattr(self, 'chk_outline', None) and self.chk_outline.isChecked()
+                        rays_enabled = getattr(self, 'chk_rays', None) and self.chk_rays.isChecked()
+                        echo_enabled = getattr(self, 'chk_echo', None) and self.chk_echo.isChecked()
+                        sparkles_enabled = getattr(self, 'chk_sparkles', None) and self.chk_sparkles.isChecked()
+                        bg_enabled = getattr(self, 'chk_bg', None) and self.chk_bg.isChecked()
+                        self.gl_preview.set_toggles(outline_enabled, rays_enabled, echo_enabled, sparkles_enabled, bg_enabled)
+                        self.gl_preview.set_bands(self._audio_bands if hasattr(self, '_audio_bands') else np.zeros(6, dtype=np.float32))
+                        self.gl_preview.set_params(
+                            raysLength=float(self.rays_length.value()),
+                            raysIntensity=float(self.rays_intensity.value()),
+                            echoSpacing=float(self.echo_spacing.value()),
+                            echoBand=float(self.echo_band.value()),
+                            echoLines=int(self.echo_lines.value()),
+                            sparklesDensity=float(self.sparkles_density.value()),
+                            sparklesGain=float(self.sparkles_gain.value()),
+                            bgIntensity=float(self.bg_intensity.value()),
+                            bgSpeed=float(self.bg_speed.value()),
+                            useAtlas=1,
+                        )
+                        # Palette from color_stops (convert to 0..1 RGB)
                         try:
-                            # feed grid, edges and distance
-                            self.gl_preview.update_grid(grid)
-                            # Build and upload ASCII atlas if not set
-                            if getattr(self.gl_preview, '_tex_atlas', None) is not None and int(self.gl_preview._params.get('useAtlas', 0)) == 0:
-                                from asciinator.utils.atlas import build_glyph_atlas
-                                ramp = self.custom_ramp if (self.custom_ramp and len(self.custom_ramp) >= 2) else (ASCII_RAMP_EXT if self.use_extended else ASCII_RAMP_PURE)
-                                atlas_img, tiles_x, tiles_y = build_glyph_atlas(self.font_pil, ''.join(ramp), int(self.cell_w), int(self.cell_h))
-                                self.gl_preview.upload_atlas(atlas_img, tiles_x, tiles_y)
-                            if getattr(self, '_cached_edges_full', None) is not None and getattr(self, '_cached_dist_full', None) is not None:
-                                # Resize cached maps to grid size
-                                from PIL import Image as _PIL
-                                e_full = (self._cached_edges_full * 255.0).astype(np.uint8)
-                                d_full = self._cached_dist_full.astype(np.float32)
-                                e_img = _PIL.fromarray(e_full, 'L').resize((grid.shape[1], grid.shape[0]), _PIL.NEAREST)
-                                d_max = max(1.0, float(max(d_full.shape)))
-                                d_norm = (d_full / d_max * 255.0).clip(0,255).astype(np.uint8)
-                                d_img = _PIL.fromarray(d_norm, 'L').resize((grid.shape[1], grid.shape[0]), _PIL.BILINEAR)
-                                self.gl_preview.update_edges_dist(np.array(e_img, dtype=np.uint8)/255.0, np.array(d_img, dtype=np.uint8))
-                            # toggles, bands, params, time
-                            outline_enabled = getattr(self, 'chk_outline', None) and self.chk_outline.isChecked()
-                            rays_enabled = getattr(self, 'chk_rays', None) and self.chk_rays.isChecked()
-                            echo_enabled = getattr(self, 'chk_echo', None) and self.chk_echo.isChecked()
-                            sparkles_enabled = getattr(self, 'chk_sparkles', None) and self.chk_sparkles.isChecked()
-                            bg_enabled = getattr(self, 'chk_bg', None) and self.chk_bg.isChecked()
-                            self.gl_preview.set_toggles(outline_enabled, rays_enabled, echo_enabled, sparkles_enabled, bg_enabled)
-                            self.gl_preview.set_bands(self._audio_bands if hasattr(self, '_audio_bands') else np.zeros(6, dtype=np.float32))
-                            self.gl_preview.set_params(
-                                raysLength=float(self.rays_length.value()),
-                                raysIntensity=float(self.rays_intensity.value()),
-                                echoSpacing=float(self.echo_spacing.value()),
-                                echoBand=float(self.echo_band.value()),
-                                echoLines=int(self.echo_lines.value()),
-                                sparklesDensity=float(self.sparkles_density.value()),
-                                sparklesGain=float(self.sparkles_gain.value()),
-                                bgIntensity=float(self.bg_intensity.value()),
-                                bgSpeed=float(self.bg_speed.value()),
-                                useAtlas=1,
-                            )
-                            # Palette from color_stops (convert to 0..1 RGB)
-                            try:
-                                cols = []
-                                for stop in self.color_stops:
-                                    r, g, b = stop[1]
-                                    cols.append([r/255.0, g/255.0, b/255.0])
-                                if cols:
-                                    self.gl_preview.set_palette(np.array(cols, dtype=np.float32))
-                            except Exception:
-                                pass
-                            self.gl_preview.set_time(time.time())
+                            cols = []
+                            for stop in self.color_stops:
+                                r, g, b = stop[1]
+                                cols.append([r/255.0, g/255.0, b/255.0])
+                            if cols:
+                                self.gl_preview.set_palette(np.array(cols, dtype=np.float32))
                         except Exception:
                             pass
-                    return grid
-                except Exception:
-                    return self.base_gray
+                        self.gl_preview.set_time(self._frame_t)
+                    except Exception:
+                        pass
+                return grid
             except Exception:
                 return self.base_gray
-            
-        return self.base_gray
-    
-    def _render_contourswim(self, t):
-        # Рендер режима 'contourswim' - эффект плавающих контуров
-        if self.base_gray is None:
-            return None
-            
-        # Работаем напрямую с базовым изображением БЕЗ волн
-        base_image = self.base_gray.copy()
-        rows, cols = base_image.shape
-        
-        # Находим края с учетом чувствительности
-        sensitivity = self.contour_edge_sensitivity / 100.0  # 0.0 - 1.0
-        edges = self._detect_simple_edges(base_image, sensitivity)
-        
-        # Применяем размытие к краям если нужно: scipy (если доступна) или fallback
-        if self.contour_edge_blur > 0:
-            blur_amount = max(1, int(self.contour_edge_blur / 100.0 * 5))  # 1-5
-            if SCIPY_AVAILABLE:
-                edges = _scipy_gaussian_filter(edges, sigma=blur_amount)
-            else:
-                edges = self._gaussian_blur_numpy(edges, blur_amount)
-        
-        # Создаем анимированные волны на краях
-        wave_speed = self.contour_wave_speed / 100.0  # 0.0 - 2.0
-        amplitude = self.contour_amplitude / 100.0  # 0.0 - 1.0
-        layers = self.contour_layers  # 1-5
-        effect = self._animate_fire_on_edges(edges, t, rows, cols, wave_speed, amplitude, layers)
-        
-        # Яркость свечения (0.0 - 1.0)
-        glow = self.contour_glow / 100.0
-        
-        # Результат: базовое изображение + яркий эффект на краях
-        result = base_image.copy()
-        
-        # Применяем эффект там, где есть края
-        threshold = 0.1 * (1.0 - sensitivity * 0.5)  # Чем выше чувствительность, тем ниже порог
-        effect_mask = edges > threshold
-        result[effect_mask] = np.clip(
-            result[effect_mask] + effect[effect_mask] * glow,
-            0.0, 1.0
-        )
-        
-        return result
+        except Exception:
+            return self.base_gray
 
-    def _gaussian_blur_numpy(self, img, radius):
-        # Простое приближение гаусса через два прохода box blur
-        if radius <= 0:
-            return img
-        h, w = img.shape
-        # По X
-        temp = np.zeros_like(img)
-        for y in range(h):
-            for x in range(w):
-                x0 = max(0, x - radius); x1 = min(w - 1, x + radius)
-                temp[y, x] = img[y, x0:x1+1].mean()
-        # По Y
-        out = np.zeros_like(img)
-        for x in range(w):
-            for y in range(h):
-                y0 = max(0, y - radius); y1 = min(h - 1, y + radius)
-                out[y, x] = temp[y0:y1+1, x].mean()
-        return out
-    
-    def _detect_simple_edges(self, image, sensitivity=0.3):
-        # Простое обнаружение краев с учетом чувствительности
-        rows, cols = image.shape
-        edges = np.zeros_like(image)
-        
-        # Простой edge detection - разница с соседями
-        for i in range(1, rows-1):
-            for j in range(1, cols-1):
-                # Вычисляем разницу с соседями
-                diff = abs(image[i, j] - image[i-1, j]) + \
-                       abs(image[i, j] - image[i+1, j]) + \
-                       abs(image[i, j] - image[i, j-1]) + \
-                       abs(image[i, j] - image[i, j+1])
-                edges[i, j] = diff / 4.0
-        
-        # Нормализуем
-        if edges.max() > 0:
-            edges = edges / edges.max()
-        
-        # Применяем чувствительность (усиливаем или ослабляем края)
-        # sensitivity 0.0 = слабые края, 1.0 = сильные края
-        edges = np.power(edges, 1.0 - sensitivity * 0.5)
-        
-        return edges
-    
-    def _animate_fire_on_edges(self, edges, t, rows, cols, wave_speed=1.0, amplitude=0.5, layers=3):
-        # Создание анимированных волн на краях
-        fire = np.zeros((rows, cols))
-        
-        # Создаем координатные сетки
-        y_coords = np.arange(rows)[:, np.newaxis]
-        x_coords = np.arange(cols)[np.newaxis, :]
-        
-        # Создаем несколько слоев волн (от 1 до 5)
-        animation = np.zeros((rows, cols))
-        
-        for i in range(layers):
-            # Параметры для каждого слоя
-            freq_mult = 2.0 + i * 1.0  # Частота увеличивается с каждым слоем
-            phase_x = 0.1 + i * 0.05
-            phase_y = 0.15 - i * 0.05
-            weight = 1.0 / (i + 1)  # Первый слой самый сильный
-            
-            # Создаем волну с учетом скорости
-            wave = np.sin(t * freq_mult * wave_speed + x_coords * phase_x + y_coords * phase_y)
-            animation += wave * weight
-        
-        # Нормализуем и применяем амплитуду
-        animation = (animation / layers) * amplitude * 0.5 + 0.5
-        animation = np.clip(animation, 0.0, 1.0)
-        
-        # Применяем к краям
-        fire = edges * animation
-        
-        # Усиливаем яркость (контраст)
-        fire = np.power(fire, 0.6)
-        
-        return fire
-    
-    def _apply_filter(self, image, kernel):
-        # Применение фильтра к изображению
-        rows, cols = image.shape
-        result = np.zeros_like(image)
-        
-        k_h, k_w = kernel.shape
-        pad_h, pad_w = k_h // 2, k_w // 2
-        
-        # Простая свертка
-        for i in range(pad_h, rows - pad_h):
-            for j in range(pad_w, cols - pad_w):
-                result[i, j] = np.sum(image[i-pad_h:i+pad_h+1, j-pad_w:j+pad_w+1] * kernel)
-        
-        return result
-    
-        
-    def render_frame_pil(self, t=None, font=None, cell_w=None, cell_h=None, use_cache=True, for_preview=False):
+    def render_frame_pil(self, t=None, font=None, cell_w=None, cell_h=None, use_cache=True, for_preview=False, as_array=False):
         # Рендер кадра с оптимизациями
         # use_cache: использовать кэш глифов (для preview)
         # for_preview: уменьшать сетку для preview
+        # as_array: вернуть (H, W, 3) uint8 вместо PIL Image (для QImage без промежуточных копий)
+        args = self._ascii_frame_args(t, font, cell_w, cell_h, use_cache, for_preview)
+        if args is None:
+            return None
+        return build_ascii_image_color(**args, as_array=as_array)
+
+    def _ascii_frame_args(self, t=None, font=None, cell_w=None, cell_h=None, use_cache=True, for_preview=False):
+        # Входы build_ascii_image_color для кадра t: сетка яркости режима + снимок параметров
+        # окна (шрифт, размеры, цвета, набор символов). После вызова от окна не зависит
         if self.base_gray is None:
             return None
         if t is None:
@@ -6329,10 +6526,12 @@ class MainWindow(QWidget):
                 new_rows = max(8, int(rows * scale))
                 new_cols = max(8, int(cols * scale))
                 
-                # Resize grid
-                pil_temp = Image.fromarray((g*255).astype(np.uint8)).convert('L')
-                pil_resized = pil_temp.resize((new_cols, new_rows), Image.BICUBIC)
-                g = np.array(pil_resized, dtype=np.float32) / 255.0
+                # Resize grid: веса считаются один раз на пару размеров, кадр - два матричных
+                # произведения без PIL и квантования в uint8. Сильнее чем вдвое - усреднение
+                # по площади (box): дешевле и без алиасинга, иначе бикубика
+                wy, wx_t = resize_plan(rows, cols, new_rows, new_cols, box=scale < 0.5)
+                g = wy @ g.astype(np.float32, copy=False) @ wx_t
+                np.clip(g, 0.0, 1.0, out=g)
         
         # Выбираем набор символов: приоритет кастомным символам
         if self.custom_ramp and len(self.custom_ramp) >= 2:
@@ -6348,28 +6547,99 @@ class MainWindow(QWidget):
         
         cache = self.glyph_cache if use_cache else None
         
-        return build_ascii_image_color(
-            g, ramp, f, cw, ch, self.color_stops,
+        return dict(
+            grid_gray=g, ramp=ramp, font_pil=f, cell_w=cw, cell_h=ch,
+            color_stops=[tuple(c) for c in self.color_stops],
             invert=False, gap_x=self.gap_x, gap_y=self.gap_y,
-            bg_color=self.render_bg, glyph_cache=cache
+            bg_color=tuple(self.render_bg), glyph_cache=cache,
         )
         
+    def _request_preview(self):
+        # Помечаем preview грязным и (пере)запускаем таймер - рендер произойдет один раз после серии изменений
+        self._preview_dirty = True
+        self._preview_timer.start()
+
+    def _mark_dirty(self, *stages):
+        # Помечает стадии preview грязными и планирует перерисовку
+        for stage in stages:
+            self._stage_dirty[stage] = True
+        self._request_preview()
+
+    def _flush_preview(self):
+        # Срабатывание таймера throttle: реальный рендер preview
+        if self._preview_dirty:
+            self._do_update_preview()
+
+    def _render_key(self):
+        # Ключ всех входов ASCII-стадии preview; None - рендерить всегда (аудио меняется без смены t)
+        t_key = self.t
+        if self.mode == "audio":
+            return None
+        if self.mode == "audioreactive_alt":
+            # В тишине кадр audioreactive_alt не зависит ни от времени, ни от уровней
+            # (см. быстрый путь в _render_audioreactive_alt) - пока тихо, кадр не пересчитываем
+            gl_visible = getattr(self, 'gl_preview', None) is not None and self.gl_preview.isVisible()
+            th = self._bands_thread
+            if (self._quiet_frames <= 2 or gl_visible or th is None
+                    or float(np.max(th.latest() * self._ar_band_gains)) >= 0.005):
+                return None
+            t_key = ('quiet', self._source_gen)
+        p = self.params
+        return (
+            t_key, self.mode, self._source_gen,
+            p.freq_x, p.freq_y, p.speed_x, p.speed_y, p.amplitude, p.contrast,
+            tuple(self.color_stops), self.render_bg, self.gap_x, self.gap_y,
+            self.font_name, self.anim_font_px, self.cell_w, self.cell_h,
+            self.use_extended, self.custom_ramp, self.max_preview_cells,
+            self.contour_edge_sensitivity, self.contour_wave_speed, self.contour_amplitude,
+            self.contour_layers, self.contour_edge_blur, self.contour_glow, self.morph_speed,
+        )
+
     def update_preview(self, force=False):
+        # Запрос перерисовки из обработчиков UI: серия вызовов схлопывается в один рендер
+        self._preview_force = self._preview_force or force
+        self._request_preview()
+
+    def _do_update_preview(self, force=False):
+        # Фактический рендер preview; забирает отложенный force и снимает флаг dirty
+        force = force or self._preview_force
+        self._preview_force = False
+        self._preview_dirty = False
         if self.base_gray is None:
             return
-            
-        import time
-        start_time = time.time()
         
-        # Рендер с оптимизациями для preview
-        img = self.render_frame_pil(use_cache=True, for_preview=True)
-        if img is None:
+        # Smart redraw: пересчитываем только стадии, входы которых изменились
+        key = self._render_key()
+        fx_key = tuple(vars(self.postfx).values())
+        if force or key is None or key != self._last_render_key or self._stage_cache['ascii'] is None:
+            self._stage_dirty['ascii'] = True
+        if fx_key != self._last_fx_key:
+            self._stage_dirty['postfx'] = True
+        if not (self._stage_dirty['ascii'] or self._stage_dirty['postfx']):
             return
             
-        qimg = self.qimage_from_pil(img)
+        start_time = time.perf_counter()
         
-        # Применяем PostFX к preview
-        qimg = self.postfx.apply_preview_fx(qimg)
+        if self._stage_dirty['ascii']:
+            # Рендер с оптимизациями для preview
+            arr = self.render_frame_pil(use_cache=True, for_preview=True, as_array=True)
+            if arr is None:
+                return
+            # QImage прямо поверх массива кадра: без PIL, convert и tobytes
+            self._stage_cache['ascii'] = self.qimage_from_array(arr)
+            self._stage_dirty['ascii'] = False
+            self._last_render_key = key
+        
+        self._show_preview_stage(fx_key)
+        self._note_render_time(time.perf_counter() - start_time)
+
+    def _show_preview_stage(self, fx_key=None):
+        # Применяем PostFX к preview (к кэшированному ASCII-кадру)
+        if fx_key is None:
+            fx_key = tuple(vars(self.postfx).values())
+        qimg = self.postfx.apply_preview_fx(self._stage_cache['ascii'])
+        self._stage_dirty['postfx'] = False
+        self._last_fx_key = fx_key
         
         self.preview.set_image(qimg)
         
@@ -6377,29 +6647,98 @@ class MainWindow(QWidget):
         if self.second is not None and self.second.isVisible():
             # Для второго окна тоже используем оптимизацию
             self.second.set_image(qimg)
-            
+
+    def _note_render_time(self, render_time):
         # Измеряем время рендера
-        render_time = time.time() - start_time
         self.last_render_time = render_time
+        self._render_ema = 0.9 * self._render_ema + 0.1 * render_time
+        
+        # Адаптивная детализация preview по сглаженному времени рендера: дорогие кадры
+        # уменьшают сетку, быстрые - возвращают её к целевому размеру
+        if self._render_ema > 0.05:
+            self.max_preview_cells = max(48, int(self.max_preview_cells * 0.85))
+        elif self._render_ema < 0.02 and self.max_preview_cells < self._max_preview_cells_target:
+            self.max_preview_cells = min(self._max_preview_cells_target,
+                                         max(self.max_preview_cells + 1, int(self.max_preview_cells * 1.1)))
         
         # Если рендер медленный - включаем пропуск кадров
         if render_time > 0.05:  # Больше 50ms
             self.skip_frames = True
         elif render_time < 0.03:  # Меньше 30ms
             self.skip_frames = False
+
+    def _request_async_preview(self):
+        # Кадр воспроизведения рендерится в PreviewRenderWorker, GUI-поток только показывает
+        # готовые. False - рендерить синхронно: GL preview обновляется из самого рендера и
+        # должен жить в GUI-потоке, а актуальной ASCII-стадии нужен максимум PostFX
+        if getattr(self, 'gl_preview', None) is not None and self.gl_preview.isVisible():
+            return False
+        key = self._render_key()
+        if key is not None and key == self._last_render_key and self._stage_cache['ascii'] is not None:
+            return False
+        if self._render_worker is None:
+            self._render_worker = PreviewRenderWorker()
+            self._render_worker.frame_ready.connect(self._on_async_frame)
+            self._render_worker.start()
+        if not self._render_worker.is_free():
+            return True  # предыдущий кадр ещё рендерится - этот тик пропускаем
+        # Сетка режима считается здесь (рендереры читают виджеты, GPU и GL preview); в поток
+        # уходит только растеризация по снимку входов. Сетку копируем: рендер режима может
+        # вернуть свой буфер, который GUI-поток перепишет следующим кадром
+        args = self._ascii_frame_args(self.t, use_cache=True, for_preview=True)
+        if args is None:
+            return True
+        args['grid_gray'] = np.array(args['grid_gray'], copy=True)
+        self._render_worker.request(args, key)
+        return True
+
+    def _on_async_frame(self, arr, key, render_time):
+        # Готовый кадр из PreviewRenderWorker (в GUI-потоке): показываем и освобождаем слот
+        self._render_worker.consume()
+        if arr is None or self.base_gray is None:
+            return
+        self._stage_cache['ascii'] = self.qimage_from_array(arr)
+        self._stage_dirty['ascii'] = False
+        self._last_render_key = key
+        self._show_preview_stage()
+        self._note_render_time(render_time)
             
     @staticmethod
-    def qimage_from_pil(pil_img):
-        rgb = pil_img.convert('RGBA')
-        data = rgb.tobytes('raw', 'RGBA')
-        qimg = QImage(data, rgb.width, rgb.height, QImage.Format_RGBA8888)
+    def qimage_view_from_pil(pil_img):
+        # QImage прямо поверх байтов PIL, без convert('RGBA') для RGB-кадров.
+        # ВАЖНО: возвращённые bytes должны жить не меньше QImage - держите ссылку рядом с ним
+        if pil_img.mode == 'RGB':
+            raw, fmt = 'RGBX', QImage.Format_RGBX8888
+        else:
+            if pil_img.mode != 'RGBA':
+                pil_img = pil_img.convert('RGBA')
+            raw, fmt = 'RGBA', QImage.Format_RGBA8888
+        data = pil_img.tobytes('raw', raw)
+        qimg = QImage(data, pil_img.width, pil_img.height, pil_img.width * 4, fmt)
+        return qimg, data
+
+    @staticmethod
+    def qimage_from_array(arr):
+        # QImage поверх (H, W, 3) uint8 без копии; массив висит на самом QImage,
+        # поэтому буфер живёт столько же, сколько объект (в т.ч. внутри preview-виджетов)
+        arr = np.ascontiguousarray(arr, dtype=np.uint8)
+        h, w = arr.shape[0], arr.shape[1]
+        qimg = QImage(arr.data, w, h, 3 * w, QImage.Format_RGB888)
+        qimg.ndarray_ref = arr
         return qimg
 
+    @staticmethod
+    def qimage_from_pil(pil_img):
+        # Владеющая копия: можно хранить сколько угодно
+        qimg, _data = MainWindow.qimage_view_from_pil(pil_img)
+        return qimg.copy()
+
 def main():
     try:
         QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
         app = QApplication(sys.argv)
+        _install_global_qss(app, DEFAULT_UI_THEME)
         w = MainWindow()
         w.show()
         sys.exit(app.exec())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import sys
 import threading
+import time
 from collections import deque
 from typing import Optional
 
@@ -91,3 +93,63 @@ class AudioInput:
         return self.buffer.read_latest(n_samples)
 
 
+def _raise_thread_priority() -> None:
+    # Best effort: only Windows exposes a per-thread priority without extra deps
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+
+        k32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+        # ABOVE_NORMAL, not TIME_CRITICAL: a Python polling loop at that level can starve the GUI thread
+        k32.SetThreadPriority(k32.GetCurrentThread(), 1)  # THREAD_PRIORITY_ABOVE_NORMAL
+    except Exception:
+        pass
+
+
+class BandsThread(threading.Thread):
+    """Runs ``analyzer.process`` on the latest samples off the UI thread.
+
+    The render loop only copies the most recent band levels out of a
+    single slot, so FFT work never blocks a frame.
+    """
+
+    def __init__(self, audio_input: AudioInput, analyzer, n_samples: int = 2048, interval: float = 0.03):
+        super().__init__(name="audio-bands", daemon=True)
+        self.audio_input = audio_input
+        self.analyzer = analyzer
+        self.n_samples = int(n_samples)
+        # Same cadence as the preview tick, so the analyzer's attack/release smoothing is unchanged
+        self.interval = float(interval)
+        self._latest = np.zeros(6, dtype=np.float32)
+        self._lock = threading.Lock()
+        self._stop_evt = threading.Event()
+
+    def _step(self) -> None:
+        bands = self.analyzer.process(self.audio_input.get_latest(self.n_samples))
+        with self._lock:
+            self._latest[:] = bands
+
+    def prime(self) -> None:
+        # One synchronous pass before start(), so the first frame has real levels
+        try:
+            self._step()
+        except Exception:
+            pass
+
+    def run(self) -> None:
+        _raise_thread_priority()
+        while not self._stop_evt.is_set():
+            t0 = time.perf_counter()
+            try:
+                self._step()
+            except Exception:
+                pass
+            self._stop_evt.wait(max(0.0, self.interval - (time.perf_counter() - t0)))
+
+    def latest(self) -> np.ndarray:
+        with self._lock:
+            return self._latest.copy()
+
+    def stop(self) -> None:
+        self._stop_evt.set()
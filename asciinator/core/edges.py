@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import functools
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Tuple
 
 import numpy as np
@@ -11,6 +13,16 @@ try:
 except Exception:  # pragma: no cover
     SCIPY = False
 
+try:
+    from numba import njit, prange  # type: ignore
+    NUMBA = True
+except Exception:  # pragma: no cover
+    njit = None
+    prange = range
+    NUMBA = False
+
+_EDT_INF = 1e20
+
 
 def _sobel_edges(gray: np.ndarray) -> np.ndarray:
     if SCIPY:
@@ -28,28 +40,116 @@ def _sobel_edges(gray: np.ndarray) -> np.ndarray:
     return (mag > 0.2).astype(np.float32)
 
 
+def _edt_rows(f: np.ndarray) -> np.ndarray:
+    # Felzenszwalb & Huttenlocher 1-D squared EDT along each row:
+    # lower envelope of the parabolas (x - q)^2 + f[q], then one sweep to sample it
+    h, w = f.shape
+    out = np.empty((h, w), dtype=np.float64)
+    for y in prange(h):
+        row = f[y]
+        v = np.zeros(w, dtype=np.int64)
+        z = np.empty(w + 1, dtype=np.float64)
+        k = 0
+        z[0] = -_EDT_INF
+        z[1] = _EDT_INF
+        for q in range(1, w):
+            s = ((row[q] + q * q) - (row[v[k]] + v[k] * v[k])) / (2.0 * (q - v[k]))
+            while s <= z[k]:
+                k -= 1
+                s = ((row[q] + q * q) - (row[v[k]] + v[k] * v[k])) / (2.0 * (q - v[k]))
+            k += 1
+            v[k] = q
+            z[k] = s
+            z[k + 1] = _EDT_INF
+        k = 0
+        for q in range(w):
+            while z[k + 1] < q:
+                k += 1
+            out[y, q] = (q - v[k]) * (q - v[k]) + row[v[k]]
+    return out
+
+
+if NUMBA:
+    _edt_rows = njit(parallel=True, cache=True)(_edt_rows)
+
+
+def _edt_cols(on: np.ndarray) -> np.ndarray:
+    # Squared distance to the nearest edge pixel in the same column (exact 1-D pass)
+    h = on.shape[0]
+    ys = np.arange(h, dtype=np.float64)[:, None]
+    prev = np.maximum.accumulate(np.where(on, ys, -_EDT_INF), axis=0)
+    nxt = np.minimum.accumulate(np.where(on, ys, _EDT_INF)[::-1], axis=0)[::-1]
+    d = np.minimum(ys - prev, nxt - ys)
+    return np.where(d < h, d * d, _EDT_INF)
+
+
 def _edt(mask: np.ndarray) -> np.ndarray:
     if SCIPY:
         return ndi.distance_transform_edt(1.0 - mask)
-    # Fallback: Manhattan distance approximation
-    h, w = mask.shape
-    dist = np.full((h, w), 1e9, dtype=np.float32)
-    zeros = np.argwhere(mask > 0.5)
-    if zeros.size == 0:
-        return dist * 0
-    for y in range(h):
-        for x in range(w):
-            d = np.abs(zeros[:, 0] - y) + np.abs(zeros[:, 1] - x)
-            dist[y, x] = float(np.min(d))
-    return dist
-
-
-@functools.lru_cache(maxsize=16)
-def get_edge_data(key: Tuple[int, int, int], gray_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
-    h, w, _ = key  # key carries shape and maybe seed
-    gray = np.frombuffer(gray_bytes, dtype=np.float32).reshape(h, w)
-    edges = _sobel_edges(gray)
-    dist = _edt(edges)
+    # Fallback: exact Euclidean distance, separable (columns, then row envelopes)
+    on = mask > 0.5
+    if not on.any():
+        return np.zeros(mask.shape, dtype=np.float32)
+    return np.sqrt(_edt_rows(_edt_cols(on))).astype(np.float32)
+
+
+def taxicab_distance(mask: np.ndarray) -> np.ndarray:
+    """City-block (4-neighbour) distance from every pixel to the nearest nonzero pixel of ``mask``.
+
+    Returns int32; when the mask is empty every pixel gets h + w (farther than any real distance).
+    """
+    on = np.asarray(mask) > 0.5
+    h, w = on.shape
+    if not on.any():
+        return np.full((h, w), h + w, dtype=np.int32)
+    if SCIPY:
+        return ndi.distance_transform_cdt(~on, metric="taxicab").astype(np.int32, copy=False)
+    # Fallback: L1 is separable, so forward/backward +1 sweeps down columns, then along rows
+    d = np.where(on, 0, h + w).astype(np.int32)
+    for y in range(1, h):
+        np.minimum(d[y], d[y - 1] + 1, out=d[y])
+    for y in range(h - 2, -1, -1):
+        np.minimum(d[y], d[y + 1] + 1, out=d[y])
+    for x in range(1, w):
+        np.minimum(d[:, x], d[:, x - 1] + 1, out=d[:, x])
+    for x in range(w - 2, -1, -1):
+        np.minimum(d[:, x], d[:, x + 1] + 1, out=d[:, x])
+    return d
+
+
+_EDGE_CACHE_SIZE = 16
+_edge_cache: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+_edge_cache_lock = threading.Lock()  # called from the GUI thread and ImageLoadWorker
+
+
+def edge_data(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Edges and distance-to-edge for a float32 gray image, memoized by content digest.
+
+    The key is (shape, blake2b digest) hashed straight from the array buffer, so a
+    lookup never materialises a multi-MB bytes copy and the cache does not pin one.
+    Results are stored compact: edges as a uint8 0/1 mask, distance as float16
+    (only used as a soft weight / isoline source; callers upcast where needed).
+    """
+    g = np.ascontiguousarray(gray, dtype=np.float32)
+    key = (g.shape, hashlib.blake2b(g, digest_size=16).digest())
+    with _edge_cache_lock:
+        hit = _edge_cache.get(key)
+        if hit is not None:
+            _edge_cache.move_to_end(key)
+            return hit
+    edges = _sobel_edges(g)
+    dist = _edt(edges).astype(np.float16)
+    edges = edges.astype(np.uint8)
+    with _edge_cache_lock:
+        _edge_cache[key] = (edges, dist)
+        while len(_edge_cache) > _EDGE_CACHE_SIZE:
+            _edge_cache.popitem(last=False)
     return edges, dist
 
 
+def get_edge_data(key: Tuple[int, int, int], gray_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    # Backward-compatible entry point: (h, w, seed) + raw float32 bytes
+    h, w, _ = key
+    return edge_data(np.frombuffer(gray_bytes, dtype=np.float32).reshape(h, w))
+
+
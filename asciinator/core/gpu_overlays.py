@@ -0,0 +1,68 @@
+# No `from __future__ import annotations` here: TorchScript needs real annotation objects.
+from typing import Optional
+
+import torch
+
+
+def _apply_overlays(
+    color: torch.Tensor,
+    edges: Optional[torch.Tensor],
+    dist: Optional[torch.Tensor],
+    bg_phase: Optional[torch.Tensor],
+    noise: Optional[torch.Tensor],
+    outline_gain: float,
+    rays_gain: float,
+    rays_scale: float,
+    breath: float,
+    sparkle_p: float,
+    sparkle_gain: float,
+    echo_gain: float,
+    echo_spacing: float,
+    echo_band: float,
+    echo_count: int,
+    bg_gain: float,
+    bg_shift: float,
+) -> torch.Tensor:
+    """audioreactive_alt overlays on an (H, W, 3) float32 image -> uint8 RGB.
+
+    Gains are pre-multiplied by the band level on the caller side; a zero gain
+    (effect off or too quiet) skips that stage. ``noise`` is a caller-owned
+    uniform [0, 1) buffer refilled in place each frame for sparkles.
+    """
+    h = color.shape[0]
+    w = color.shape[1]
+    of = torch.ones((h, w), dtype=torch.float32, device=color.device)
+    # Outline
+    if edges is not None and outline_gain != 0.0:
+        of = torch.where(edges > 0, of * (1.0 + outline_gain), of)
+    # Rays (distance falloff): exp(-d / s)
+    if dist is not None and rays_gain != 0.0:
+        of = of * (1.0 + rays_gain * torch.exp(-dist / rays_scale))
+    # Bands breathing
+    if breath != 0.0:
+        of = of * (1.0 + breath)
+    # Sparkles along edges
+    if noise is not None and sparkle_p > 0.0:
+        smask = noise < sparkle_p
+        if edges is not None:
+            smask = smask & (edges > 0)
+        of = torch.where(smask, of * (1.0 + sparkle_gain), of)
+    # Echo isolines
+    # Count of k in [1, echo_count] with |d - k*spacing| <= band/2, so overlapping bands still stack
+    if dist is not None and echo_gain != 0.0 and echo_spacing > 0.0 and echo_count > 0:
+        hb = echo_band * 0.5
+        k_hi = torch.clamp(torch.floor((dist + hb) / echo_spacing), max=float(echo_count))
+        k_lo = torch.clamp(torch.ceil((dist - hb) / echo_spacing), min=1.0)
+        n = torch.clamp(k_hi - k_lo + 1.0, min=0.0)
+        of = of * torch.pow(1.0 + echo_gain, n)
+    # Background
+    if bg_phase is not None and bg_gain != 0.0:
+        of = of * (1.0 + bg_gain * (0.5 + 0.5 * torch.sin(bg_phase + bg_shift)))
+    return torch.clamp(color * of.unsqueeze(-1), 0.0, 255.0).to(torch.uint8)
+
+
+# Compiled once on first import; the plain function is the fallback if scripting is unavailable
+try:
+    apply_overlays = torch.jit.script(_apply_overlays)
+except Exception:  # pragma: no cover
+    apply_overlays = _apply_overlays
@@ -1,3 +1,5 @@
+import ctypes
+
 import numpy as np
 
 try:
@@ -15,17 +17,26 @@ from OpenGL.GL import (
     glGenTextures, glBindTexture, glTexParameteri,
     glTexImage2D, GL_TEXTURE_2D, GL_RED, GL_UNSIGNED_BYTE,
     GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, GL_NEAREST,
-    glUseProgram, glGetUniformLocation, glUniform1i, glUniform2f, glUniform1f,
+    glUseProgram, glGetUniformLocation, glUniform1i,
+    glGetUniformBlockIndex, glUniformBlockBinding, glBindBufferBase, glBufferSubData,
+    GL_UNIFORM_BUFFER, GL_DYNAMIC_DRAW,
     glGenVertexArrays, glBindVertexArray, glGenBuffers, glBindBuffer,
     glBufferData, GL_ARRAY_BUFFER, GL_STATIC_DRAW,
     glEnableVertexAttribArray, glVertexAttribPointer,
     glDrawArrays, GL_TRIANGLES,
-    glActiveTexture, GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2
+    glActiveTexture, GL_TEXTURE0, GL_TEXTURE1, GL_TEXTURE2, GL_TEXTURE3, GL_TEXTURE4,
+    GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_REPEAT,
+    glTexSubImage2D, GL_R8, glPixelStorei, GL_UNPACK_ALIGNMENT,
+    GL_PIXEL_UNPACK_BUFFER, GL_STREAM_DRAW,
+    glMapBufferRange, glUnmapBuffer, GL_MAP_WRITE_BIT, GL_MAP_INVALIDATE_BUFFER_BIT
 )
 from OpenGL.GL import glReadPixels, GL_RGBA, GL_UNSIGNED_BYTE
 from OpenGL.GL.shaders import compileProgram, compileShader
 
 
+# Side of the square sparkle noise texture; must match the 256.0 in FRAG_SHADER
+NOISE_SIZE = 256
+
 VERT_SHADER = """
 #version 330 core
 layout (location = 0) in vec2 aPos;
@@ -44,46 +55,40 @@ out vec4 FragColor;
 uniform sampler2D uTex;       // grayscale grid [0..1]
 uniform sampler2D uEdges;     // edges mask [0..1]
 uniform sampler2D uDist;      // distance field in pixels (normalized or absolute)
-uniform vec2 uTexSize;        // width, height in texels
-// Atlas
 uniform sampler2D uAtlas;     // glyph atlas
-uniform ivec2 uAtlasTiles;    // tiles_x, tiles_y
-uniform int uUseAtlas;        // 0 - show grayscale, 1 - show atlas based ascii
-// Palette
-uniform int uPaletteN;
-uniform vec3 uPalette[16];    // up to 16 stops in linear space 0..1
-
-// Toggles (0/1)
-uniform int uEnableOutline;
-uniform int uEnableRays;
-uniform int uEnableEcho;
-uniform int uEnableSparkles;
-uniform int uEnableBackground;
-
-// Audio bands
-uniform float uBands[6];
-uniform float uTime;
-
-// Params
-uniform float uRaysLength;
-uniform float uRaysIntensity;
-uniform float uEchoSpacing;
-uniform float uEchoBand;
-uniform int   uEchoLines;
-uniform float uSparklesDensity;
-uniform float uSparklesGain;
-uniform float uBgIntensity;
-uniform float uBgSpeed;
-
-// Hash noise from UV for sparkles
-float hash21(vec2 p){
-    p = fract(p*vec2(123.34, 345.45));
-    p += dot(p, p+34.345);
-    return fract(p.x*p.y);
-}
+
+// Per-frame state in one std140 block (mirrors _FRAME_DTYPE, one buffer upload per frame)
+layout(std140) uniform Frame {
+    vec4  uBandsLo;           // audio bands 0..3
+    vec4  uBandsHi;           // audio bands 4..5 in xy
+    vec2  uTexSize;           // width, height in texels
+    float uTime;
+    int   uToggles;           // bitmask: 1 outline, 2 rays, 4 echo, 8 sparkles, 16 background
+    ivec2 uAtlasTiles;        // tiles_x, tiles_y
+    int   uUseAtlas;          // 0 - show grayscale, 1 - show atlas based ascii
+    int   uPaletteN;
+    vec4  uPalette[16];       // up to 16 stops in linear space 0..1 (rgb, w unused)
+};
+
+// Effect params in one std140 block (mirrors _PARAMS_DTYPE, uploaded as a single buffer)
+layout(std140) uniform Params {
+    float uRaysLength;
+    float uRaysIntensity;
+    float uEchoSpacing;
+    float uEchoBand;
+    int   uEchoLines;
+    float uSparklesDensity;
+    float uSparklesGain;
+    float uBgIntensity;
+    float uBgSpeed;
+};
+
+// Static white noise for sparkles (256x256, GL_REPEAT), one value per grid cell
+uniform sampler2D uNoise;
 
 void main() {
     float g = texture(uTex, vUV).r; // base grayscale
+    float uBands[6] = float[6](uBandsLo.x, uBandsLo.y, uBandsLo.z, uBandsLo.w, uBandsHi.x, uBandsHi.y);
     vec2 uv = vUV;
     vec2 texel = 1.0 / uTexSize;
     float overlay = 1.0;
@@ -92,14 +97,14 @@ void main() {
     float edge = texture(uEdges, uv).r;
     float dist = texture(uDist, uv).r; // assume pixels or scaled
 
-    if(uEnableOutline == 1){
+    if((uToggles & 1) != 0){
         float lvl = 0.6*uBands[1] + 0.4*uBands[2];
         if(lvl > 0.01){
             overlay *= (1.0 + 3.0*lvl*step(0.5, edge));
         }
     }
 
-    if(uEnableRays == 1){
+    if((uToggles & 2) != 0){
         float lvl = 0.4*uBands[0] + 0.4*uBands[1] + 0.2*uBands[4];
         if(lvl > 0.01){
             float s = max(1.0, 0.3*uRaysLength);
@@ -108,7 +113,7 @@ void main() {
         }
     }
 
-    if(uEnableEcho == 1){
+    if((uToggles & 4) != 0){
         float level = 0.3*uBands[2] + 0.7*uBands[3];
         if(level > 0.005 && uEchoSpacing > 0.0 && uEchoLines > 0){
             // Create band around multiples of spacing
@@ -124,17 +129,17 @@ void main() {
         }
     }
 
-    if(uEnableSparkles == 1){
+    if((uToggles & 8) != 0){
         float lvl = 0.5*uBands[4] + 0.5*uBands[5];
         if(lvl > 0.01){
             float density = uSparklesDensity * (0.2 + 0.8*lvl);
-            float rnd = hash21(uv * uTexSize);
+            float rnd = texture(uNoise, uv * uTexSize / 256.0).r;
             float s = step(1.0 - density, rnd) * step(0.5, edge); // only on edges
             overlay *= (1.0 + uSparklesGain * lvl * s);
         }
     }
 
-    if(uEnableBackground == 1){
+    if((uToggles & 16) != 0){
         float lvl = 0.6*uBands[0] + 0.4*uBands[1];
         float wave = sin(0.02*uv.x*uTexSize.x + 0.02*uv.y*uTexSize.y + uTime*uBgSpeed);
         overlay *= (1.0 + uBgIntensity * lvl * (0.5 + 0.5*wave));
@@ -148,8 +153,8 @@ void main() {
         int i0 = int(floor(t));
         int i1 = min(i0 + 1, uPaletteN - 1);
         float ft = fract(t);
-        vec3 c0 = uPalette[i0];
-        vec3 c1 = uPalette[i1];
+        vec3 c0 = uPalette[i0].rgb;
+        vec3 c1 = uPalette[i1].rgb;
         col = mix(c0, c1, ft);
     }
     if(uUseAtlas == 1){
@@ -171,6 +176,34 @@ void main() {
 }
 """
 
+# Plain uniforms left outside the blocks (samplers); locations are looked up once after linking
+_UNIFORMS = ('uTex', 'uEdges', 'uDist', 'uNoise', 'uAtlas')
+
+# std140 layout of the Frame block: vec4 bands at 0 and 16, vec2 at 32, scalars at 40/44,
+# ivec2 at 48 (8-aligned), scalars at 56/60, vec4 array at 64
+_FRAME_DTYPE = np.dtype({
+    'names': ['bands', 'texSize', 'time', 'toggles', 'atlasTiles', 'useAtlas', 'paletteN', 'palette'],
+    'formats': [('<f4', 8), ('<f4', 2), '<f4', '<i4', ('<i4', 2), '<i4', '<i4', ('<f4', (16, 4))],
+    'offsets': [0, 32, 40, 44, 48, 56, 60, 64],
+    'itemsize': 320,
+})
+FRAME_BINDING = 1
+
+# std140 layout of the Params block: scalars only, so members are packed 4 bytes apart;
+# the block size is rounded up to a vec4 (16 bytes)
+_PARAMS_DTYPE = np.dtype({
+    'names': [
+        'raysLength', 'raysIntensity', 'echoSpacing', 'echoBand', 'echoLines',
+        'sparklesDensity', 'sparklesGain', 'bgIntensity', 'bgSpeed',
+    ],
+    'formats': [
+        '<f4', '<f4', '<f4', '<f4', '<i4',
+        '<f4', '<f4', '<f4', '<f4',
+    ],
+    'itemsize': 48,
+})
+PARAMS_BINDING = 0
+
 
 class GLPreviewWidget(QOpenGLWidget):
     def __init__(self, parent=None):
@@ -186,7 +219,11 @@ class GLPreviewWidget(QOpenGLWidget):
         self._tex_edges = None
         self._tex_dist = None
         self._tex_atlas = None
+        self._tex_noise = None
         self._grid_tex_size = (1, 1)
+        self._tex_shapes = {}  # texture id -> (w, h) of its allocated storage
+        self._pbos = None  # two pixel-unpack buffers, used in turn for streaming uploads
+        self._pbo_index = 0
         self._pending_grid = None  # numpy 2D uint8 or float [0..1]
         self._pending_edges = None
         self._pending_dist = None
@@ -194,6 +231,8 @@ class GLPreviewWidget(QOpenGLWidget):
         self._toggles = {
             'outline': 0, 'rays': 0, 'echo': 0, 'sparkles': 0, 'bg': 0
         }
+        self._toggle_bits = 0  # same toggles packed for the uToggles uniform
+        self._loc = {}
         self._params = {
             'raysLength': 80.0, 'raysIntensity': 1.0,
             'echoSpacing': 10.0, 'echoBand': 3.0, 'echoLines': 4,
@@ -201,6 +240,14 @@ class GLPreviewWidget(QOpenGLWidget):
             'bgIntensity': 0.5, 'bgSpeed': 1.0
         }
         self._time = 0.0
+        # CPU copy of the Params uniform block; re-sent only after a setter changed it
+        self._params_block = np.zeros(1, dtype=_PARAMS_DTYPE)
+        for k, v in self._params.items():
+            self._params_block[k] = v
+        self._params_dirty = True
+        self._ubo = None
+        self._frame_block = np.zeros(1, dtype=_FRAME_DTYPE)
+        self._frame_ubo = None
         self._palette = None  # np.ndarray float32 shape (N,3) in 0..1
         self.setMinimumSize(200, 150)
 
@@ -229,6 +276,30 @@ class GLPreviewWidget(QOpenGLWidget):
             compileShader(VERT_SHADER, 0x8B31),   # GL_VERTEX_SHADER
             compileShader(FRAG_SHADER, 0x8B30),   # GL_FRAGMENT_SHADER
         )
+        self._loc = {name: glGetUniformLocation(self._program, name) for name in _UNIFORMS}
+        # Sampler -> texture unit mapping never changes: grid 0, edges 1, dist 2, atlas 3, noise 4
+        glUseProgram(self._program)
+        glUniform1i(self._loc['uTex'], 0)
+        glUniform1i(self._loc['uEdges'], 1)
+        glUniform1i(self._loc['uDist'], 2)
+        glUniform1i(self._loc['uAtlas'], 3)
+        glUniform1i(self._loc['uNoise'], 4)
+        glUseProgram(0)
+        # Params uniform block: one buffer on a fixed binding point
+        glUniformBlockBinding(self._program, glGetUniformBlockIndex(self._program, 'Params'), PARAMS_BINDING)
+        self._ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+        glBufferData(GL_UNIFORM_BUFFER, _PARAMS_DTYPE.itemsize, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, PARAMS_BINDING, self._ubo)
+        # Frame uniform block: rewritten in full once per paint
+        glUniformBlockBinding(self._program, glGetUniformBlockIndex(self._program, 'Frame'), FRAME_BINDING)
+        self._frame_ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self._frame_ubo)
+        glBufferData(GL_UNIFORM_BUFFER, _FRAME_DTYPE.itemsize, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, FRAME_BINDING, self._frame_ubo)
+        self._params_dirty = True
         self._tex = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, self._tex)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
@@ -245,6 +316,18 @@ class GLPreviewWidget(QOpenGLWidget):
         glBindTexture(GL_TEXTURE_2D, self._tex_dist)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        # Single-channel rows are tightly packed (widths are not multiples of 4)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        self._pbos = list(glGenBuffers(2))
+        # Sparkle noise: generated once, tiled over the grid by GL_REPEAT
+        noise = np.random.default_rng().integers(0, 256, size=(NOISE_SIZE, NOISE_SIZE), dtype=np.uint8)
+        self._tex_noise = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self._tex_noise)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_R8, NOISE_SIZE, NOISE_SIZE, 0, GL_RED, GL_UNSIGNED_BYTE, noise)
 
     def resizeGL(self, w, h):
         glViewport(0, 0, w, h)
@@ -262,55 +345,38 @@ class GLPreviewWidget(QOpenGLWidget):
             self._pending_dist = None
         glUseProgram(self._program)
         glBindVertexArray(self._vao)
-        # Bind textures
+        # Bind textures: each sampler has its own unit (samplers are set in initializeGL);
+        # Qt may use unit 0 between frames, so bindings are refreshed here
         glActiveTexture(GL_TEXTURE0); glBindTexture(GL_TEXTURE_2D, self._tex)
-        glUniform1i(glGetUniformLocation(self._program, 'uTex'), 0)
         glActiveTexture(GL_TEXTURE1); glBindTexture(GL_TEXTURE_2D, self._tex_edges)
-        glUniform1i(glGetUniformLocation(self._program, 'uEdges'), 1)
         glActiveTexture(GL_TEXTURE2); glBindTexture(GL_TEXTURE_2D, self._tex_dist)
-        glUniform1i(glGetUniformLocation(self._program, 'uDist'), 2)
+        glActiveTexture(GL_TEXTURE3); glBindTexture(GL_TEXTURE_2D, self._tex_atlas)
+        glActiveTexture(GL_TEXTURE4); glBindTexture(GL_TEXTURE_2D, self._tex_noise)
         glActiveTexture(GL_TEXTURE0)
-        loc_sz = glGetUniformLocation(self._program, 'uTexSize')
-        glUniform2f(loc_sz, float(self._grid_tex_size[0]), float(self._grid_tex_size[1]))
-        # Toggles
-        glUniform1i(glGetUniformLocation(self._program, 'uEnableOutline'), int(self._toggles['outline']))
-        glUniform1i(glGetUniformLocation(self._program, 'uEnableRays'), int(self._toggles['rays']))
-        glUniform1i(glGetUniformLocation(self._program, 'uEnableEcho'), int(self._toggles['echo']))
-        glUniform1i(glGetUniformLocation(self._program, 'uEnableSparkles'), int(self._toggles['sparkles']))
-        glUniform1i(glGetUniformLocation(self._program, 'uEnableBackground'), int(self._toggles['bg']))
-        # Bands
-        for i in range(6):
-            glUniform1f(glGetUniformLocation(self._program, f'uBands[{i}]'), float(self._bands[i]))
-        glUniform1f(glGetUniformLocation(self._program, 'uTime'), float(self._time))
-        # Params
-        glUniform1f(glGetUniformLocation(self._program, 'uRaysLength'), float(self._params['raysLength']))
-        glUniform1f(glGetUniformLocation(self._program, 'uRaysIntensity'), float(self._params['raysIntensity']))
-        glUniform1f(glGetUniformLocation(self._program, 'uEchoSpacing'), float(self._params['echoSpacing']))
-        glUniform1f(glGetUniformLocation(self._program, 'uEchoBand'), float(self._params['echoBand']))
-        glUniform1i(glGetUniformLocation(self._program, 'uEchoLines'), int(self._params['echoLines']))
-        glUniform1f(glGetUniformLocation(self._program, 'uSparklesDensity'), float(self._params['sparklesDensity']))
-        glUniform1f(glGetUniformLocation(self._program, 'uSparklesGain'), float(self._params['sparklesGain']))
-        glUniform1f(glGetUniformLocation(self._program, 'uBgIntensity'), float(self._params['bgIntensity']))
-        glUniform1f(glGetUniformLocation(self._program, 'uBgSpeed'), float(self._params['bgSpeed']))
-        // Atlas uniforms
-        glUniform1i(glGetUniformLocation(self._program, 'uUseAtlas'), int(self._params.get('useAtlas', 0)))
-        glUniform1i(glGetUniformLocation(self._program, 'uAtlas'), 0)  // will bind atlas on unit 0 temporarily
-        if self._tex_atlas is not None and int(self._params.get('useAtlas', 0)) == 1:
-            glActiveTexture(GL_TEXTURE0)
-            glBindTexture(GL_TEXTURE_2D, self._tex_atlas)
-            glUniform1i(glGetUniformLocation(self._program, 'uAtlas'), 0)
-            tiles = self._params.get('atlasTiles', (1,1))
-            glUniform2f(glGetUniformLocation(self._program, 'uAtlasTiles'), float(tiles[0]), float(tiles[1]))
-        # Palette uniforms
+        # Per-frame state: filled on the CPU, one buffer upload
+        fb = self._frame_block
+        fb['bands'][0, :6] = self._bands
+        fb['texSize'][0] = self._grid_tex_size
+        fb['time'][0] = self._time
+        fb['toggles'][0] = self._toggle_bits
+        use_atlas = int(self._params.get('useAtlas', 0))
+        fb['useAtlas'][0] = use_atlas
+        if self._tex_atlas is not None and use_atlas == 1:
+            fb['atlasTiles'][0] = self._params.get('atlasTiles', (1, 1))
         int_n = 0
         if self._palette is not None:
             int_n = min(int(self._palette.shape[0]), 16)
-            for i in range(int_n):
-                r, g, b = map(float, self._palette[i])
-                glUniform1f(glGetUniformLocation(self._program, f'uPalette[{i}].x'), r)
-                glUniform1f(glGetUniformLocation(self._program, f'uPalette[{i}].y'), g)
-                glUniform1f(glGetUniformLocation(self._program, f'uPalette[{i}].z'), b)
-        glUniform1i(glGetUniformLocation(self._program, 'uPaletteN'), int_n)
+            fb['palette'][0, :int_n, :3] = self._palette[:int_n]
+        fb['paletteN'][0] = int_n
+        glBindBuffer(GL_UNIFORM_BUFFER, self._frame_ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, _FRAME_DTYPE.itemsize, self._frame_block.view(np.uint8))
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        # Params: one buffer upload, only after a setter changed them
+        if self._params_dirty:
+            glBindBuffer(GL_UNIFORM_BUFFER, self._ubo)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, _PARAMS_DTYPE.itemsize, self._params_block.view(np.uint8))
+            glBindBuffer(GL_UNIFORM_BUFFER, 0)
+            self._params_dirty = False
         glDrawArrays(GL_TRIANGLES, 0, 6)
         # Readback to store last frame for export if needed
         try:
@@ -337,15 +403,12 @@ class GLPreviewWidget(QOpenGLWidget):
             g = grid
         h, w = g.shape
         self._grid_tex_size = (w, h)
-        glBindTexture(GL_TEXTURE_2D, self._tex)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RED, w, h, 0, GL_RED, GL_UNSIGNED_BYTE, g)
+        self._stream_r8(self._tex, g)
 
     def _upload_edges(self, edges):
         e = np.clip(edges, 0.0, 1.0)
         e = (e * 255.0).astype(np.uint8)
-        h, w = e.shape
-        glBindTexture(GL_TEXTURE_2D, self._tex_edges)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RED, w, h, 0, GL_RED, GL_UNSIGNED_BYTE, e)
+        self._stream_r8(self._tex_edges, e)
 
     def _upload_dist(self, dist):
         # Normalize distance to 0..1 based on max dimension heuristics
@@ -353,9 +416,31 @@ class GLPreviewWidget(QOpenGLWidget):
         scale = max(1.0, float(max(self._grid_tex_size)))
         dn = np.clip(d / scale, 0.0, 1.0)
         dn = (dn * 255.0).astype(np.uint8)
-        h, w = dn.shape
-        glBindTexture(GL_TEXTURE_2D, self._tex_dist)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RED, w, h, 0, GL_RED, GL_UNSIGNED_BYTE, dn)
+        self._stream_r8(self._tex_dist, dn)
+
+    def _stream_r8(self, tex, arr):
+        # Storage is (re)allocated only when the size changes; pixels go through a PBO
+        # (orphaned + mapped) and glTexSubImage2D, so the driver copies asynchronously
+        arr = np.ascontiguousarray(arr, dtype=np.uint8)
+        h, w = arr.shape
+        glBindTexture(GL_TEXTURE_2D, tex)
+        if self._tex_shapes.get(tex) != (w, h):
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_R8, w, h, 0, GL_RED, GL_UNSIGNED_BYTE, None)
+            self._tex_shapes[tex] = (w, h)
+        pbo = self._pbos[self._pbo_index]
+        self._pbo_index ^= 1
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pbo)
+        glBufferData(GL_PIXEL_UNPACK_BUFFER, arr.nbytes, None, GL_STREAM_DRAW)
+        ptr = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, arr.nbytes,
+                               GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        if ptr:
+            ctypes.memmove(ptr, arr.ctypes.data, arr.nbytes)
+            glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, w, h, GL_RED, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+        else:
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, w, h, GL_RED, GL_UNSIGNED_BYTE, arr)
 
     def upload_atlas(self, atlas_img, tiles_x: int, tiles_y: int):
         # atlas_img: PIL.Image 'L'
@@ -372,12 +457,16 @@ class GLPreviewWidget(QOpenGLWidget):
         self._pending_dist = dist
         self.update()
 
+
     def set_toggles(self, outline: bool, rays: bool, echo: bool, sparkles: bool, bg: bool):
         self._toggles['outline'] = 1 if outline else 0
         self._toggles['rays'] = 1 if rays else 0
         self._toggles['echo'] = 1 if echo else 0
         self._toggles['sparkles'] = 1 if sparkles else 0
         self._toggles['bg'] = 1 if bg else 0
+        t = self._toggles
+        self._toggle_bits = (t['outline'] | t['rays'] << 1 | t['echo'] << 2
+                             | t['sparkles'] << 3 | t['bg'] << 4)
 
     def set_bands(self, bands: np.ndarray):
         if bands is None:
@@ -389,6 +478,9 @@ class GLPreviewWidget(QOpenGLWidget):
         for k, v in kwargs.items():
             if k in self._params:
                 self._params[k] = float(v) if not isinstance(v, (int,)) else int(v)
+                if k in _PARAMS_DTYPE.names:
+                    self._params_block[k] = self._params[k]
+                    self._params_dirty = True
 
     def set_time(self, t: float):
         self._time = float(t)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from PySide6.QtGui import QIcon
 
 
-def load_icon(icon_name: str, size: int = 24):
-    """Load icon from local `icons/` directory near project root."""
+@lru_cache(maxsize=1)
+def _icon_index() -> dict:
+    """Locate the `icons/` directory once and map lower-cased file names to paths."""
     # Start from this file, try to find nearest icons/ upwards
     here = os.path.abspath(os.path.dirname(__file__))
     candidates = [
@@ -14,24 +16,29 @@ def load_icon(icon_name: str, size: int = 24):
         os.path.join(here, "icons"),
         os.path.join(os.getcwd(), "icons"),
     ]
-    icons_dir = None
     for d in candidates:
         p = os.path.abspath(d)
         if os.path.isdir(p):
-            icons_dir = p
-            break
-    if not icons_dir:
-        return None
+            try:
+                return {fn.lower(): os.path.join(p, fn) for fn in os.listdir(p)}
+            except Exception:
+                return {}
+    return {}
 
-    try:
-        present = {fn.lower(): os.path.join(icons_dir, fn) for fn in os.listdir(icons_dir)}
-    except Exception:
-        return None
 
-    for name in (f"{icon_name}.svg", f"{icon_name}.svg.svg", f"{icon_name}.png"):
-        p = present.get(name.lower())
-        if p and os.path.exists(p):
-            return QIcon(p)
-    return None
+_icon_cache: dict = {}
 
 
+def load_icon(icon_name: str, size: int = 24):
+    """Load icon from local `icons/` directory near project root (resolved and cached once)."""
+    if icon_name in _icon_cache:
+        return _icon_cache[icon_name]
+    icon = None
+    present = _icon_index()
+    for name in (f"{icon_name}.svg", f"{icon_name}.svg.svg", f"{icon_name}.png"):
+        p = present.get(name.lower())
+        if p:
+            icon = QIcon(p)
+            break
+    _icon_cache[icon_name] = icon
+    return icon
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Sequence, Tuple
 
 import numpy as np
@@ -42,6 +43,118 @@ def resize_to_char_grid(
     return grid, cols, rows
 
 
+@lru_cache(maxsize=32)
+def _bicubic_weights(src: int, dst: int) -> np.ndarray:
+    # (dst, src) row-normalized weights of PIL's bicubic (a = -0.5), widened by the
+    # scale factor when downsampling like Image.resize does
+    scale = src / dst
+    support = max(scale, 1.0)
+    centers = (np.arange(dst, dtype=np.float64) + 0.5) * scale
+    x = np.abs((np.arange(src, dtype=np.float64)[None, :] + 0.5 - centers[:, None]) / support)
+    a = -0.5
+    w = np.where(
+        x < 1.0,
+        ((a + 2.0) * x - (a + 3.0)) * x * x + 1.0,
+        np.where(x < 2.0, (((x - 5.0) * x + 8.0) * x - 4.0) * a, 0.0),
+    )
+    w /= w.sum(axis=1, keepdims=True)
+    w = w.astype(np.float32)
+    w.flags.writeable = False
+    return w
+
+
+@lru_cache(maxsize=32)
+def _box_weights(src: int, dst: int) -> np.ndarray:
+    # (dst, src) area-average weights: overlap of each source pixel [j, j+1) with the
+    # output footprint [i*scale, (i+1)*scale), normalized per row
+    scale = src / dst
+    lo = np.arange(dst, dtype=np.float64)[:, None] * scale
+    j = np.arange(src, dtype=np.float64)[None, :]
+    w = np.clip(np.minimum(j + 1.0, lo + scale) - np.maximum(j, lo), 0.0, None)
+    w /= w.sum(axis=1, keepdims=True)
+    w = w.astype(np.float32)
+    w.flags.writeable = False
+    return w
+
+
+def resize_plan(
+    src_rows: int, src_cols: int, dst_rows: int, dst_cols: int, box: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    # Precomputed separable resize: out = wy @ img @ wx_t; weights are cached per size pair.
+    # box=True averages areas (cheaper and alias-free for strong downscales), otherwise bicubic
+    weights = _box_weights if box else _bicubic_weights
+    return weights(src_rows, dst_rows), weights(src_cols, dst_cols).T
+
+
+def glyph_bitmaps(
+    ramp: Sequence[str] | str,
+    font_pil: ImageFont.FreeTypeFont,
+    cell_w: int,
+    cell_h: int,
+) -> np.ndarray:
+    # Coverage masks of the ramp glyphs, clipped to one cell: (len(ramp), cell_h, cell_w) uint8
+    out = np.zeros((len(ramp), cell_h, cell_w), dtype=np.uint8)
+    for i, ch in enumerate(ramp):
+        mask = Image.new("L", (cell_w, cell_h), 0)
+        ImageDraw.Draw(mask).text((0, 0), ch, fill=255, font=font_pil, anchor="lt")
+        out[i] = np.asarray(mask, dtype=np.uint8)
+    return out
+
+
+def _font_key(font_pil) -> tuple:
+    # Cache identity of a PIL font: file, size and face index when it has them
+    path = getattr(font_pil, "path", None)
+    if path is None:
+        return ("id", id(font_pil))
+    return (str(path), getattr(font_pil, "size", None), getattr(font_pil, "index", 0))
+
+
+def _cell_colors(grid_gray: np.ndarray, color_stops: Sequence[Tuple[int, int, int]]) -> np.ndarray:
+    # Same 5-stop gradient as the per-cell loop, for the whole grid: (rows, cols, 3) int
+    t = grid_gray.astype(np.float32)
+    seg = np.clip(np.floor(t * 4.0), 0, 3).astype(np.intp)
+    local_t = (t - seg * 0.25) / 0.25
+    stops = np.asarray(color_stops[:5], dtype=np.float32)
+    c1 = stops[seg]
+    c2 = stops[seg + 1]
+    return (c1 + (c2 - c1) * local_t[..., None]).astype(np.int32)
+
+
+def _compose_from_bitmaps(
+    grid_gray, ramp, font_pil, cell_w, cell_h, color_stops,
+    invert, gap_x, gap_y, bg_color, glyph_cache, size,
+):
+    # Glyph masks are rasterized once per (font, ramp, cell size) and kept in glyph_cache;
+    # the font is part of the key, so a frame still rendering with the previous font after
+    # a clear cannot leave its masks behind for the new one. Each frame is gather +
+    # colorize + blend in NumPy
+    key = ("__bitmaps__", _font_key(font_pil), "".join(ramp), cell_w, cell_h)
+    masks = glyph_cache.get(key)
+    if masks is None:
+        masks = glyph_cache[key] = glyph_bitmaps(ramp, font_pil, cell_w, cell_h)
+
+    rows, cols = grid_gray.shape
+    n = len(ramp) - 1
+    v = 1.0 - grid_gray if invert else grid_gray
+    idx = np.clip((v * n + 0.5).astype(np.intp), 0, n)
+    colors = _cell_colors(grid_gray, color_stops).astype(np.float32)
+    bg = np.asarray(bg_color, dtype=np.float32)
+
+    # bg + (color - bg) * alpha, as PIL paste with the glyph's own alpha
+    alpha = masks[idx].astype(np.float32) * (1.0 / 255.0)  # (rows, cols, ch, cw)
+    cells = (colors - bg)[:, :, None, None, :] * alpha[..., None]
+    cells += bg
+    cells = cells.astype(np.uint8)
+
+    W, H = size
+    pitch_h, pitch_w = cell_h + gap_y, cell_w + gap_x
+    canvas = np.empty((rows, pitch_h, cols, pitch_w, 3), dtype=np.uint8)
+    canvas[...] = np.asarray(bg_color, dtype=np.uint8)
+    canvas[:, :cell_h, :, :cell_w] = cells.transpose(0, 2, 1, 3, 4)
+    canvas = canvas.reshape((rows * pitch_h, cols * pitch_w, 3))[:H, :W]
+    return np.ascontiguousarray(canvas)
+
+
 def build_ascii_image_color(
     grid_gray: np.ndarray,
     ramp: Sequence[str] | str,
@@ -54,67 +167,44 @@ def build_ascii_image_color(
     gap_y: int = 0,
     bg_color: Tuple[int, int, int] = (0, 0, 0),
     glyph_cache: dict | None = None,
+    as_array: bool = False,
 ):
+    # as_array=True returns the frame as (H, W, 3) uint8 instead of a PIL image
     rows, cols = grid_gray.shape
     W = cols * cell_w + max(0, cols - 1) * gap_x
     H = rows * cell_h + max(0, rows - 1) * gap_y
-    img = Image.new("RGB", (max(1, int(W)), max(1, int(H))), color=bg_color)
-
-    n = len(ramp) - 1
+    size = (max(1, int(W)), max(1, int(H)))
 
     if glyph_cache is not None:
-        for y in range(rows):
-            row_vals = grid_gray[y]
-            for x in range(cols):
-                v = float(row_vals[x])
-                v_for_char = 1.0 - v if invert else v
-                idx = int(v_for_char * n + 0.5)
-                ch = ramp[idx]
-
-                t = v
-                seg = int(min(3, math.floor(t * 4.0)))
-                seg_t0 = seg * 0.25
-                local_t = (t - seg_t0) / 0.25
-                c1 = color_stops[seg]
-                c2 = color_stops[seg + 1]
-                color = (
-                    int(c1[0] + (c2[0] - c1[0]) * local_t),
-                    int(c1[1] + (c2[1] - c1[1]) * local_t),
-                    int(c1[2] + (c2[2] - c1[2]) * local_t),
-                )
-
-                cache_key = (ch, color)
-                if cache_key not in glyph_cache:
-                    glyph_img = Image.new("RGBA", (cell_w, cell_h), (0, 0, 0, 0))
-                    glyph_draw = ImageDraw.Draw(glyph_img)
-                    glyph_draw.text((0, 0), ch, fill=color, font=font_pil, anchor="lt")
-                    glyph_cache[cache_key] = glyph_img
-
-                pos_x = x * (cell_w + gap_x)
-                pos_y = y * (cell_h + gap_y)
-                img.paste(glyph_cache[cache_key], (pos_x, pos_y), glyph_cache[cache_key])
-    else:
-        draw = ImageDraw.Draw(img)
-        for y in range(rows):
-            row_vals = grid_gray[y]
-            for x in range(cols):
-                v = float(row_vals[x])
-                v_for_char = 1.0 - v if invert else v
-                idx = int(v_for_char * n + 0.5)
-                ch = ramp[idx]
-                t = v
-                seg = int(min(3, math.floor(t * 4.0)))
-                seg_t0 = seg * 0.25
-                local_t = (t - seg_t0) / 0.25
-                c1 = color_stops[seg]
-                c2 = color_stops[seg + 1]
-                color = (
-                    int(c1[0] + (c2[0] - c1[0]) * local_t),
-                    int(c1[1] + (c2[1] - c1[1]) * local_t),
-                    int(c1[2] + (c2[2] - c1[2]) * local_t),
-                )
-                draw.text((x * (cell_w + gap_x), y * (cell_h + gap_y)), ch, fill=color, font=font_pil, anchor="lt")
-
-    return img
+        arr = _compose_from_bitmaps(
+            grid_gray, ramp, font_pil, cell_w, cell_h, color_stops,
+            invert, gap_x, gap_y, bg_color, glyph_cache, size,
+        )
+        return arr if as_array else Image.fromarray(arr, "RGB")
+
+    img = Image.new("RGB", size, color=bg_color)
+    n = len(ramp) - 1
+    draw = ImageDraw.Draw(img)
+    for y in range(rows):
+        row_vals = grid_gray[y]
+        for x in range(cols):
+            v = float(row_vals[x])
+            v_for_char = 1.0 - v if invert else v
+            idx = int(v_for_char * n + 0.5)
+            ch = ramp[idx]
+            t = v
+            seg = int(min(3, math.floor(t * 4.0)))
+            seg_t0 = seg * 0.25
+            local_t = (t - seg_t0) / 0.25
+            c1 = color_stops[seg]
+            c2 = color_stops[seg + 1]
+            color = (
+                int(c1[0] + (c2[0] - c1[0]) * local_t),
+                int(c1[1] + (c2[1] - c1[1]) * local_t),
+                int(c1[2] + (c2[2] - c1[2]) * local_t),
+            )
+            draw.text((x * (cell_w + gap_x), y * (cell_h + gap_y)), ch, fill=color, font=font_pil, anchor="lt")
+
+    return np.asarray(img, dtype=np.uint8) if as_array else img
 
 